@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# How far outer faces of an elbow are from the exact torus when all their
+# edges are exact (arcs on sketches, sweep edges from util/sweep.py):
+# blockMesh interpolates face interiors from edges (a Coons patch),
+# so the deviation depends on sweep angle and the angle an outer block
+# spans around the pipe (not on the ratio of elbow and pipe radius,
+# as the R/r rows show).
+# Printed is the biggest deviation from the torus over all positions
+# of the block around the pipe, relative to pipe radius.
+# Run from repository root: python -m benchmark.elbow_faces
+import numpy as np
+
+# outer blocks span this angle around the pipe [degrees]
+block_angles = (45, 90)
+
+sweep_angles = (30, 60, 90, 120)
+
+# elbow (centreline) radius/pipe radius; coriolis_flowmeter.py has 2 and 4
+radius_ratios = (2, 4)
+
+# samples along each direction of a face
+n_samples = 41
+
+def torus(elbow_radius, theta, phi):
+    # points on a torus with a unit pipe radius around z;
+    # theta: angle along the elbow, phi: angle around the pipe
+    theta, phi = np.broadcast_arrays(theta, phi)
+    rho = elbow_radius + np.cos(phi)
+
+    return np.stack((rho*np.cos(theta), rho*np.sin(theta), np.sin(phi)), axis=-1)
+
+def deviation(elbow_radius, points):
+    rho = np.linalg.norm(points[..., :2], axis=-1)
+
+    return np.abs(np.hypot(rho - elbow_radius, points[..., 2]) - 1)
+
+def face_deviation(elbow_radius, sweep_angle, phi_start, block_angle):
+    # the biggest deviation of a Coons patch, bounded by exact edges
+    u = np.linspace(0, 1, n_samples)[:, None]
+    v = np.linspace(0, 1, n_samples)[None, :]
+    theta = sweep_angle*u
+    phi = phi_start + block_angle*v
+    phi_end = phi_start + block_angle
+
+    def point(t, p):
+        return torus(elbow_radius, t, p)
+
+    patch = (1 - u)[..., None]*point(0, phi) + u[..., None]*point(sweep_angle, phi) + \
+        (1 - v)[..., None]*point(theta, phi_start) + v[..., None]*point(theta, phi_end) - \
+        ((1 - u)*(1 - v))[..., None]*point(0, phi_start) - (u*(1 - v))[..., None]*point(sweep_angle, phi_start) - \
+        ((1 - u)*v)[..., None]*point(0, phi_end) - (u*v)[..., None]*point(sweep_angle, phi_end)
+
+    return np.max(deviation(elbow_radius, patch))
+
+if __name__ == '__main__':
+    print(f"{'block [deg]':>12s} {'R/r':>5s} " + ' '.join(f'{a:>7d}°' for a in sweep_angles))
+
+    for block_angle in block_angles:
+        for ratio in radius_ratios:
+            deviations = [
+                max(face_deviation(ratio, np.radians(sweep_angle), phi, np.radians(block_angle))
+                    for phi in np.radians(np.arange(0, 360, 5)))
+                for sweep_angle in sweep_angles
+            ]
+
+            print(f"{block_angle:12d} {ratio:5g} " + ' '.join(f'{100*d:7.2f}%' for d in deviations))
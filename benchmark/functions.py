@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# Batched functions from examples/util/functions.py against
+# classy_blocks' one-vector-at-a-time functions, called in a loop.
+# Run from repository root: python -m benchmark.functions
+import time
+
+import numpy as np
+
+from classy_blocks.util import functions as f
+
+from examples.util import functions as bf
+
+sizes = (10, 100, 1000, 10000, 100000)
+n_repeats = 5
+
+def best_time(function):
+    times = []
+    for _ in range(n_repeats):
+        t_start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t_start)
+
+    return min(times)
+
+def cases(n):
+    rng = np.random.default_rng(0)
+    points = rng.random((n, 3))
+    degrees = rng.random(n)*360
+    angles = np.radians(degrees)
+
+    # (name, loop, batched)
+    return [
+        ('deg2rad',
+            lambda: [f.deg2rad(a) for a in degrees],
+            lambda: bf.deg2rad(degrees)),
+        ('vector',
+            lambda: [f.vector(*p) for p in points],
+            lambda: bf.vector(points[:, 0], points[:, 1], points[:, 2])),
+        ('unit_vector',
+            lambda: [f.unit_vector(p) for p in points],
+            lambda: bf.unit_vector(points)),
+        ('rotate, one angle',
+            lambda: [f.rotate(p, angles[0], axis='z') for p in points],
+            lambda: bf.rotate(points, angles[0], axis='z')),
+        ('rotate, many angles',
+            lambda: [f.rotate(p, a, axis='z') for p, a in zip(points, angles)],
+            lambda: bf.rotate(points, angles, axis='z')),
+    ]
+
+def check():
+    # results must be the same
+    points = np.random.default_rng(1).random((10, 3))
+    angles = np.linspace(0, 2*np.pi, 10)
+
+    expected = np.array([f.rotate(p, a, axis='z') for p, a in zip(points, angles)])
+    assert np.allclose(bf.rotate(points, angles, axis='z'), expected)
+    assert np.allclose(bf.rotate(points, angles[3], axis='z'), [f.rotate(p, angles[3], axis='z') for p in points])
+    assert np.allclose(bf.unit_vector(points), [f.unit_vector(p) for p in points])
+
+if __name__ == '__main__':
+    check()
+
+    print(f"{'function':20s} {'n':>7s} {'loop [ms]':>10s} {'batched [ms]':>13s} {'speedup':>8s}")
+    for n in sizes:
+        for name, loop, batched in cases(n):
+            t_loop = best_time(loop)
+            t_batched = best_time(batched)
+
+            print(f"{name:20s} {n:7d} {t_loop*1000:10.3f} {t_batched*1000:13.3f} {t_loop/t_batched:8.1f}")
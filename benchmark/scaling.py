@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# Build, write and (optionally) blockMesh times of synthetic stress cases
+# (examples/stress) for increasing sizes, with the estimated exponent of
+# each stage (time ~ n_blocks^exponent).
+# Run from repository root:
+#   python -m benchmark.scaling [--blockmesh] [--plot scaling.png] [--cases lattice chain]
+# With --profile, build and write stages of all sizes are sampled
+# together and collapsed stacks are written to scaling.collapsed.
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+import numpy as np
+
+from examples.util import modules
+from examples.util.blocks import get_blocks
+from examples.util.profiler import Profiler
+
+# case: (module, [parameters for each size])
+sweeps = {
+    'lattice': ('examples.stress.lattice', [
+        {'n_x': n, 'n_y': n, 'n_z': n} for n in (2, 4, 6, 8, 10, 13, 16)
+    ]),
+    'chain': ('examples.stress.chain', [
+        {'n_segments': n} for n in (10, 30, 100, 300, 1000, 3000)
+    ]),
+    'bundle': ('examples.stress.bundle', [
+        {'n_rows': n, 'n_columns': n} for n in (1, 2, 4, 8, 12, 16)
+    ]),
+    'seal': ('examples.operation.wedge', [
+        {'n_grooves': n} for n in (5, 20, 50, 100, 200, 500)
+    ]),
+}
+
+stages = ('build', 'write', 'blockMesh')
+
+def run_case(module_name, parameters, blockmesh=False, profiler=None):
+    # returns (number of blocks, {stage: time})
+    def stage(name):
+        if profiler is None:
+            return contextlib.nullcontext()
+
+        return profiler.stage(name)
+
+    module = modules.load(module_name, parameters)
+
+    times = {}
+
+    t_start = time.perf_counter()
+    with stage('build'):
+        mesh = module.get_mesh()
+    times['build'] = time.perf_counter() - t_start
+
+    with tempfile.TemporaryDirectory() as directory:
+        case_path = os.path.join(directory, 'case')
+        shutil.copytree('case', case_path)
+
+        t_start = time.perf_counter()
+        with stage('write'):
+            mesh.write(output_path=os.path.join(case_path, 'system', 'blockMeshDict'),
+                geometry=modules.geometry(module), debug=False)
+        times['write'] = time.perf_counter() - t_start
+
+        if blockmesh:
+            t_start = time.perf_counter()
+            subprocess.run(['blockMesh', '-case', case_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            times['blockMesh'] = time.perf_counter() - t_start
+
+    return len(get_blocks(mesh)), times
+
+def exponent(sizes, times):
+    # slope of a line through (log n, log t), using the larger half of sizes
+    # where constant overheads don't matter much
+    sizes = np.log(sizes[len(sizes)//2:])
+    times = np.log(times[len(times)//2:])
+
+    if len(sizes) < 2:
+        return np.nan
+
+    return np.polyfit(sizes, times, 1)[0]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cases', nargs='+', default=list(sweeps.keys()), choices=list(sweeps.keys()))
+    parser.add_argument('--blockmesh', action='store_true', help="also run blockMesh (OpenFOAM must be sourced)")
+    parser.add_argument('--plot', help="save a log-log plot to this file (requires matplotlib)")
+    parser.add_argument('--profile', action='store_true', help="sample build and write stages of all sizes")
+    args = parser.parse_args()
+
+    profiler = Profiler() if args.profile else None
+
+    if args.blockmesh and shutil.which('blockMesh') is None:
+        parser.error("blockMesh not found")
+
+    used_stages = stages if args.blockmesh else stages[:2]
+    results = {}
+
+    for name in args.cases:
+        module_name, sizes = sweeps[name]
+        n_blocks = []
+        times = {stage: [] for stage in used_stages}
+
+        print(f"{name}")
+        print(f"{'blocks':>8s}" + ''.join(f"{stage + ' [s]':>15s}" for stage in used_stages))
+
+        for parameters in sizes:
+            n, case_times = run_case(module_name, parameters, args.blockmesh, profiler)
+            n_blocks.append(n)
+
+            for stage in used_stages:
+                times[stage].append(case_times[stage])
+
+            print(f"{n:8d}" + ''.join(f"{case_times[stage]:15.3f}" for stage in used_stages))
+
+        print(f"{'exponent':>8s}" + ''.join(f"{exponent(n_blocks, times[s]):15.2f}" for s in used_stages))
+        print()
+
+        results[name] = (n_blocks, times)
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.print_hotspots()
+        profiler.write_collapsed('scaling.collapsed')
+
+    if args.plot:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib import pyplot as plt
+
+        fig, axes = plt.subplots(1, len(used_stages), figsize=(5*len(used_stages), 4))
+
+        for ax, stage in zip(axes, used_stages):
+            for name, (n_blocks, times) in results.items():
+                ax.loglog(n_blocks, times[stage], 'o-', label=name)
+
+            ax.set_title(stage)
+            ax.set_xlabel('blocks')
+            ax.set_ylabel('time [s]')
+            ax.grid(True, which='both', alpha=0.3)
+            ax.legend()
+
+        fig.tight_layout()
+        fig.savefig(args.plot)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# Compares two ways of building many meshes in worker processes:
+#  a) workers return Mesh objects that are pickled back to the parent
+#  b) workers put numbers into shared memory and return handles (util/shared.py)
+# In both cases the parent writes a blockMeshDict for every mesh.
+# Run from repository root: python -m benchmark.shared_memory
+import os
+import time
+import pickle
+import tempfile
+import multiprocessing
+
+from examples.util import shared, modules
+from examples.util.template import render_mesh
+
+n_variants = 16
+
+jobs = {
+    'coriolis_flowmeter': ('examples.chaining.coriolis_flowmeter', {}),
+    # a refined sphere; topology stays the same, cells are smaller
+    'sphere': ('examples.advanced.sphere', {
+        'ball_cell_size': 0.0125,
+        'domain_cell_size': 0.025,
+        'first_layer_thickness': 0.0025,
+    }),
+}
+
+def build_mesh(module_name, parameters):
+    return modules.load(module_name, parameters).get_mesh()
+
+def pickled(module_name, parameters, directory):
+    t_start = time.time()
+    with multiprocessing.Pool() as pool:
+        meshes = pool.starmap(build_mesh, [(module_name, parameters)]*n_variants)
+    t_built = time.time()
+
+    geometry = modules.geometry(modules.load(module_name, parameters))
+    for i, mesh in enumerate(meshes):
+        with open(os.path.join(directory, f'pickled_{i}'), 'w') as f:
+            f.write(render_mesh(mesh, geometry))
+    t_written = time.time()
+
+    return t_built - t_start, t_written - t_built, len(pickle.dumps(meshes[0]))
+
+def handles(module_name, parameters, directory):
+    t_start = time.time()
+    results = shared.build_all([(module_name, parameters)]*n_variants)
+    t_built = time.time()
+
+    for i, handle in enumerate(results):
+        handle.write_dict(os.path.join(directory, f'shared_{i}'))
+        handle.release()
+    t_written = time.time()
+
+    return t_built - t_start, t_written - t_built, len(pickle.dumps(results[0]))
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (module_name, parameters) in jobs.items():
+            for label, function in (('pickled Mesh', pickled), ('shared memory', handles)):
+                t_build, t_write, size = function(module_name, parameters, directory)
+                print(f"{name:20s} {label:15s} build: {t_build:6.3f} s, write: {t_write:6.3f} s, "
+                    f"{size:9d} bytes pickled per variant")
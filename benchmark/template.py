@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# Writing blockMeshDicts of a parametric sweep: every variant written with
+# Mesh.write() against TemplateWriter that patches changed numbers in place
+# (see examples/util/template.py). Both include rendering the dictionary.
+# Run from repository root: python -m benchmark.template
+import os
+import time
+import tempfile
+
+import numpy as np
+
+from examples.util import modules
+from examples.util.template import TemplateWriter
+
+# case: (module, parameter, values)
+sweeps = {
+    'venturi_tube': ('examples.chaining.venturi_tube', 'd', np.linspace(0.02, 0.05, 20)),
+    'sphere': ('examples.advanced.sphere', 'first_layer_thickness', np.linspace(0.005, 0.015, 20)),
+}
+
+if __name__ == '__main__':
+    print(f"{'case':15s} {'variants':>9s} {'write [ms]':>11s} {'patch [ms]':>11s} {'rewrites':>9s} {'numbers':>8s}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (module_name, parameter, values) in sweeps.items():
+            path = os.path.join(directory, f'{name}_patched')
+            writer = TemplateWriter(path)
+
+            t_write = 0
+            t_patch = 0
+            n_rewrites = 0
+            n_numbers = 0
+
+            for value in values:
+                module = modules.load(module_name, {parameter: value})
+                geometry = modules.geometry(module)
+
+                # a mesh can only be written once
+                mesh = module.get_mesh()
+                t_start = time.perf_counter()
+                mesh.write(output_path=os.path.join(directory, name), geometry=geometry, debug=False)
+                t_write += time.perf_counter() - t_start
+
+                mesh = module.get_mesh()
+                t_start = time.perf_counter()
+                n_rewrites += writer.write(mesh, geometry)
+                t_patch += time.perf_counter() - t_start
+                n_numbers += writer.n_changed
+
+            n = len(values)
+            print(f"{name:15s} {n:9d} {1000*t_write/n:11.2f} {1000*t_patch/n:11.2f} {n_rewrites:9d} {n_numbers/n:8.0f}")
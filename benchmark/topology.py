@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# Derived topology structures (merged-vertex map, axis groups, patch faces)
+# for variants of a parametric sweep: built from scratch for every variant
+# against reused from cache by topology fingerprint (see examples/util/topology.py).
+# Run from repository root: python -m benchmark.topology
+import time
+
+import numpy as np
+
+from examples.util import modules, topology
+from examples.util.blocks import get_blocks
+
+# case: (module, parameter, values)
+sweeps = {
+    'venturi_tube': ('examples.chaining.venturi_tube', 'd', np.linspace(0.02, 0.05, 30)),
+    'bundle': ('examples.stress.bundle', 'pitch', np.linspace(0.04, 0.08, 30)),
+}
+
+def variants(module_name, parameter, values):
+    for value in values:
+        module = modules.load(module_name, {parameter: value})
+        yield get_blocks(module.get_mesh())
+
+if __name__ == '__main__':
+    print(f"{'case':15s} {'variants':>9s} {'blocks':>7s} {'new [ms]':>9s} {'cached [ms]':>12s} {'topologies':>11s}")
+
+    for name, (module_name, parameter, values) in sweeps.items():
+        t_new = 0
+        t_cached = 0
+        keys = set()
+
+        for blocks in variants(module_name, parameter, values):
+            t_start = time.perf_counter()
+            topology.Topology(blocks, topology.fingerprint(blocks))
+            t_new += time.perf_counter() - t_start
+
+            t_start = time.perf_counter()
+            keys.add(id(topology.get(blocks)))
+            t_cached += time.perf_counter() - t_start
+
+        n = len(values)
+        print(f"{name:15s} {n:9d} {len(blocks):7d} {1000*t_new/n:9.2f} {1000*t_cached/n:12.2f} {len(keys):11d}")
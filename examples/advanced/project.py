@@ -1,13 +1,12 @@
 from classy_blocks.classes.mesh import Mesh
 from classy_blocks.classes.operations import Face, Extrude
 
-geometry = {
-    'terrain': [
-        'type triSurfaceMesh;',
-        'name terrain;',
-        'file "terrain.stl";',
-    ]
-}
+from examples.util.geometry import TriSurface, geometry_dict
+
+# case/constant/geometry/terrain.stl; only read when queried
+terrain = TriSurface('terrain', 'terrain.stl')
+
+geometry = geometry_dict(terrain)
 
 def get_mesh():
     base = Face([
@@ -0,0 +1,46 @@
+import numpy as np
+
+from classy_blocks.classes.mesh import Mesh
+from classy_blocks.classes.operations import Face, Extrude
+
+from examples.util import pattern
+
+# An annular channel, divided into identical passages like in a
+# turbomachinery rotor (blades themselves are omitted for simplicity);
+# only one passage is built, all others are its rotated copies.
+n_passages = 60
+
+r_hub = 0.1
+r_tip = 0.15
+height = 0.05
+
+cell_size = 0.005
+
+def get_mesh():
+    angle = 2*np.pi/n_passages
+
+    def point(radius, phi):
+        return [radius*np.cos(phi), radius*np.sin(phi), 0]
+
+    base = Face(
+        [point(r_hub, 0), point(r_tip, 0), point(r_tip, angle), point(r_hub, angle)],
+        [None, point(r_tip, angle/2), None, point(r_hub, angle/2)]
+    )
+
+    passage = Extrude(base, [0, 0, height])
+    passage.chop(0, start_size=cell_size) # radial
+    passage.chop(1, start_size=cell_size) # tangential
+    passage.chop(2, start_size=cell_size) # axial
+
+    passage.set_patch('bottom', 'inlet')
+    passage.set_patch('top', 'outlet')
+
+    mesh = Mesh()
+
+    # copies get their own chops and patches, copied from the template
+    for p in pattern.circular(passage, n_passages, [0, 0, 1]):
+        mesh.add(p)
+
+    mesh.set_default_patch('walls', 'wall')
+
+    return mesh
@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 import os
+import functools
 
 import numpy as np
 
 from classy_blocks.classes import operations
 from classy_blocks.classes.mesh import Mesh
 
+from examples.util import grading, projection
+from examples.util.geometry import Sphere, geometry_dict
+
 # sphere radius
 r = 0.5
 l_upstream = 2
@@ -13,25 +17,25 @@ l_downstream = 5
 width = 2
 
 ball_cell_size = 0.05
-domain_cell_size = 2*ball_cell_size # maximum cell size
+domain_cell_size = None # maximum cell size; None: 2*ball_cell_size
 r_prism = 0.75 # radius to which prismatic boundary layers are made
 first_layer_thickness = 0.01
 expansion_ratio = 1.2
 
-geometry = {
-    'inner_sphere': [
-        'type   sphere',
-        'origin (0 0 0)',
-        f'radius {r}',
-    ],
-    'outer_sphere': [
-        'type   sphere',
-        'origin (0 0 0)',
-        f'radius {r_prism}',
-    ]
-}
+# replace projections onto spheres with arcs calculated in python;
+# faster meshing but sphere surface between edges is interpolated
+project_in_python = False
+
+# surfaces and sizes are calculated from parameters in functions
+# so that they follow parameters, changed after import
+def get_surfaces():
+    return [Sphere('inner_sphere', [0, 0, 0], r), Sphere('outer_sphere', [0, 0, 0], r_prism)]
+
+def get_geometry():
+    return geometry_dict(*get_surfaces())
 
 def get_mesh():
+    cell_size = 2*ball_cell_size if domain_cell_size is None else domain_cell_size
 
     # create a 4x4 grid of points;
     # source point
@@ -115,7 +119,10 @@ def get_mesh():
 
         o.chop(0, start_size=ball_cell_size)
         o.chop(1, start_size=ball_cell_size)
-        o.chop(2, start_size=ball_cell_size, end_size=first_layer_thickness)
+        # prismatic layers on the sphere (top face), growing with expansion_ratio
+        grading.apply(
+            functools.partial(o.chop, 2),
+            grading.boundary_layer(r_prism - r, first_layer_thickness, expansion_ratio, ball_cell_size, invert=True))
 
         o.set_patch('top', 'sphere')
         m.add(o)
@@ -124,16 +131,19 @@ def get_mesh():
     # of blocks need specific counts set
     # x-direction
     for i in (12, 14):
-        oplist[i].chop(0, start_size=domain_cell_size)
+        oplist[i].chop(0, start_size=cell_size)
 
     # y-direction
     for i in (10, 16):
-        oplist[i].chop(1, start_size=domain_cell_size)
+        oplist[i].chop(1, start_size=cell_size)
 
     # z-direction:
     for i in (3, 21):
-        oplist[i].chop(2, start_size=domain_cell_size)
+        oplist[i].chop(2, start_size=cell_size)
 
     m.set_default_patch('sides', 'wall')
 
+    if project_in_python:
+        projection.resolve(m, get_surfaces())
+
     return m
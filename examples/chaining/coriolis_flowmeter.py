@@ -1,9 +1,11 @@
 import numpy as np
 
 from classy_blocks.classes.mesh import Mesh
-from classy_blocks.classes.shapes import Cylinder, Elbow, ExtrudedRing
-from classy_blocks.classes.walls import ElbowWall
+from classy_blocks.classes.shapes import Cylinder, Elbow
 from classy_blocks.util import functions as f
+from examples.util import sweep
+
+from examples.util.walls import add_walls
 
 def get_mesh():
     # Coriolis flow meters have this specific pipe shape that's
@@ -40,21 +42,31 @@ def get_mesh():
 
     # shapes
     fluid_shapes = []
+    # (index of elbow, sweep angle, arc center, rotation axis)
+    sweeps = []
+
+    def add_elbow(sweep_angle, arc_center, rotation_axis, radius):
+        sweeps.append((len(fluid_shapes), sweep_angle, arc_center, rotation_axis))
+        fluid_shapes.append(Elbow.chain(fluid_shapes[-1], sweep_angle, arc_center, rotation_axis, radius))
 
     fluid_shapes.append(Cylinder([0, 0, -d_pipe*entry_length], [0, 0, 0], [0, r_pipe, -d_pipe*entry_length]))
 
     # first, contracting elbow
     # Note: cross-section of elbows isn't circular everywhere;
     # that's because there are 'Loft'ed blocks on the outside and
-    # only their edges can be defined. Number of outside blocks can't be
-    # increased because it's conditioned by inside blocks - but you can
-    # assemble an elbow from smaller elbows with smaller swipe angles
-    # to gain precision if that's important.
-    # 90 or 120 degree is too much so we'll make the turns in 2 steps
+    # only their edges can be defined. Edges are made exact below
+    # (splines from sweep frames, see util/sweep.py; that matters most
+    # for contracting elbows) but faces between them are still interpolated.
+    # The deviation of those faces from the exact pipe grows with the square
+    # of sweep angle (python -m benchmark.elbow_faces): with outer blocks
+    # spanning 45 degrees, it's 0.26% of pipe radius at 30, 1.0% at 60 and
+    # 3.8% at 120 degrees (1.0%, 3.9% and 15% with 90-degree blocks).
+    # Exact edges don't make a single 120-degree elbow as good as shorter ones
+    # so the turns are still made in 2 steps.
     center_1 = f.rotate(f.vector(elbow_radius, 0, 0), elbow_angle, axis='z')
     axis_1 = f.rotate(center_1, np.pi/2, axis='z')
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], np.pi/4, center_1, axis_1, r_mid))
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], np.pi/4, center_1, axis_1, r_c))
+    add_elbow(np.pi/4, center_1, axis_1, r_mid)
+    add_elbow(np.pi/4, center_1, axis_1, r_c)
 
     # the 'inclined' connection pipe
     fluid_shapes.append(Cylinder.chain(fluid_shapes[-1], l_y))
@@ -62,8 +74,8 @@ def get_mesh():
     # get the new radius from cylinder's end face
     s = fluid_shapes[-1].sketch_2
     center_2 = s.center_point + f.unit_vector(s.radius_vector)*elbow_radius
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], -elbow_angle/2, center_2, [0, 0, 1], r_c))
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], -elbow_angle/2, center_2, [0, 0, 1], r_c))
+    add_elbow(-elbow_angle/2, center_2, [0, 0, 1], r_c)
+    add_elbow(-elbow_angle/2, center_2, [0, 0, 1], r_c)
 
     # the 'measuring pipe'
     fluid_shapes.append(Cylinder.chain(fluid_shapes[-1], l_c))
@@ -71,8 +83,8 @@ def get_mesh():
     # 2 elbows for the other turn
     s = fluid_shapes[-1].sketch_2
     center_3 = s.center_point + f.unit_vector(s.radius_vector)*elbow_radius
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], -elbow_angle/2, center_3, [0, 0, 1], r_c))
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], -elbow_angle/2, center_3, [0, 0, 1], r_c))
+    add_elbow(-elbow_angle/2, center_3, [0, 0, 1], r_c)
+    add_elbow(-elbow_angle/2, center_3, [0, 0, 1], r_c)
 
     # connection 2
     fluid_shapes.append(Cylinder.chain(fluid_shapes[-1], l_y))
@@ -81,8 +93,8 @@ def get_mesh():
     s = fluid_shapes[-1].sketch_2
     center_4 = s.center_point + f.vector(0, 0, -elbow_radius)
     axis_4 = f.rotate(f.vector(0, 1, 0), -elbow_angle, axis='z')
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], np.pi/4, center_4, axis_4, r_mid))
-    fluid_shapes.append(Elbow.chain(fluid_shapes[-1], np.pi/4, center_4, axis_4, r_pipe))
+    add_elbow(np.pi/4, center_4, axis_4, r_mid)
+    add_elbow(np.pi/4, center_4, axis_4, r_pipe)
 
     # outlet pipe
     fluid_shapes.append(Cylinder.chain(fluid_shapes[-1], d_pipe*exit_length))
@@ -98,22 +110,15 @@ def get_mesh():
     fluid_shapes[0].chop_axial(start_size=cell_size*cell_expansion, end_size=cell_size)
     fluid_shapes[-1].chop_axial(start_size=cell_size, end_size=cell_size*cell_expansion)
 
-    # add pipe walls
-    solid_shapes = []
-
     for fs in fluid_shapes:
         fs.set_cell_zone('fluid')
 
-        if fs.__class__ == Cylinder:
-            solid_class = ExtrudedRing
-        elif fs.__class__ == Elbow:
-            solid_class = ElbowWall
-        
-        solid = solid_class.expand(fs, t_wall)
-        solid.set_cell_zone('solid')
-        solid_shapes.append(solid)
-    
-    solid_shapes[0].chop_radial(count=4)
+    # add pipe walls; a matching wall shape is chosen for each fluid shape
+    solid_shapes = add_walls(fluid_shapes, t_wall, cell_zones='solid', radial_chops={'count': 4})[0]
+
+    # exact edges on elbows and their walls
+    for i, sweep_angle, arc_center, rotation_axis in sweeps:
+        sweep.refine([fluid_shapes[i], solid_shapes[i]], sweep_angle, arc_center, rotation_axis)
 
     for s in fluid_shapes + solid_shapes:
         mesh.add(s)
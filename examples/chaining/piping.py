@@ -0,0 +1,46 @@
+from classy_blocks.classes.mesh import Mesh
+from classy_blocks.util import functions as f
+
+from examples.util.piping import Route
+
+# a pipe with twists and turns, defined only by its centreline;
+# see util/piping.py for details
+centreline = [
+    [0, 0, 0],
+    [0.5, 0, 0],
+    [0.5, 0.4, 0],
+    [0.8, 0.4, 0.3],
+    [0.8, 0.4, 1.0],
+]
+
+pipe_radius = 0.05
+bend_radius = 0.15
+
+# bends sharper than this are made from more elbows
+max_angle = 45 # degrees
+
+cell_size = 0.01
+bl_thickness = 0.002
+
+def get_mesh():
+    route = Route(centreline, pipe_radius, bend_radius, max_angle=f.deg2rad(max_angle))
+    shapes = route.build()
+
+    # counts are propagated to all chained shapes so
+    # only axial chops are needed for the rest
+    shapes[0].chop_tangential(start_size=cell_size)
+    shapes[0].chop_radial(start_size=cell_size, end_size=bl_thickness)
+
+    for s in shapes:
+        s.chop_axial(start_size=cell_size)
+
+    shapes[0].set_bottom_patch('inlet')
+    shapes[-1].set_top_patch('outlet')
+
+    mesh = Mesh()
+    for s in shapes:
+        mesh.add(s)
+
+    mesh.set_default_patch('walls', 'wall')
+
+    return mesh
@@ -4,6 +4,25 @@ from classy_blocks.classes.mesh import Mesh
 from classy_blocks.classes.shapes import Cylinder, Frustum
 from classy_blocks.util import functions as f
 
+# see venturi_tube.svg for sketch
+# https://www.researchgate.net/figure/The-Critical-Dimensions-of-the-Classical-Venturi-Tube-Source-p-24-Principles-and_fig5_311949745
+
+D = 0.1 # [m]
+d = 0.03 # exaggerated to illustrate the awesomeness
+entry_length = 5 # *D
+entry_angle = 20 # degrees
+
+exit_length = 8 # *D
+exit_angle = 10 # degrees
+
+fillet_radius = 1.5*D # also exaggerated to display even more awesomeness
+
+# chopping
+cell_size = 0.08*D
+# to save on simulation time
+# use bigger cells in lenghty entry/exit sections
+cell_dilution = 5
+
 def calculate_fillet(r_pipe, r_fillet, a_cone):
     # see venturi_tube.svg for explanation
     a_cone = f.deg2rad(a_cone)
@@ -18,28 +37,9 @@ def calculate_fillet(r_pipe, r_fillet, a_cone):
 def calculate_cone(r_start, r_end, a_cone):
     return abs(r_end - r_start)/np.tan(f.deg2rad(a_cone))
 
-def get_mesh():
-    # see venturi_tube.svg for sketch
-    # https://www.researchgate.net/figure/The-Critical-Dimensions-of-the-Classical-Venturi-Tube-Source-p-24-Principles-and_fig5_311949745
-
-    D = 0.1 # [m]
-    d = 0.03 # exaggerated to illustrate the awesomeness
-    entry_length = 5 # *D
-    entry_angle = 20 # degrees
-
-    exit_length = 8 # *D
-    exit_angle = 10 # degrees
-
-    fillet_radius = 1.5*D # also exaggerated to display even more awesomeness
-    
-    # chopping
-    cell_size = 0.08*D
-    # to save on simulation time
-    # use bigger cells in lenghty entry/exit sections
-    cell_dilution = 5 
-
-    mesh = Mesh()
-
+def get_shapes():
+    # chopped shapes with patches; the tube is axisymmetric so
+    # it can also be meshed with wedges (see venturi_wedge.py)
     shapes = []
     # entry tube
     shapes.append(Cylinder(
@@ -93,9 +93,15 @@ def get_mesh():
     # patches
     shapes[0].set_bottom_patch('inlet')
     shapes[-1].set_top_patch('outlet')
-    mesh.set_default_patch('walls', 'wall')
 
-    for s in shapes:
+    return shapes
+
+def get_mesh():
+    mesh = Mesh()
+
+    for s in get_shapes():
         mesh.add(s)
+
+    mesh.set_default_patch('walls', 'wall')
     
     return mesh
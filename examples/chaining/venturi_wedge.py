@@ -0,0 +1,7 @@
+from examples.chaining import venturi_tube
+from examples.util import axisymmetric
+
+# the same venturi tube as in venturi_tube.py but meshed as an
+# axisymmetric wedge; gradings and patches are taken from 3D shapes
+def get_mesh():
+    return axisymmetric.reduce(venturi_tube.get_shapes(), default_patch=('walls', 'wall'))
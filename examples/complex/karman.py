@@ -1,6 +1,8 @@
 from classy_blocks.classes.mesh import Mesh
 from classy_blocks.classes.shapes import ExtrudedRing, Box
 
+from examples.util import grading
+
 def get_mesh():
     cylinder_diameter = 20e-3 # [m]
     ring_thickness = 5e-3 # [m]
@@ -34,7 +36,8 @@ def get_mesh():
 
     wall_ring.chop_axial(count=1)
     wall_ring.chop_tangential(start_size=cell_size)
-    wall_ring.chop_radial(start_size=bl_thickness, c2c_expansion=c2c_expansion)
+    # cells grow from bl_thickness but don't get bigger than cell_size
+    grading.apply(wall_ring.chop_radial, grading.boundary_layer(ring_thickness, bl_thickness, c2c_expansion, cell_size))
     wall_ring.set_inner_patch('cylinder')
 
     mesh.add(wall_ring)
@@ -3,6 +3,8 @@ from classy_blocks.classes.objects import Semicylinder, SharpSemicylinder
 
 import numpy as np
 
+from examples.util import transform as t
+
 # a T-joint:
 #            
 # left <---- O ----> right (x-coordinate)
@@ -33,11 +35,6 @@ def get_mesh():
 
     left_upper = Semicylinder(left_center, center_point, [-arm_length, 0, pipe_diameter/2])
 
-    right_center = [arm_length, 0, 0]
-    right_lower = SharpSemicylinder(right_center, center_point, [arm_length, 0, pipe_diameter/2])
-
-    right_upper = Semicylinder(right_center, center_point, [arm_length, 0, -pipe_diameter/2])
-
     #inlet_left.set_bottom_patch('inlet')
     #inlet_left.set_top_patch('outlet')
     #inlet_left.set_outer_patch('walls')
@@ -64,9 +61,11 @@ def get_mesh():
     left_upper.chop_tangential(count=5)
     mesh.add(left_upper)
 
-    right_lower.chop_axial(count=10)
-    mesh.add(right_lower)
+    # the right arm is the left one, rotated around y-axis;
+    # both semicylinders are copied and rotated in one go
+    right_lower, right_upper = t.transformed([left_lower, left_upper], t.rotation([0, 1, 0], np.pi, center_point))
 
+    mesh.add(right_lower)
     mesh.add(right_upper)
 
     return mesh
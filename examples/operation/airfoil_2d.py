@@ -5,53 +5,27 @@ from classy_blocks.classes.operations import Face, Extrude
 
 import numpy as np
 
-def load_airfoil_file(filename, chord=1):
-    points_upper = []
-    points_lower = []
-
-    def line_to_numbers(line):
-        line = line.strip()
-        p2d = [float(s) for s in line.split()]
-
-        # add a z-coordinate
-        return [p2d[0], p2d[1], 0]
-
-    with open(filename, 'r') as f:
-        # reads Lednicer airfoil file from airfoiltools.com
-        # sample: http://airfoiltools.com/airfoil/details?airfoil=tempest1-il
-
-        # first line: name, nothing useful
-        f.readline()
-
-        # second line: number of points for upper and lower portion
-        n_points = line_to_numbers(f.readline())
+from examples.util import points
 
-        # an empty line
-        f.readline()
-
-        for _ in range(int(n_points[0])):
-            points_upper.append(line_to_numbers(f.readline()))
+def load_airfoil_file(filename, chord=1):
+    # reads Lednicer airfoil file from airfoiltools.com
+    # sample: http://airfoiltools.com/airfoil/details?airfoil=tempest1-il
+    # first line: name, nothing useful;
+    # then the number of points for upper and lower portion and the points
+    data = points.load(filename, skip_rows=1)
+    n_upper, n_lower = data[0].astype(int)
 
-        # an empty line between upper and lower part
-        f.readline()
+    # add a z-coordinate
+    points_upper = points.with_z(data[1:n_upper + 1])
+    points_lower = points.with_z(data[n_upper + 1:n_upper + n_lower + 1])
 
-        for _ in range(int(n_points[1])):
-            points_lower.append(line_to_numbers(f.readline()))
-    
-    return np.array(points_upper)*chord, np.array(points_lower)*chord
+    return points_upper*chord, points_lower*chord
 
 # finding points closest to wanted coordinate
-def find_y(points, x):
-    i_result = 0
-    y_result = 0
-
-    for i, p in enumerate(points):
-        if p[0] > x:
-            i_result = i
-            y_result = p[1]
-            break
+def find_y(airfoil_points, x):
+    i = points.split_index(airfoil_points, x)
 
-    return i_result, y_result
+    return i, airfoil_points[i, 1]
 
 def get_mesh():
     ###
@@ -66,11 +40,22 @@ def get_mesh():
 
     cell_size = 0.01
 
+    # with many airfoil points (scanned profiles), spline edges can be made
+    # from fewer points that deviate from the original less than this [m];
+    # None: use all points
+    edge_tolerance = None
+
     ###
     ### point preparation
     ###
     p_upper, p_lower = load_airfoil_file(os.path.join('examples', 'operation', 'airfoil_1.dat'), chord=chord)
 
+    def edge(edge_points):
+        if edge_tolerance is None:
+            return edge_points
+
+        return edge_points[points.decimate(edge_points, edge_tolerance)]
+
     ###
     ### block creation
     ###
@@ -88,7 +73,7 @@ def get_mesh():
     ]
     face_top_1_edges = [
         None,
-        p_upper[0:i-1],
+        edge(p_upper[0:i-1]),
         None,
         [-radius_edge + chord*radius_center, radius_edge, 0]
     ]
@@ -111,7 +96,7 @@ def get_mesh():
         [max_x_1, domain_radius, 0]
     ]
 
-    face_top_2_edges = [p_upper[i:], None, None, None]
+    face_top_2_edges = [edge(p_upper[i:]), None, None, None]
 
     face_top_2 = Face(face_top_2_vertices, face_top_2_edges)
     extrude_top_2 = Extrude(face_top_2, thickness)
@@ -140,7 +125,7 @@ def get_mesh():
     face_bottom_1_edges = [
         [-radius_edge + chord*radius_center, -radius_edge, 0],
         None,
-        np.flip(p_lower[0:i-1], axis=0), # this block is defined in reverse so edge points must be reversed as well
+        np.flip(edge(p_lower[0:i-1]), axis=0), # this block is defined in reverse so edge points must be reversed as well
         None
     ]
 
@@ -156,7 +141,7 @@ def get_mesh():
         [chord, 0, 0]
     ]
 
-    face_bottom_2_edges = [None, None, None, np.flip(p_lower[i:], axis=0)]
+    face_bottom_2_edges = [None, None, None, np.flip(edge(p_lower[i:]), axis=0)]
 
     face_bottom_2 = Face(face_bottom_2_vertices, face_bottom_2_edges)
     extrude_bottom_2 = Extrude(face_bottom_2, thickness)
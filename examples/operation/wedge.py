@@ -1,6 +1,11 @@
 from classy_blocks.classes.mesh import Mesh
 from classy_blocks.classes.operations import Face, Wedge
 
+from examples.util import pattern
+
+# number of grooves in the seal
+n_grooves = 5
+
 def get_mesh():
     mesh = Mesh()
 
@@ -19,28 +24,21 @@ def get_mesh():
     # x axis = [1, 0, 0]
     base = base.translate([0, 1, 0])
 
-    # then copy it along x-axis,
-    # representing an annular seal with grooves
-    wedges = []
-    for _ in range(5):
-        wedge = Wedge(base)
-
-        # this has to be set on all blocks;
-        # others will be copied
-        wedge.chop(0, count=30)
-
-        wedge.set_outer_patch('static_wall')
-        wedge.set_inner_patch('rotating_walls')
+    wedge = Wedge(base)
 
-        wedges.append(wedge)
-        mesh.add(wedge)
+    # chops and patches are copied to all grooves
+    wedge.chop(0, count=30)
+    wedge.chop(1, c2c_expansion=1.2, start_size=0.01, invert=True)
 
-        base = base.translate([1, 0, 0])
+    wedge.set_outer_patch('static_wall')
+    wedge.set_inner_patch('rotating_walls')
 
-    wedges[0].set_left_patch('inlet')
-    wedges[-1].set_right_patch('outlet')
+    # then copy it along x-axis,
+    # representing an annular seal with grooves
+    wedges = pattern.periodic(wedge, n_grooves, [1, 0, 0],
+        first_patches={'left': 'inlet'}, last_patches={'right': 'outlet'})
 
-    # this will be copied to all next blocks
-    wedges[0].chop(1, c2c_expansion=1.2, start_size=0.01, invert=True)
+    for w in wedges:
+        mesh.add(w)
 
     return mesh
@@ -0,0 +1,38 @@
+import numpy as np
+
+from classy_blocks.classes.mesh import Mesh
+
+from examples.util.bundle import tube_bundle
+
+# A synthetic stress case: a 2D domain with n_rows*n_columns cylinders,
+# each surrounded by a ring of cells and 8 boxes as in complex/karman.py;
+# see util/bundle.py and benchmark/scaling.py
+
+n_rows = 5
+n_columns = 5
+
+cylinder_diameter = 20e-3 # [m]
+ring_thickness = 5e-3 # [m]
+pitch = 0.05 # distance between cylinder centers [m]
+
+cell_size = 0.3*ring_thickness
+z = 0.01
+
+# create blocks in this many processes
+n_processes = 1
+
+def get_mesh():
+    mesh = Mesh()
+
+    x, y = np.meshgrid(np.arange(n_columns)*pitch, np.arange(n_rows)*pitch, indexing='ij')
+    centers = np.stack((x, y), axis=-1)
+
+    blocks = tube_bundle(centers, cylinder_diameter/2, ring_thickness, z, cell_size,
+        spacing=(pitch, pitch), obstacle_patch='cylinders', n_processes=n_processes)
+
+    for block in blocks:
+        mesh.add_block(block)
+
+    mesh.set_default_patch('walls', 'wall')
+
+    return mesh
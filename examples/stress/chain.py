@@ -0,0 +1,45 @@
+import numpy as np
+
+from classy_blocks.classes.mesh import Mesh
+
+from examples.util.piping import Route
+
+# A synthetic stress case: a long pipe along a helix, made of
+# n_segments Cylinders and at least as many Elbows; see benchmark/scaling.py
+
+n_segments = 100
+
+# centreline
+helix_radius = 1
+helix_pitch = 0.5 # rise per turn
+points_per_turn = 8
+
+pipe_radius = 0.05
+bend_radius = 0.15
+cell_size = 0.02
+
+def get_mesh():
+    angles = np.arange(n_segments + 1)*2*np.pi/points_per_turn
+    centreline = np.stack((
+        helix_radius*np.cos(angles),
+        helix_radius*np.sin(angles),
+        helix_pitch*angles/(2*np.pi)), axis=1)
+
+    shapes = Route(centreline, pipe_radius, bend_radius).build()
+
+    shapes[0].chop_tangential(start_size=cell_size)
+    shapes[0].chop_radial(start_size=cell_size)
+
+    for s in shapes:
+        s.chop_axial(start_size=cell_size)
+
+    shapes[0].set_bottom_patch('inlet')
+    shapes[-1].set_top_patch('outlet')
+
+    mesh = Mesh()
+    for s in shapes:
+        mesh.add(s)
+
+    mesh.set_default_patch('walls', 'wall')
+
+    return mesh
@@ -0,0 +1,50 @@
+import numpy as np
+
+from classy_blocks.classes.block import Block
+from classy_blocks.classes.mesh import Mesh
+
+from examples.util.zones import Tables
+
+# A synthetic stress case: a lattice of n_x*n_y*n_z blocks;
+# only one row of blocks along each axis is chopped (along that axis)
+# so that counts must be propagated through the whole lattice;
+# see benchmark/scaling.py; inlet and outlet patches are selected
+# by position of faces in bulk (see util/zones.py)
+
+n_x = 10
+n_y = 10
+n_z = 10
+
+block_size = 0.1
+cell_size = 0.02
+
+def get_mesh():
+    mesh = Mesh()
+
+    # block corners, in the same order as block vertices
+    corners = np.array([
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+    ])*block_size
+
+    for i in range(n_x):
+        for j in range(n_y):
+            for k in range(n_z):
+                block = Block.create_from_points(corners + np.array([i, j, k])*block_size)
+
+                for axis, others in enumerate(((j, k), (i, k), (i, j))):
+                    if others == (0, 0):
+                        block.chop(axis, start_size=cell_size)
+
+                mesh.add_block(block)
+
+    # the rest of the outside is the default patch
+    tables = Tables(mesh)
+    tol = block_size/10
+    tables.set_patch('inlet', tables.select_faces(lambda c, n: c[:, 0] < tol))
+    tables.set_patch('outlet', tables.select_faces(lambda c, n: c[:, 0] > n_x*block_size - tol))
+    tables.apply()
+
+    mesh.set_default_patch('walls', 'wall')
+
+    return mesh
@@ -0,0 +1,277 @@
+import copy
+
+import numpy as np
+
+from classy_blocks.classes.mesh import Mesh
+from classy_blocks.classes.operations import Face, Wedge
+from classy_blocks.classes.shapes import Cylinder, Frustum, ExtrudedRing
+
+from examples.util import tfi
+from examples.util.blocks import axis_pairs, block_counts, get_blocks, prepare
+
+# Axisymmetric reduction: a chain of Cylinders, Frustums and ExtrudedRings
+# along a common axis is replaced by a single layer of Wedge blocks in the
+# x-y plane (x is the axis of rotation). Everything is taken from blocks
+# of the original shapes after counts and gradings are calculated:
+# - axial grading from each shape's blocks,
+# - radial grading by following block edges from the inside out
+#   (core and shell of a cylinder become one radial division each),
+# - patches on the start, end, inner and outer side of each shape.
+# Only for swirl-free flows, of course.
+
+reducible_shapes = (Cylinder, Frustum, ExtrudedRing)
+
+def unit(vector):
+    return vector/np.linalg.norm(vector)
+
+class Section:
+    # a shape, projected to (axial coordinate, radius) plane
+    def __init__(self, shape, origin, axis):
+        self.shape = shape
+        self.blocks = get_blocks(shape)
+
+        points = np.array([[v.point for v in block.vertices] for block in self.blocks])
+        self.axial, self.radii = self.project(points, origin, axis)
+
+        scale = np.max(self.radii)
+        self.tol = 1e-6*scale
+
+        self.start = np.min(self.axial)
+        self.end = np.max(self.axial)
+
+        def radius_range(position):
+            at = self.radii[np.abs(self.axial - position) < self.tol]
+            return np.min(at), np.max(at)
+
+        self.inner = np.array([radius_range(self.start)[0], radius_range(self.end)[0]])
+        self.outer = np.array([radius_range(self.start)[1], radius_range(self.end)[1]])
+        self.mid = self.mid_radius(origin, axis)
+
+        self.axial_divisions = self.find_axial()
+        self.radial_divisions = self.find_radial()
+        self.patches = self.find_patches()
+
+    @staticmethod
+    def project(points, origin, axis):
+        relative = points - origin
+        axial = np.dot(relative, axis)
+        radii = np.linalg.norm(relative - axial[..., None]*axis, axis=-1)
+
+        return axial, radii
+
+    def mid_radius(self, origin, axis):
+        # radius of curved outer side (Frustum with radius_mid)
+        for i_block, block in enumerate(self.blocks):
+            for edge in block.edges:
+                if edge.type != 'arc':
+                    continue
+
+                i_1, i_2 = edge.block_index_1, edge.block_index_2
+                if abs(self.axial[i_block, i_1] - self.axial[i_block, i_2]) < self.tol:
+                    # a tangential arc
+                    continue
+
+                if min(self.radii[i_block, i_1], self.radii[i_block, i_2]) < np.min(self.outer) - self.tol:
+                    continue
+
+                _, radius = self.project(np.asarray(edge.points, dtype=float), origin, axis)
+                return float(radius)
+
+        return None
+
+    def divisions(self, block, axis, reverse):
+        # [(length ratio, count, total expansion), ...] of a block's axis
+        lengths, counts, expansions = tfi.division_counts(
+            block.grading[axis].divisions, block_counts(block)[axis])
+
+        divisions = [(float(l), int(c), float(e)) for l, c, e in zip(lengths, counts, expansions)]
+
+        if reverse:
+            divisions = [(l, c, 1/e) for l, c, e in divisions[::-1]]
+
+        return divisions
+
+    def find_axial(self):
+        # the axial direction of a block is the one where axial coordinate
+        # changes the most
+        i_block = 0
+        block = self.blocks[i_block]
+        changes = [np.mean([self.axial[i_block, j] - self.axial[i_block, i] for i, j in axis_pairs[a]]) for a in range(3)]
+        axis = int(np.argmax(np.abs(changes)))
+
+        return self.divisions(block, axis, changes[axis] < 0)
+
+    def find_radial(self):
+        # radial segments of all blocks on the start side:
+        # (start radius, end radius, divisions), each from the edge
+        # that starts the closest to the axis
+        segments = []
+
+        for i_block, block in enumerate(self.blocks):
+            best = None
+
+            for axis in range(3):
+                for i, j in axis_pairs[axis]:
+                    r_i, r_j = self.radii[i_block, i], self.radii[i_block, j]
+                    if max(abs(self.axial[i_block, i] - self.start), abs(self.axial[i_block, j] - self.start)) > self.tol:
+                        continue
+                    if abs(r_j - r_i) < self.tol:
+                        continue
+
+                    reverse = r_j < r_i
+                    r_start, r_end = min(r_i, r_j), max(r_i, r_j)
+
+                    if best is None or (r_start, -r_end) < (best[0], -best[1]):
+                        best = (r_start, r_end, axis, reverse)
+
+            if best is not None:
+                segments.append((best[0], best[1], self.divisions(block, best[2], best[3])))
+
+        # chain segments from the inside out, the longest first
+        radius = self.inner[0]
+        r_max = self.outer[0]
+        chain = []
+
+        while radius < r_max - self.tol:
+            candidates = [s for s in segments if abs(s[0] - radius) < self.tol and s[1] > radius + self.tol]
+            if not candidates:
+                raise ValueError(f"Can't follow radial edges of {type(self.shape).__name__} at radius {radius}")
+
+            segment = max(candidates, key=lambda s: s[1])
+            chain.append(segment)
+            radius = segment[1]
+
+        total = chain[-1][1] - chain[0][0]
+        divisions = []
+        for r_start, r_end, segment_divisions in chain:
+            for length, count, expansion in segment_divisions:
+                divisions.append((float(length*(r_end - r_start)/total), count, expansion))
+
+        return divisions
+
+    def find_patches(self):
+        # {'left'|'right'|'inner'|'outer': patch name}
+        patches = {}
+
+        for i_block, block in enumerate(self.blocks):
+            for name, sides in block.patches.items():
+                for side in sides:
+                    indexes = list(block.face_map[side])
+                    axial = self.axial[i_block, indexes]
+                    radii = self.radii[i_block, indexes]
+
+                    # inner and outer radius at these points
+                    t = (axial - self.start)/(self.end - self.start)
+                    inner = self.inner[0] + t*(self.inner[1] - self.inner[0])
+                    outer = self.outer[0] + t*(self.outer[1] - self.outer[0])
+
+                    if np.all(np.abs(axial - self.start) < self.tol):
+                        patches['left'] = name
+                    elif np.all(np.abs(axial - self.end) < self.tol):
+                        patches['right'] = name
+                    elif self.mid is None and np.all(np.abs(radii - outer) < self.tol):
+                        patches['outer'] = name
+                    elif self.mid is not None and np.all(radii > inner + self.tol):
+                        patches['outer'] = name
+                    elif np.all(np.abs(radii - inner) < self.tol):
+                        patches['inner'] = name
+
+        return patches
+
+    @property
+    def n_cells(self):
+        return sum(d[1] for d in self.axial_divisions)*sum(d[1] for d in self.radial_divisions)
+
+    def wedge(self, angle=None):
+        x = float(self.start), float(self.end)
+        inner = self.inner.tolist()
+        outer = self.outer.tolist()
+
+        points = [
+            [x[0], inner[0], 0],
+            [x[1], inner[1], 0],
+            [x[1], outer[1], 0],
+            [x[0], outer[0], 0],
+        ]
+
+        edges = [None, None, None, None]
+        if self.mid is not None:
+            edges[2] = [(x[0] + x[1])/2, self.mid, 0]
+
+        face = Face(points, edges)
+        wedge = Wedge(face) if angle is None else Wedge(face, angle)
+
+        for length, count, expansion in self.axial_divisions:
+            wedge.chop(0, length_ratio=length, count=count, total_expansion=expansion)
+
+        for length, count, expansion in self.radial_divisions:
+            wedge.chop(1, length_ratio=length, count=count, total_expansion=expansion)
+
+        setters = {
+            'left': wedge.set_left_patch,
+            'right': wedge.set_right_patch,
+            'inner': wedge.set_inner_patch,
+            'outer': wedge.set_outer_patch,
+        }
+
+        for side, name in self.patches.items():
+            setters[side](name)
+
+        return wedge
+
+def find_axis(shapes):
+    # origin and direction of the common axis or None if there isn't one
+    for shape in shapes:
+        if not isinstance(shape, reducible_shapes):
+            return None
+
+    origin = np.asarray(shapes[0].sketch_1.center_point, dtype=float)
+    axis = unit(np.asarray(shapes[0].sketch_2.center_point, dtype=float) - origin)
+
+    for shape in shapes:
+        for sketch in (shape.sketch_1, shape.sketch_2):
+            relative = np.asarray(sketch.center_point, dtype=float) - origin
+            if np.linalg.norm(np.cross(relative, axis)) > 1e-6*max(np.linalg.norm(relative), 1):
+                return None
+
+    return origin, axis
+
+def sections(shapes):
+    # shapes are not changed; counts and gradings are calculated on copies
+    shapes = copy.deepcopy(shapes)
+
+    found = find_axis(shapes)
+    if found is None:
+        raise ValueError("Shapes are not an axisymmetric chain of Cylinders, Frustums and ExtrudedRings")
+
+    mesh = Mesh()
+    for shape in shapes:
+        mesh.add(shape)
+    prepare(mesh)
+
+    return [Section(shape, *found) for shape in shapes], mesh
+
+def wedge_mesh(shapes, default_patch=None, angle=None):
+    # returns a Mesh of Wedges and (3D cell count, wedge cell count)
+    shape_sections, mesh_3d = sections(shapes)
+
+    mesh = Mesh()
+    for section in shape_sections:
+        mesh.add(section.wedge(angle))
+
+    if default_patch is not None:
+        mesh.set_default_patch(*default_patch)
+
+    n_cells_3d = sum(np.prod(block_counts(block)) for block in get_blocks(mesh_3d))
+    n_cells = sum(section.n_cells for section in shape_sections)
+
+    return mesh, (int(n_cells_3d), int(n_cells))
+
+def reduce(shapes, default_patch=None, angle=None):
+    # wedge_mesh() that reports saved cells
+    mesh, (n_cells_3d, n_cells) = wedge_mesh(shapes, default_patch, angle)
+
+    print(f"Axisymmetric reduction: {n_cells_3d} cells in 3D, {n_cells} in wedge "
+        f"({n_cells_3d/n_cells:.1f}x fewer)")
+
+    return mesh
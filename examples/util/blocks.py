@@ -0,0 +1,139 @@
+import numpy as np
+
+from classy_blocks.classes.block import Block
+
+# Helpers for working with blocks of any classy_blocks item:
+# a Mesh, a Shape, an Operation, a single Block or a list of those.
+
+# block vertex pairs that define edges in each direction;
+# the first pair of each axis goes from vertex 0
+axis_pairs = (
+    ((0, 1), (3, 2), (7, 6), (4, 5)), # axis 0
+    ((0, 3), (1, 2), (5, 6), (4, 7)), # axis 1
+    ((0, 4), (1, 5), (2, 6), (3, 7)), # axis 2
+)
+
+# points closer than this are considered the same
+tolerance = 1e-7
+
+def get_blocks(item):
+    if isinstance(item, Block):
+        return [item]
+
+    if isinstance(item, (list, tuple)):
+        blocks = []
+        for i in item:
+            blocks += get_blocks(i)
+
+        return blocks
+
+    if hasattr(item, 'block'):
+        # an Operation
+        return [item.block]
+
+    # a Shape or a Mesh
+    return list(item.blocks)
+
+def block_points(blocks):
+    # an array of shape (n_blocks, 8, 3)
+    return np.array([[v.point for v in block.vertices] for block in blocks], dtype=float).reshape(-1, 8, 3)
+
+# offsets to half of neighbouring buckets (the other half is symmetric)
+neighbour_offsets = np.array([
+    (i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)
+    if (i, j, k) > (0, 0, 0)])
+
+def bucket_search(buckets, offsets):
+    # buckets: lexicographically sorted unique integer keys (n, 3);
+    # returns positions of buckets + offset for each offset, -1 where there's none;
+    # keys are packed into single integers (in the same order) by their rank along each axis
+    ranks = [] # for each axis: {offset: rank of shifted key or -1}
+    sizes = []
+
+    for axis in range(3):
+        values = np.unique(buckets[:, axis])
+        sizes.append(len(values))
+        ranks.append({})
+
+        for d in (-1, 0, 1):
+            shifted = buckets[:, axis] + d
+            rank = np.minimum(np.searchsorted(values, shifted), len(values) - 1)
+            ranks[axis][d] = np.where(values[rank] == shifted, rank, -1)
+
+    if np.prod(np.array(sizes, dtype=float)) < 2**62:
+        def pack(keys, r):
+            return (r[0]*sizes[1] + r[1])*sizes[2] + r[2]
+    else:
+        # too many for packing; compare keys as records
+        def pack(keys, r):
+            keys = np.ascontiguousarray(keys, dtype=np.int64)
+            return keys.view([('x', np.int64), ('y', np.int64), ('z', np.int64)]).reshape(-1)
+
+    packed = pack(buckets, [ranks[axis][0] for axis in range(3)])
+    positions = []
+
+    for offset in offsets:
+        r = [ranks[axis][offset[axis]] for axis in range(3)]
+        keys = pack(buckets + offset, r)
+        found = np.minimum(np.searchsorted(packed, keys), len(packed) - 1)
+
+        valid = (r[0] >= 0) & (r[1] >= 0) & (r[2] >= 0) & (packed[found] == keys)
+        positions.append(np.where(valid, found, -1))
+
+    return positions
+
+def join_labels(labels, pairs):
+    # labels of connected pairs (m, 2) become the smallest label in their group
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, pairs[:, 0], labels[pairs[:, 1]])
+        np.minimum.at(new_labels, pairs[:, 1], labels[pairs[:, 0]])
+
+        # follow labels to the root
+        while True:
+            jumped = new_labels[new_labels]
+            if np.array_equal(jumped, new_labels):
+                break
+            new_labels = jumped
+
+        if np.array_equal(new_labels, labels):
+            return labels
+
+        labels = new_labels
+
+def merge_points(points, tol=tolerance):
+    # returns unique points and indexes that map
+    # original points to unique ones
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    keys = np.round(points/tol).astype(np.int64)
+    unique_keys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # points a round-off apart can land in neighbouring buckets;
+    # those are joined when their first points are closer than tol
+    representatives = points[first]
+    pairs = []
+
+    for found in bucket_search(unique_keys, neighbour_offsets):
+        i_1 = np.flatnonzero(found >= 0)
+        i_2 = found[i_1]
+        close = np.linalg.norm(representatives[i_1] - representatives[i_2], axis=1) < tol
+        pairs.append(np.column_stack((i_1[close], i_2[close])))
+
+    pairs = np.concatenate(pairs)
+    if len(pairs) == 0:
+        return representatives, inverse
+
+    labels = join_labels(np.arange(len(unique_keys)), pairs)
+    roots, groups = np.unique(labels, return_inverse=True)
+
+    return representatives[roots], groups.reshape(-1)[inverse]
+
+def prepare(mesh):
+    # collects vertices and edges, propagates cell counts and
+    # calculates gradings, the same as Mesh.write() does before writing
+    mesh.prepare_data()
+
+def block_counts(block):
+    # only valid after prepare(mesh)
+    return [int(block.grading[axis].count) for axis in range(3)]
@@ -0,0 +1,241 @@
+import multiprocessing
+
+import numpy as np
+
+from classy_blocks.classes.primitives import Edge
+from classy_blocks.classes.block import Block
+
+# Tube bundles (2D arrays of cylindrical obstacles, extruded in z) from arrays of
+# obstacle centers and radii. Obstacles are arranged in a logical lattice
+# (n_columns x n_rows; rows and columns need not be straight) and each one gets
+# an O-grid: 4 ring blocks from its circle to a square around it.
+# Squares of all obstacles and points between them make a single structured grid
+# of corner points, calculated for all obstacles at once; filler blocks are quads
+# of that grid. Every point is a single Vertex, shared by all blocks that use it,
+# through an index map (block, vertex) > point.
+# Blocks can optionally be created in worker processes.
+# Only extruded 2D cylinders are covered; arrays of 3D obstacles (spheres,
+# hemispheres as in advanced/sphere.py) still have to be built shape by shape.
+
+# directions of square corners, counter-clockwise
+corner_signs = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+
+# arc midpoints of ring blocks between corners k and k+1
+arc_directions = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]])
+
+def extend(values, spacing, axis):
+    # values of a lattice with a ghost row/column on each side along axis;
+    # ghost centers are linearly extrapolated or, with spacing, moved by spacing
+    pad = [(0, 0)]*values.ndim
+    pad[axis] = (1, 1)
+
+    if spacing is None:
+        if values.shape[axis] < 2:
+            raise ValueError("A single row or column of obstacles needs a spacing")
+
+        return np.pad(values, pad, mode='reflect', reflect_type='odd')
+
+    extended = np.pad(values, pad, mode='edge')
+
+    # a view with the padded axis first
+    ends = np.moveaxis(extended, axis, 0)
+    ends[0, ..., axis] -= spacing
+    ends[-1, ..., axis] += spacing
+
+    return extended
+
+def line_weights(n):
+    # (3n + 1, 2(n + 2)): grid lines of n tiles from square corners of an
+    # extended lattice; lines between tiles are in the middle between squares
+    weights = np.zeros((3*n + 1, 2*(n + 2)))
+
+    for line in range(3*n + 1):
+        i, r = divmod(line, 3)
+
+        if r == 0:
+            weights[line, 2*i + 1] = weights[line, 2*i + 2] = 0.5
+        else:
+            weights[line, 2*i + 1 + r] = 1
+
+    return weights
+
+def corner_grid(centers, half_sizes, spacing=(None, None)):
+    # centers: (n_columns, n_rows, 2), half_sizes: (n_columns, n_rows)
+    # returns corner points (3*n_columns + 1, 3*n_rows + 1, 2)
+    n_columns, n_rows = half_sizes.shape
+
+    centers = extend(extend(centers, spacing[0], 0), spacing[1], 1)
+    half_sizes = np.pad(half_sizes, 1, mode='edge')
+
+    # square corners of all obstacles: (2*n_columns + 4, 2*n_rows + 4, 2)
+    signs = np.array([-1, 1])
+    squares = np.empty(centers.shape[:2] + (2, 2, 2))
+    squares[..., 0] = centers[:, :, None, None, 0] + half_sizes[:, :, None, None]*signs[:, None]
+    squares[..., 1] = centers[:, :, None, None, 1] + half_sizes[:, :, None, None]*signs[None, :]
+    squares = squares.transpose(0, 2, 1, 3, 4).reshape(2*n_columns + 4, 2*n_rows + 4, 2)
+
+    grid = np.einsum('ia,jb,abk->ijk', line_weights(n_columns), line_weights(n_rows), squares)
+
+    if np.any(np.diff(grid[..., 0], axis=0) <= 0) or np.any(np.diff(grid[..., 1], axis=1) <= 0):
+        raise ValueError("Obstacles are too big for their spacing")
+
+    return grid
+
+def build_blocks(points, arcs, counts, radial_chops, patches):
+    # points: (n, 8, 3), arcs: (n, 2, 3) midpoints of edges 0-1 and 4-5 (nan: none),
+    # counts: (n, 3) cell counts (-1: radial_chops), patches: [[(side, name), ...], ...]
+    blocks = []
+
+    for i, block_points in enumerate(points):
+        edges = []
+        if not np.isnan(arcs[i, 0, 0]):
+            edges = [Edge(0, 1, arcs[i, 0].tolist()), Edge(4, 5, arcs[i, 1].tolist())]
+
+        block = Block.create_from_points(block_points.tolist(), edges)
+
+        for axis in range(3):
+            if counts[i, axis] < 0:
+                for chop in radial_chops:
+                    block.chop(axis, **chop)
+            else:
+                block.chop(axis, count=int(counts[i, axis]))
+
+        for side, name in patches[i]:
+            block.set_patch(side, name)
+
+        blocks.append(block)
+
+    return blocks
+
+def build_chunk(arguments):
+    return build_blocks(*arguments)
+
+def tube_bundle(centers, radii, ring_thickness, z, cell_size, radial_chops=None,
+        spacing=(None, None), patches=None,
+        obstacle_patch='obstacles', n_processes=1):
+    # centers: (n_columns, n_rows, 2) or (n_columns, n_rows, 3) - z is ignored
+    # radii, ring_thickness: a number or (n_columns, n_rows)
+    # spacing: (x, y) distance to ghost obstacles outside the domain,
+    #   None: the same as between the first two (required for a single row/column)
+    # patches: {domain side: patch name} for 'left', 'right', 'front' and 'back';
+    #   None: inlet on the left, outlet on the right
+    # radial_chops: a list of chop() arguments for ring blocks;
+    #   None: uniform cells, close to cell_size
+    # returns a list of Blocks
+    centers = np.asarray(centers, dtype=float)[..., :2]
+    n_columns, n_rows = centers.shape[:2]
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (n_columns, n_rows))
+    ring_thickness = np.broadcast_to(np.asarray(ring_thickness, dtype=float), (n_columns, n_rows))
+
+    # square corners are on a circle of radius + ring_thickness
+    half_sizes = (radii + ring_thickness)/2**0.5
+    grid = corner_grid(centers, half_sizes, spacing)
+
+    if patches is None:
+        patches = {'left': 'inlet', 'right': 'outlet'}
+
+    if radial_chops is None:
+        radial_chops = [{'count': max(1, int(np.ceil(np.max(ring_thickness)/cell_size)))}]
+
+    # cell counts along grid lines; the same for the whole row/column of quads
+    counts_x = np.ceil(np.max(np.linalg.norm(np.diff(grid, axis=0), axis=2), axis=1)/cell_size)
+    counts_y = np.ceil(np.max(np.linalg.norm(np.diff(grid, axis=1), axis=2), axis=0)/cell_size)
+    counts_x = np.maximum(counts_x, 1).astype(int)
+    counts_y = np.maximum(counts_y, 1).astype(int)
+
+    # all points: grid, then 4 points on each circle; bottom, then top
+    n_i, n_j = grid.shape[:2]
+    grid_index = np.arange(n_i*n_j).reshape(n_i, n_j)
+
+    directions = corner_signs/2**0.5
+    circles = centers[:, :, None] + radii[:, :, None, None]*directions
+    circle_index = n_i*n_j + np.arange(n_columns*n_rows*4).reshape(n_columns, n_rows, 4)
+
+    points_2d = np.concatenate((grid.reshape(-1, 2), circles.reshape(-1, 2)))
+    n_points = len(points_2d)
+    points = np.concatenate((
+        np.column_stack((points_2d, np.zeros(n_points))),
+        np.column_stack((points_2d, np.full(n_points, z)))))
+
+    # filler blocks: all quads except the middle of each tile
+    quad_i, quad_j = np.meshgrid(np.arange(n_i - 1), np.arange(n_j - 1), indexing='ij')
+    filler = ~((quad_i % 3 == 1) & (quad_j % 3 == 1))
+    quad_i, quad_j = quad_i[filler], quad_j[filler]
+
+    filler_bottom = np.stack((
+        grid_index[quad_i, quad_j], grid_index[quad_i + 1, quad_j],
+        grid_index[quad_i + 1, quad_j + 1], grid_index[quad_i, quad_j + 1]), axis=1)
+    filler_counts = np.column_stack((counts_x[quad_i], counts_y[quad_j], np.ones(len(quad_i), dtype=int)))
+
+    # ring blocks: between corners k and k+1 of each square
+    tile_i, tile_j = np.meshgrid(np.arange(n_columns), np.arange(n_rows), indexing='ij')
+    tile_i, tile_j = tile_i.flatten(), tile_j.flatten()
+
+    square_index = np.stack((
+        grid_index[3*tile_i + 1, 3*tile_j + 1], grid_index[3*tile_i + 2, 3*tile_j + 1],
+        grid_index[3*tile_i + 2, 3*tile_j + 2], grid_index[3*tile_i + 1, 3*tile_j + 2]), axis=1)
+    inner_index = circle_index[tile_i, tile_j]
+
+    k = np.arange(4)
+    k_next = (k + 1) % 4
+    ring_bottom = np.stack((
+        inner_index[:, k_next], inner_index[:, k],
+        square_index[:, k], square_index[:, k_next]), axis=2).reshape(-1, 4)
+
+    # tangential counts: bottom and top side along x, the others along y
+    tangential = np.stack((
+        counts_x[3*tile_i + 1], counts_y[3*tile_j + 1],
+        counts_x[3*tile_i + 1], counts_y[3*tile_j + 1]), axis=1).reshape(-1)
+    ring_counts = np.column_stack((tangential, np.full(len(tangential), -1), np.ones(len(tangential), dtype=int)))
+
+    arc_midpoints = (centers[tile_i, tile_j][:, None] + radii[tile_i, tile_j][:, None, None]*arc_directions).reshape(-1, 2)
+    ring_arcs = np.stack((
+        np.column_stack((arc_midpoints, np.zeros(len(arc_midpoints)))),
+        np.column_stack((arc_midpoints, np.full(len(arc_midpoints), z)))), axis=1)
+
+    # everything together
+    bottom = np.concatenate((filler_bottom, ring_bottom))
+    indexes = np.concatenate((bottom, bottom + n_points), axis=1)
+    counts = np.concatenate((filler_counts, ring_counts))
+    arcs = np.concatenate((np.full((len(filler_bottom), 2, 3), np.nan), ring_arcs))
+
+    block_patches = [[] for _ in range(len(indexes))]
+    domain_sides = {
+        'left': quad_i == 0,
+        'right': quad_i == n_i - 2,
+        'front': quad_j == 0,
+        'back': quad_j == n_j - 2,
+    }
+
+    for side, name in patches.items():
+        for i_block in np.flatnonzero(domain_sides[side]):
+            block_patches[i_block].append((side, name))
+
+    for i_block in range(len(filler_bottom), len(indexes)):
+        block_patches[i_block].append(('front', obstacle_patch))
+
+    # blocks, in chunks if there's more than one process
+    block_points = points[indexes]
+
+    if n_processes > 1:
+        bounds = np.linspace(0, len(indexes), n_processes + 1).astype(int)
+        chunks = [
+            (block_points[s:e], arcs[s:e], counts[s:e], radial_chops, block_patches[s:e])
+            for s, e in zip(bounds[:-1], bounds[1:])]
+
+        with multiprocessing.Pool(n_processes) as pool:
+            blocks = [block for chunk in pool.map(build_chunk, chunks) for block in chunk]
+    else:
+        blocks = build_blocks(block_points, arcs, counts, radial_chops, block_patches)
+
+    # share vertices: the first block that uses a point owns its Vertex
+    vertices = [None]*len(points)
+
+    for block, block_indexes in zip(blocks, indexes.tolist()):
+        for i, index in enumerate(block_indexes):
+            if vertices[index] is None:
+                vertices[index] = block.vertices[i]
+            else:
+                block.vertices[i] = vertices[index]
+
+    return blocks
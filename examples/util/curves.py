@@ -0,0 +1,93 @@
+import numpy as np
+
+# Points on block edges at given parameters t (0...1, proportional to length);
+# lines and arcs are evaluated for many edges at once.
+
+def line(points_1, points_2, t):
+    # (n, 3), (n, 3), (m,) > (n, m, 3)
+    points_1 = np.asarray(points_1, dtype=float).reshape(-1, 3)
+    points_2 = np.asarray(points_2, dtype=float).reshape(-1, 3)
+    t = np.asarray(t, dtype=float)
+
+    return points_1[:, None] + (points_2 - points_1)[:, None]*t[None, :, None]
+
+def arc_centers(points_1, points_mid, points_2):
+    # centers of circles through 3 points; (n, 3) each
+    a = points_1 - points_mid
+    b = points_2 - points_mid
+    axb = np.cross(a, b)
+    axb_2 = np.sum(axb**2, axis=1)
+
+    numerator = np.cross(
+        np.sum(a**2, axis=1)[:, None]*b - np.sum(b**2, axis=1)[:, None]*a,
+        axb)
+
+    return points_mid + numerator/(2*axb_2[:, None])
+
+def arc(points_1, points_mid, points_2, t):
+    # arcs from points_1 through points_mid to points_2;
+    # (n, 3) each, t: (m,) > (n, m, 3)
+    points_1 = np.asarray(points_1, dtype=float).reshape(-1, 3)
+    points_mid = np.asarray(points_mid, dtype=float).reshape(-1, 3)
+    points_2 = np.asarray(points_2, dtype=float).reshape(-1, 3)
+    t = np.asarray(t, dtype=float)
+
+    normals = np.cross(points_mid - points_1, points_2 - points_mid)
+    norms = np.linalg.norm(normals, axis=1)
+    collinear = norms < 1e-12*np.linalg.norm(points_2 - points_1, axis=1)**2
+
+    result = line(points_1, points_2, t)
+    if np.all(collinear):
+        return result
+
+    curved = ~collinear
+    p_1 = points_1[curved]
+    p_2 = points_2[curved]
+    center = arc_centers(p_1, points_mid[curved], p_2)
+
+    # local coordinate system in arc's plane
+    r_1 = p_1 - center
+    radius = np.linalg.norm(r_1, axis=1)
+    e_1 = r_1/radius[:, None]
+    e_2 = np.cross(normals[curved]/norms[curved][:, None], e_1)
+
+    r_2 = p_2 - center
+    angle = np.arctan2(np.sum(r_2*e_2, axis=1), np.sum(r_2*e_1, axis=1))
+    angle = np.where(angle < 0, angle + 2*np.pi, angle)
+
+    phi = angle[:, None]*t[None, :]
+    result[curved] = center[:, None] + radius[:, None, None]*(
+        np.cos(phi)[:, :, None]*e_1[:, None] + np.sin(phi)[:, :, None]*e_2[:, None])
+
+    return result
+
+def spline(point_1, points, point_2, t):
+    # a Catmull-Rom spline through point_1, points and point_2;
+    # parameter is proportional to length of the polyline through all points
+    # (the same as in blockMesh); returns (m, 3)
+    p = np.concatenate((
+        np.asarray(point_1, dtype=float).reshape(1, 3),
+        np.asarray(points, dtype=float).reshape(-1, 3),
+        np.asarray(point_2, dtype=float).reshape(1, 3)))
+    t = np.asarray(t, dtype=float)
+
+    # reflected end points define end tangents
+    p = np.concatenate(([2*p[0] - p[1]], p, [2*p[-1] - p[-2]]))
+
+    lengths = np.linalg.norm(np.diff(p[1:-1], axis=0), axis=1)
+    params = np.concatenate(([0], np.cumsum(lengths)))/np.sum(lengths)
+
+    segment = np.clip(np.searchsorted(params, t, side='right') - 1, 0, len(lengths) - 1)
+    mu = (t - params[segment])/(params[segment + 1] - params[segment])
+    mu = mu[:, None]
+
+    p_0 = p[segment]
+    p_1 = p[segment + 1]
+    p_2 = p[segment + 2]
+    p_3 = p[segment + 3]
+
+    return 0.5*(
+        2*p_1 +
+        (-p_0 + p_2)*mu +
+        (2*p_0 - 5*p_1 + 4*p_2 - p_3)*mu**2 +
+        (-p_0 + 3*p_1 - 3*p_2 + p_3)*mu**3)
@@ -0,0 +1,164 @@
+import numpy as np
+
+from examples.util import grading, topology
+from examples.util.blocks import get_blocks, block_points, axis_pairs
+
+# A dry run: cell counts and a validation of blocking without writing
+# the mesh or evaluating any edges. Block sizes are straight distances
+# between vertices so counts of blocks with strongly curved edges are
+# somewhat underestimated; otherwise counts follow classy_blocks, up to
+# rounding: they are calculated from chops (see grading.chop_count())
+# and propagated to blocks that share edges (see topology.py).
+# Derived topology is cached so that a dry run of a sweep variant is only
+# a bit of arithmetic on coordinates.
+
+# for each block corner, the other end of its edges along axes 0, 1 and 2;
+# edge vectors make a right-handed system in a valid block
+corner_neighbours = np.array([
+    [1, 3, 4], [2, 0, 5], [3, 1, 6], [0, 2, 7],
+    [7, 5, 0], [4, 6, 1], [5, 7, 2], [6, 4, 3],
+])
+
+def axis_lengths(points):
+    # (n_blocks, 8, 3) > (n_blocks, 3): mean length of straight edges along each axis
+    pairs = np.array(axis_pairs)
+    edges = points[:, pairs[..., 1]] - points[:, pairs[..., 0]]
+
+    return np.mean(np.linalg.norm(edges, axis=-1), axis=-1)
+
+def corner_volumes(points):
+    # (n_blocks, 8): triple products of edges at each corner
+    edges = points[:, corner_neighbours] - points[:, :, None]
+
+    return np.einsum('bcj,bcj->bc', np.cross(edges[:, :, 0], edges[:, :, 1]), edges[:, :, 2])
+
+class DryRun:
+    def __init__(self, item):
+        self.blocks = get_blocks(item)
+        self.topology = topology.get(self.blocks)
+        self.issues = []
+
+        points = block_points(self.blocks)
+        self.lengths = axis_lengths(points)
+
+        self.check_blocks(points)
+        self.counts = self.calculate_counts()
+
+        self.metrics = None
+        self.points = points
+
+    def check_blocks(self, points):
+        volumes = corner_volumes(points)
+        scale = np.max(self.lengths, axis=1)
+        eps = 1e-12*scale[:, None]**3
+
+        # a corner with a collapsed edge (wedges, see axisymmetric.py) has no volume
+        # but the block is fine as long as its other corners are
+        edges = np.linalg.norm(points[:, corner_neighbours] - points[:, :, None], axis=-1)
+        collapsed = np.any(edges < 1e-6*scale[:, None, None], axis=-1)
+
+        inverted = np.any(volumes < -eps, axis=1)
+        degenerate = np.any((volumes <= eps) & ~collapsed, axis=1) | np.all(volumes <= eps, axis=1)
+
+        for i_block in np.flatnonzero(inverted):
+            self.issues.append(f"Block {i_block} is inverted")
+
+        for i_block in np.flatnonzero(degenerate & ~inverted):
+            self.issues.append(f"Block {i_block} is degenerate")
+
+    def calculate_counts(self):
+        # (n_blocks, 3), -1 where count is not known
+        counts = np.full((len(self.blocks), 3), -1)
+
+        for i_block, block in enumerate(self.blocks):
+            for axis in range(3):
+                if not block.chops[axis]:
+                    continue
+
+                try:
+                    counts[i_block, axis] = sum(
+                        grading.chop_count(self.lengths[i_block, axis], **chop) for chop in block.chops[axis])
+                except ValueError as e:
+                    self.issues.append(f"Block {i_block}, axis {axis}: {e}")
+
+        counts, conflicts = self.topology.group_counts(counts)
+
+        for group in conflicts:
+            i_blocks = np.unique(np.argwhere(self.topology.axis_groups == group)[:, 0])
+            self.issues.append(f"Different cell counts on blocks that share edges: {i_blocks.tolist()}")
+
+        for i_block, axis in np.argwhere(counts < 0):
+            self.issues.append(f"Block {i_block} has no cell count on axis {axis}")
+
+        return counts
+
+    def quality(self):
+        # block-level quality estimates (cells of a block are assumed to be similar to it):
+        # - angle_deviation: the biggest deviation of block corner angles from 90 degrees,
+        #   a proxy for non-orthogonality and skewness,
+        # - aspect_ratio: the biggest ratio of cell sizes along different axes,
+        # - size_ratio: the biggest ratio of cell sizes normal to a face that two blocks share;
+        # cell sizes are block sizes over counts: grading is ignored (graded cells
+        # are taken as uniform) and so are curved and projected edges since
+        # everything is calculated from straight lines between block vertices
+        if self.metrics is not None:
+            return self.metrics
+
+        edges = self.points[:, corner_neighbours] - self.points[:, :, None]
+        edges /= np.maximum(np.linalg.norm(edges, axis=-1), 1e-300)[..., None]
+
+        cosines = np.stack((
+            np.sum(edges[:, :, 0]*edges[:, :, 1], axis=-1),
+            np.sum(edges[:, :, 1]*edges[:, :, 2], axis=-1),
+            np.sum(edges[:, :, 2]*edges[:, :, 0], axis=-1)), axis=-1)
+        angles = np.degrees(np.arccos(np.clip(cosines, -1, 1)))
+
+        counts = np.maximum(self.counts, 1)
+        sizes = self.lengths/counts
+
+        # faces at the start and the end of each block axis: (n_blocks, 3, 2, 4) points
+        pairs = np.array(axis_pairs)
+        faces = np.sort(np.swapaxes(self.topology.point_map[:, pairs], -1, -2), axis=-1)
+        _, face_index = np.unique(faces.reshape(-1, 4), axis=0, return_inverse=True)
+        face_index = face_index.reshape(-1)
+
+        face_sizes = np.repeat(sizes.reshape(-1), 2)
+        smallest = np.full(face_index.max() + 1, np.inf)
+        biggest = np.zeros(face_index.max() + 1)
+        np.minimum.at(smallest, face_index, face_sizes)
+        np.maximum.at(biggest, face_index, face_sizes)
+
+        self.metrics = {
+            'n_cells': self.n_cells,
+            'valid': self.valid,
+            'angle_deviation': float(np.max(np.abs(angles - 90))),
+            'aspect_ratio': float(np.max(np.max(sizes, axis=1)/np.maximum(np.min(sizes, axis=1), 1e-300))),
+            'size_ratio': float(np.max(biggest/np.maximum(smallest, 1e-300))),
+        }
+
+        return self.metrics
+
+    @property
+    def valid(self):
+        return not self.issues
+
+    @property
+    def n_cells(self):
+        # counts that aren't known don't count
+        return int(np.sum(np.prod(np.maximum(self.counts, 0), axis=1)))
+
+    def report(self, max_issues=20):
+        print(f"Blocks: {len(self.blocks)}, vertices: {self.topology.n_points}, "
+            f"estimated cells: {self.n_cells}")
+
+        for issue in self.issues[:max_issues]:
+            print(f"  {issue}")
+
+        if len(self.issues) > max_issues:
+            print(f"  ... and {len(self.issues) - max_issues} more")
+
+def estimate(item):
+    # estimated number of cells or None if blocking is not valid
+    dry_run = DryRun(item)
+
+    return dry_run.n_cells if dry_run.valid else None
@@ -0,0 +1,97 @@
+import functools
+
+import numpy as np
+
+# Counterparts of classy_blocks.util.functions that also work on
+# many vectors (n, 3) and many angles (n,) at once; with a single
+# vector they can be used as drop-in replacements.
+
+axis_vectors = {
+    'x': (1.0, 0.0, 0.0),
+    'y': (0.0, 1.0, 0.0),
+    'z': (0.0, 0.0, 1.0),
+}
+
+def deg2rad(angles):
+    return np.asarray(angles, dtype=float)*(np.pi/180)
+
+def rad2deg(angles):
+    return np.asarray(angles, dtype=float)*(180/np.pi)
+
+def vector(x, y, z):
+    # a (3,) vector from scalars or an (n, 3) array from coordinate arrays;
+    # scalars are broadcast to the length of arrays
+    coordinates = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in (x, y, z)])
+
+    return np.stack(coordinates, axis=-1)
+
+def norm(vectors):
+    return np.linalg.norm(vectors, axis=-1)
+
+def unit_vector(vectors):
+    vectors = np.asarray(vectors, dtype=float)
+
+    return vectors/np.linalg.norm(vectors, axis=-1)[..., None]
+
+def get_axis(axis):
+    # 'x', 'y', 'z' or a vector
+    if isinstance(axis, str):
+        return np.array(axis_vectors[axis])
+
+    return np.asarray(axis, dtype=float)
+
+def rotation_matrices(axes, angles):
+    # (n, 3, 3) rotation matrices around axes (n, 3) by angles (n,)
+    # that all go through origin (Rodrigues' formula)
+    axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+    axes = axes/np.linalg.norm(axes, axis=1)[:, None]
+    angles = np.asarray(angles, dtype=float).reshape(-1, 1, 1)
+
+    k = np.zeros((len(axes), 3, 3))
+    k[:, 0, 1] = -axes[:, 2]
+    k[:, 0, 2] = axes[:, 1]
+    k[:, 1, 0] = axes[:, 2]
+    k[:, 1, 2] = -axes[:, 0]
+    k[:, 2, 0] = -axes[:, 1]
+    k[:, 2, 1] = axes[:, 0]
+
+    return np.eye(3) + np.sin(angles)*k + (1 - np.cos(angles))*np.matmul(k, k)
+
+@functools.lru_cache(maxsize=1024)
+def _rotation_matrix(axis, angle):
+    matrix = rotation_matrices(axis, angle)[0]
+    # the same object is returned to everyone who asks
+    matrix.flags.writeable = False
+
+    return matrix
+
+def rotation_matrix(axis, angle):
+    # a single rotation matrix; the same axes and angles keep recurring
+    # in chains of shapes so matrices are cached (and read-only)
+    return _rotation_matrix(tuple(get_axis(axis).tolist()), float(angle))
+
+def rotate(points, angles, axis='x', origin=None):
+    # rotates a point (3,) or points (n, 3) around an axis ('x', 'y', 'z' or a vector)
+    # that goes through origin; angles: a single angle or one for each point
+    points = np.asarray(points, dtype=float)
+    angles = np.asarray(angles, dtype=float)
+
+    if origin is not None:
+        origin = np.asarray(origin, dtype=float)
+        points = points - origin
+
+    if angles.ndim == 0:
+        result = np.dot(points, rotation_matrix(axis, angles).T)
+    else:
+        # Rodrigues' formula applied to points directly, without building matrices
+        k = unit_vector(get_axis(axis))
+        points = points.reshape(-1, 3)
+        cos = np.cos(angles)[:, None]
+        sin = np.sin(angles)[:, None]
+
+        result = points*cos + np.cross(k, points)*sin + np.outer(np.dot(points, k), k)*(1 - cos)
+
+    if origin is not None:
+        result += origin
+
+    return result
@@ -0,0 +1,462 @@
+import os
+import hashlib
+
+import numpy as np
+
+from examples.util import curves
+from examples.util.blocks import get_blocks, tolerance
+
+# Searchable surfaces for blockMeshDict's geometry section.
+# Instead of lists of raw strings, surfaces are objects that check their
+# parameters and can also be queried from python: distances from points
+# and closest points on surface. Triangulated surfaces (STL) are parsed
+# once, when first queried; their triangles and a search grid are cached on disk
+# under the hash of the file so that repeated runs and parameter sweeps
+# don't have to do the same work again.
+
+geometry_directory = os.path.join('case', 'constant', 'geometry')
+cache_directory = os.path.join(geometry_directory, 'cache')
+
+# number of search grid cells along the longest side of bounding box
+grid_resolution = 16
+
+# points outside the grid are compared with all triangles
+# in chunks of about this many point-triangle pairs
+chunk_elements = 2**21
+
+def point_string(point):
+    return '(' + ' '.join(f'{c:.12g}' for c in point) + ')'
+
+def check_point(name, point):
+    point = np.asarray(point, dtype=float)
+
+    if point.shape != (3,) or not np.all(np.isfinite(point)):
+        raise ValueError(f"{name} must be a finite 3D point, got {point}")
+
+    return point
+
+def check_positive(name, value):
+    value = float(value)
+
+    if not value > 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+
+    return value
+
+class Surface:
+    # a searchable surface; subclasses define parameters and closest points
+    type = None
+
+    # closest points are calculated exactly, not searched for
+    analytic = False
+
+    def __init__(self, name):
+        self.name = name
+
+    def parameters(self):
+        # [(keyword, value string), ...]
+        return []
+
+    def to_dict(self):
+        # properties as used in Mesh.write(geometry=...)
+        return [f'type   {self.type}'] + [f'{key} {value}' for key, value in self.parameters()]
+
+    def closest(self, points):
+        # closest points on surface, (n, 3)
+        raise NotImplementedError
+
+    def distance(self, points):
+        # (unsigned) distances of points from surface, (n,)
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+
+        return np.linalg.norm(self.closest(points) - points, axis=1)
+
+    def edge_points(self, points_1, points_2, n_points):
+        # definitions of edges that replace projections of straight lines
+        # points_1-points_2 (n, 3) onto surface: a point for an arc,
+        # n_points for a spline or None for a straight line
+        t = np.linspace(0, 1, n_points + 2)[1:-1]
+        samples = curves.line(points_1, points_2, t)
+
+        return list(self.closest(samples.reshape(-1, 3)).reshape(samples.shape))
+
+class Sphere(Surface):
+    type = 'sphere'
+    analytic = True
+
+    def __init__(self, name, center, radius):
+        super().__init__(name)
+
+        self.center = check_point('center', center)
+        self.radius = check_positive('radius', radius)
+
+    def parameters(self):
+        return [('origin', point_string(self.center)), ('radius', f'{self.radius:.12g}')]
+
+    def closest(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        radius_vectors = points - self.center
+        lengths = np.linalg.norm(radius_vectors, axis=1)
+
+        # every point on the sphere is the closest to its center; take any
+        at_center = lengths < tolerance*self.radius
+        radius_vectors[at_center] = [1, 0, 0]
+        lengths[at_center] = 1
+
+        return self.center + radius_vectors/lengths[:, None]*self.radius
+
+    def edge_points(self, points_1, points_2, n_points):
+        # lines project to great circles
+        middles = (np.asarray(points_1, dtype=float) + np.asarray(points_2, dtype=float))/2
+
+        return list(self.closest(middles))
+
+class Plane(Surface):
+    type = 'plane'
+    analytic = True
+
+    def __init__(self, name, point, normal):
+        super().__init__(name)
+
+        self.point = check_point('point', point)
+        normal = check_point('normal', normal)
+
+        if np.linalg.norm(normal) == 0:
+            raise ValueError("Plane's normal must not be zero")
+
+        self.normal = normal/np.linalg.norm(normal)
+
+    def parameters(self):
+        return [
+            ('planeType', 'pointAndNormal'),
+            ('point', point_string(self.point)),
+            ('normal', point_string(self.normal)),
+        ]
+
+    def closest(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        distances = np.dot(points - self.point, self.normal)
+
+        return points - np.outer(distances, self.normal)
+
+    def edge_points(self, points_1, points_2, n_points):
+        # lines between points on plane stay straight
+        return [None]*len(np.asarray(points_1).reshape(-1, 3))
+
+class Cylinder(Surface):
+    # an infinite cylinder for projection; point_1 and point_2 define its axis
+    type = 'cylinder'
+    analytic = True
+
+    def __init__(self, name, point_1, point_2, radius):
+        super().__init__(name)
+
+        self.point_1 = check_point('point_1', point_1)
+        self.point_2 = check_point('point_2', point_2)
+        self.radius = check_positive('radius', radius)
+
+        if np.linalg.norm(self.point_2 - self.point_1) == 0:
+            raise ValueError("Cylinder's axis points must not coincide")
+
+    @property
+    def axis(self):
+        axis = self.point_2 - self.point_1
+
+        return axis/np.linalg.norm(axis)
+
+    def parameters(self):
+        return [
+            ('point1', point_string(self.point_1)),
+            ('point2', point_string(self.point_2)),
+            ('radius', f'{self.radius:.12g}'),
+        ]
+
+    def closest(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        relative = points - self.point_1
+
+        on_axis = self.point_1 + np.outer(np.dot(relative, self.axis), self.axis)
+        radius_vectors = points - on_axis
+        lengths = np.linalg.norm(radius_vectors, axis=1)
+
+        # points on the axis are equally far from all around; take any direction
+        at_axis = lengths < tolerance*self.radius
+        radius_vectors[at_axis] = np.cross(self.axis, np.eye(3)[np.argmin(np.abs(self.axis))])
+        lengths[at_axis] = np.linalg.norm(radius_vectors[at_axis], axis=1)
+
+        return on_axis + radius_vectors/lengths[:, None]*self.radius
+
+    def edge_points(self, points_1, points_2, n_points):
+        # lines perpendicular to axis project to arcs, the rest to splines
+        points_1 = np.asarray(points_1, dtype=float).reshape(-1, 3)
+        points_2 = np.asarray(points_2, dtype=float).reshape(-1, 3)
+
+        result = super().edge_points(points_1, points_2, n_points)
+
+        lengths = np.linalg.norm(points_2 - points_1, axis=1)
+        axial = np.abs(np.dot(points_2 - points_1, self.axis))
+        middles = self.closest((points_1 + points_2)/2)
+
+        for i in np.nonzero(axial <= tolerance*lengths)[0]:
+            result[i] = middles[i]
+
+        return result
+
+def read_stl(path):
+    # triangles from an ascii or binary STL file, (n, 3, 3)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    # binary files can also start with 'solid' but their size is known
+    if len(data) >= 84:
+        n_binary = int(np.frombuffer(data[80:84], dtype='<u4')[0])
+        if len(data) == 84 + 50*n_binary:
+            record = np.dtype([('normal', '<f4', 3), ('points', '<f4', (3, 3)), ('attribute', '<u2')])
+            return np.frombuffer(data[84:], dtype=record)['points'].astype(float)
+
+    words = data.decode('ascii', 'replace').split()
+    points = [words[i + 1:i + 4] for i, word in enumerate(words) if word == 'vertex']
+
+    return np.array(points, dtype=float).reshape(-1, 3, 3)
+
+def closest_on_triangles(points, a, b, c):
+    # closest points on triangles (a, b, c) to points; all arrays are (n, 3)
+    # (Ericson, Real-Time Collision Detection, 5.1.5)
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+
+    def dot(u, v):
+        return np.einsum('ij,ij->i', u, v)
+
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+
+    va = d3*d6 - d5*d4
+    vb = d5*d2 - d1*d6
+    vc = d1*d4 - d3*d2
+
+    # inside the triangle, by default
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = 1/(va + vb + vc)
+        v = vb*denominator
+        w = vc*denominator
+        result = a + ab*v[:, None] + ac*w[:, None]
+
+        # regions are checked in reverse order of priority
+        # so that the most important ones overwrite the rest
+        bc_region = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3)/((d4 - d3) + (d5 - d6))
+        result[bc_region] = (b + (c - b)*t[:, None])[bc_region]
+
+        ac_region = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2/(d2 - d6)
+        result[ac_region] = (a + ac*t[:, None])[ac_region]
+
+        ab_region = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1/(d1 - d3)
+        result[ab_region] = (a + ab*t[:, None])[ab_region]
+
+    result[(d6 >= 0) & (d5 <= d6)] = c[(d6 >= 0) & (d5 <= d6)]
+    result[(d3 >= 0) & (d4 <= d3)] = b[(d3 >= 0) & (d4 <= d3)]
+    result[(d1 <= 0) & (d2 <= 0)] = a[(d1 <= 0) & (d2 <= 0)]
+
+    return result
+
+def box_distances(low_1, high_1, low_2, high_2):
+    # distances between axis-aligned boxes (n, 3) and (m, 3); (n, m)
+    gap = np.maximum(low_2[None, :, :] - high_1[:, None, :], low_1[:, None, :] - high_2[None, :, :])
+
+    return np.linalg.norm(np.maximum(gap, 0), axis=2)
+
+def build_index(triangles, resolution):
+    # a uniform grid over bounding box; each cell keeps a list of
+    # triangles that can contain the closest point for any point in that cell
+    low = np.min(triangles, axis=(0, 1))
+    high = np.max(triangles, axis=(0, 1))
+
+    size = np.max(high - low)/resolution
+    shape = np.maximum(np.ceil((high - low)/size), 1).astype(int)
+
+    # pad the box so that cells are cubes
+    padding = (shape*size - (high - low))/2
+    low = low - padding
+
+    i, j, k = np.meshgrid(*[np.arange(n) for n in shape], indexing='ij')
+    cell_low = low + np.stack((i, j, k), axis=-1).reshape(-1, 3)*size
+    cell_high = cell_low + size
+
+    triangle_low = np.min(triangles, axis=1)
+    triangle_high = np.max(triangles, axis=1)
+
+    # no point in a cell is farther from a triangle than
+    # the cell's farthest corner is from the nearest of triangle's vertices
+    corners = cell_low[:, None, :] + size*np.array(np.meshgrid([0, 1], [0, 1], [0, 1])).reshape(3, -1).T
+
+    offsets = [0]
+    indexes = []
+
+    chunk_size = max(1, 2**21//(24*len(triangles)))
+    for chunk in np.array_split(np.arange(len(cell_low)), int(np.ceil(len(cell_low)/chunk_size))):
+        # (cells, corners, triangles, vertices)
+        distances = np.linalg.norm(corners[chunk][:, :, None, None, :] - triangles[None, None, :, :, :], axis=-1)
+        upper_bounds = np.min(np.max(distances, axis=1), axis=(1, 2))
+
+        lower_bounds = box_distances(cell_low[chunk], cell_high[chunk], triangle_low, triangle_high)
+
+        for bound, row in zip(upper_bounds, lower_bounds):
+            candidates = np.nonzero(row <= bound)[0]
+            indexes.append(candidates)
+            offsets.append(offsets[-1] + len(candidates))
+
+    return low, size, shape, np.array(offsets), np.concatenate(indexes)
+
+class TriSurface(Surface):
+    # a triangulated surface from an STL file in case/constant/geometry
+    type = 'triSurfaceMesh'
+
+    # cached data of already loaded files: {hash: {...}}
+    loaded = {}
+
+    def __init__(self, name, file_name, directory=geometry_directory):
+        super().__init__(name)
+
+        self.file_name = file_name
+        self.path = os.path.join(directory, file_name)
+
+        # the file is only read when the surface is queried
+        self.hash = None
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if not os.path.isfile(self.path):
+                raise ValueError(f"Surface file not found: {self.path}")
+
+            with open(self.path, 'rb') as f:
+                self.hash = hashlib.sha1(f.read()).hexdigest()
+
+            if self.hash not in self.loaded:
+                self.loaded[self.hash] = self.load()
+
+            self._data = self.loaded[self.hash]
+
+        return self._data
+
+    @property
+    def triangles(self):
+        return self.data['triangles']
+
+    @property
+    def bounds(self):
+        return self.data['bounds']
+
+    def load(self):
+        cache_path = os.path.join(cache_directory, self.hash + '.npz')
+
+        if os.path.isfile(cache_path):
+            with np.load(cache_path) as data:
+                return dict(data)
+
+        triangles = read_stl(self.path)
+        if len(triangles) == 0:
+            raise ValueError(f"No triangles in {self.path}")
+
+        grid_low, grid_size, grid_shape, offsets, indexes = build_index(triangles, grid_resolution)
+
+        data = {
+            'triangles': triangles,
+            'bounds': np.array([np.min(triangles, axis=(0, 1)), np.max(triangles, axis=(0, 1))]),
+            'grid_low': grid_low,
+            'grid_size': grid_size,
+            'grid_shape': grid_shape,
+            'offsets': offsets,
+            'indexes': indexes,
+        }
+
+        os.makedirs(cache_directory, exist_ok=True)
+        np.savez(cache_path, **data)
+
+        return data
+
+    @property
+    def n_facets(self):
+        return len(self.triangles)
+
+    def parameters(self):
+        return [('name', self.name), ('file', f'"{self.file_name}"')]
+
+    def nearest(self, points, pairs_point, pairs_triangle, result):
+        # for each point in pairs_point, the closest point on its paired
+        # triangles (pairs_triangle) is written to result
+        if len(pairs_point) == 0:
+            return
+
+        triangles = self.triangles[pairs_triangle]
+        candidates = closest_on_triangles(points[pairs_point], triangles[:, 0], triangles[:, 1], triangles[:, 2])
+        distances = np.linalg.norm(candidates - points[pairs_point], axis=1)
+
+        # the nearest candidate of each point
+        order = np.lexsort((distances, pairs_point))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pairs_point[order][1:] != pairs_point[order][:-1]
+
+        result[pairs_point[order][first]] = candidates[order][first]
+
+    def closest(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        result = np.empty_like(points)
+
+        data = self.data
+        grid_shape = data['grid_shape']
+        offsets = data['offsets']
+
+        cells = np.floor((points - data['grid_low'])/float(data['grid_size'])).astype(int)
+        inside = np.all((cells >= 0) & (cells < grid_shape), axis=1)
+        cell_indexes = np.ravel_multi_index(cells[inside].T, grid_shape)
+
+        # points inside the grid: check candidate triangles only
+        starts = offsets[cell_indexes]
+        counts = offsets[cell_indexes + 1] - starts
+        # indexes of all candidates of all points, one range for each point
+        ranges = np.arange(np.sum(counts)) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+
+        self.nearest(points, np.repeat(np.nonzero(inside)[0], counts), data['indexes'][ranges], result)
+
+        # points outside: check all triangles, in chunks to limit memory
+        outside = np.nonzero(~inside)[0]
+        chunk_size = max(1, chunk_elements//self.n_facets)
+
+        for i in range(0, len(outside), chunk_size):
+            chunk = outside[i:i + chunk_size]
+            self.nearest(points, np.repeat(chunk, self.n_facets), np.tile(np.arange(self.n_facets), len(chunk)), result)
+
+        return result
+
+def geometry_dict(*surfaces):
+    # the 'geometry' argument for Mesh.write()
+    names = [s.name for s in surfaces]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate surface names: {names}")
+
+    return {s.name: s.to_dict() for s in surfaces}
+
+def projection_distances(item, surfaces):
+    # the biggest distance of vertices of projected faces from their surfaces,
+    # calculated in python before running blockMesh; {surface name: distance}
+    surfaces = {s.name: s for s in surfaces}
+    points = {}
+
+    for block in get_blocks(item):
+        for side, name in block.faces:
+            if name not in surfaces:
+                continue
+
+            points.setdefault(name, [])
+            points[name] += [block.vertices[i].point for i in block.face_map[side]]
+
+    return {name: float(np.max(surfaces[name].distance(p))) for name, p in points.items()}
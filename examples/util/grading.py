@@ -0,0 +1,187 @@
+import numpy as np
+
+# Boundary layer grading: given first cell size, total length and maximum
+# cell-to-cell expansion, cell count is calculated in closed form and expansion ratio
+# is then adjusted (Newton's method, vectorized) so that cells fill the length exactly.
+# Results are lists of keyword arguments for chop() functions.
+
+def first_cell_size(y_plus, velocity, length, nu, rho=1):
+    # first cell height for a given y+, estimated from
+    # turbulent flat plate skin friction (Schlichting)
+    re = velocity*length/nu
+    cf = (2*np.log10(re) - 0.65)**(-2.3)
+    tau_wall = 0.5*cf*rho*velocity**2
+    u_tau = (tau_wall/rho)**0.5
+
+    return y_plus*nu/u_tau
+
+def series_length(start_size, c2c_expansion, count):
+    # length of count cells, growing by c2c_expansion
+    start_size = np.asarray(start_size, dtype=float)
+    c2c_expansion = np.asarray(c2c_expansion, dtype=float)
+
+    uniform = np.isclose(c2c_expansion, 1)
+    r = np.where(uniform, 2, c2c_expansion)
+
+    return np.where(uniform, start_size*count, start_size*(r**count - 1)/(r - 1))
+
+def series_count(length, start_size, c2c_expansion):
+    # a (non-integer) number of cells to fill length
+    length = np.asarray(length, dtype=float)
+    start_size = np.asarray(start_size, dtype=float)
+    c2c_expansion = np.asarray(c2c_expansion, dtype=float)
+
+    uniform = np.isclose(c2c_expansion, 1)
+    r = np.where(uniform, 2, c2c_expansion)
+
+    return np.where(uniform, length/start_size, np.log(1 + length*(r - 1)/start_size)/np.log(r))
+
+def solve_expansion(length, start_size, count, tol=1e-12, max_iter=50):
+    # c2c_expansion so that count cells, starting with start_size, fill length exactly;
+    # all arguments can be arrays; solves ln(S(x)) = ln(length/start_size)
+    # for x = ln(c2c_expansion) where S(x) = sum(exp(k*x)), k = 0...count-1
+    q = np.asarray(length, dtype=float)/np.asarray(start_size, dtype=float)
+    n = np.asarray(count, dtype=float)
+    q, n = np.broadcast_arrays(q, n)
+
+    # a single cell (or exactly uniform cells) can't be graded
+    expansion = np.ones(q.shape)
+    graded = (n > 1) & ~np.isclose(q, n)
+    if not np.any(graded):
+        return expansion if expansion.ndim > 0 else float(expansion)
+
+    q = q[graded]
+    n = n[graded]
+
+    # initial guess from linearization around x = 0
+    x = 2*(q/n - 1)/np.maximum(n - 1, 1)
+    x = np.clip(x, -1, 1)
+
+    for _ in range(max_iter):
+        # avoid the removable singularity at x = 0
+        x = np.where(np.abs(x) < 1e-9, 1e-9, x)
+
+        e = np.exp(x)
+        en = np.exp(n*x)
+        s = (en - 1)/(e - 1)
+        ds = (n*en*(e - 1) - (en - 1)*e)/(e - 1)**2
+
+        step = (np.log(s) - np.log(q))/(ds/s)
+        x = x - step
+
+        if np.all(np.abs(step) < tol):
+            break
+
+    expansion[graded] = np.exp(x)
+
+    return expansion if expansion.ndim > 0 else float(expansion)
+
+def chop_count(length, count=None, start_size=None, end_size=None,
+        c2c_expansion=None, total_expansion=None, length_ratio=1, invert=False):
+    # number of cells that a chop() with these arguments makes on a given length;
+    # an estimate for counts that classy_blocks calculates when writing the mesh:
+    # the fractional count is rounded up (enough cells not to exceed given sizes)
+    # so counts can differ from classy_blocks' by a cell
+    if count is not None:
+        return int(count)
+
+    length = length*length_ratio
+
+    if start_size is not None and end_size is not None:
+        total_expansion = end_size/start_size
+    elif end_size is not None and total_expansion is not None:
+        start_size = end_size/total_expansion
+    elif start_size is not None and total_expansion is not None:
+        end_size = start_size*total_expansion
+
+    if start_size is not None and end_size is not None:
+        if np.isclose(start_size, end_size):
+            n = length/start_size
+        else:
+            # sizes grow geometrically from start_size to end_size:
+            # length = (r*end_size - start_size)/(r - 1)
+            r = (length - start_size)/(length - end_size)
+            n = 1 + np.log(end_size/start_size)/np.log(r) if r > 0 else 1
+    elif c2c_expansion is not None and total_expansion is not None:
+        n = 1 + np.log(total_expansion)/np.log(c2c_expansion)
+    elif start_size is not None or end_size is not None:
+        if start_size is not None:
+            size, expansion = start_size, 1 if c2c_expansion is None else c2c_expansion
+        else:
+            size, expansion = end_size, 1 if c2c_expansion is None else 1/c2c_expansion
+
+        # shrinking cells that can't fill the length give nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = series_count(length, size, expansion)
+    else:
+        raise ValueError("Can't calculate cell count from given arguments")
+
+    if not np.isfinite(n):
+        raise ValueError(f"Cells can't fill length {length} with given arguments")
+
+    return max(int(np.ceil(float(n) - 1e-9)), 1)
+
+def boundary_layer(length, start_size, c2c_expansion, max_size=None, invert=False):
+    # cells grow from start_size with c2c_expansion (at most)
+    # until they reach max_size; the rest of the length is uniform;
+    # a rest, shorter than max_size, is graded too instead of making a tiny cell;
+    # returns chop() keyword arguments for one or two divisions;
+    # invert=True puts the smallest cells at the end
+    if max_size is not None:
+        # number of cells it takes to grow to max_size
+        n_graded = max(int(np.ceil(np.log(max_size/start_size)/np.log(c2c_expansion))), 1)
+        l_graded = float(series_length(start_size, c2c_expansion, n_graded))
+    else:
+        l_graded = length
+
+    if max_size is None or length - l_graded < max_size:
+        # everything is graded
+        count = max(int(np.ceil(series_count(length, start_size, c2c_expansion) - 1e-9)), 1)
+        chops = [{
+            'count': count,
+            'c2c_expansion': float(solve_expansion(length, start_size, count)),
+        }]
+    else:
+        # graded cells + uniform
+        chops = [
+            {
+                'length_ratio': l_graded/length,
+                'count': n_graded,
+                'c2c_expansion': c2c_expansion,
+            },
+            {
+                'length_ratio': 1 - l_graded/length,
+                'count': int(np.ceil((length - l_graded)/max_size)),
+                'c2c_expansion': 1,
+            }
+        ]
+
+    if invert:
+        chops = chops[::-1]
+        for chop in chops:
+            chop['invert'] = True
+
+    return chops
+
+def double_boundary_layer(length, start_size, c2c_expansion, max_size=None):
+    # boundary layers on both ends, meeting in the middle
+    half = boundary_layer(length/2, start_size, c2c_expansion, max_size)
+    other_half = boundary_layer(length/2, start_size, c2c_expansion, max_size, invert=True)
+
+    chops = []
+    for chop in half + other_half:
+        chop = dict(chop)
+        chop['length_ratio'] = chop.get('length_ratio', 1)/2
+        chops.append(chop)
+
+    return chops
+
+def apply(functions, chops):
+    # calls each chop function (block.chop, shape.chop_radial, ...)
+    # with each set of keyword arguments
+    if callable(functions):
+        functions = [functions]
+
+    for function in functions:
+        for chop in chops:
+            function(**chop)
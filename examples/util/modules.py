@@ -0,0 +1,33 @@
+import importlib.util
+
+# Example modules with modified module-level parameters. Each call executes
+# the module anew and the result is not put into sys.modules, so parameters,
+# set for one variant, never stay set for the next one in the same process
+# (worker processes in a pool are reused).
+# Note: values that a module calculates from its parameters at import time
+# are calculated from defaults; examples that are meant to be varied
+# calculate them in get_mesh() and provide get_geometry() instead of
+# a module-level geometry dict (see geometry() below).
+
+def load(module_name, parameters=None):
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ImportError(f"No module named {module_name}")
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    for name, value in (parameters or {}).items():
+        if not hasattr(module, name):
+            raise AttributeError(f"Module {module_name} has no parameter {name}")
+
+        setattr(module, name, value)
+
+    return module
+
+def geometry(module):
+    # the geometry dict of an example module or None if it has none
+    if hasattr(module, 'get_geometry'):
+        return module.get_geometry()
+
+    return getattr(module, 'geometry', None)
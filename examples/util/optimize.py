@@ -0,0 +1,220 @@
+import os
+import json
+import multiprocessing
+
+import numpy as np
+
+from examples.util import modules
+from examples.util.dryrun import DryRun
+
+# Gradient-free optimization of an example's module-level parameters
+# (Nelder-Mead, in parameter space scaled to bounds). Candidates are evaluated
+# with a dry run (see dryrun.py) instead of blockMesh: an estimated cell count
+# and block quality metrics. Evaluations are memoized by parameter values,
+# candidates of each step (reflection, expansion and both contractions, or
+# a whole shrink) are evaluated at once in a pool of worker processes and
+# the state is saved after every step so that a long run can be resumed.
+
+# cost of candidates that can't be meshed
+invalid_cost = np.inf
+
+# cost added for each relative exceedance of a limit
+limit_penalty = 1e3
+
+def evaluate(arguments):
+    # metrics of a module with given parameters; runs in worker processes
+    module_name, names, values = arguments
+
+    try:
+        module = modules.load(module_name, {name: float(value) for name, value in zip(names, values)})
+
+        return dict(DryRun(module.get_mesh()).quality())
+    except Exception as e:
+        return {'valid': False, 'error': f'{type(e).__name__}: {e}'}
+
+def weighted_cost(weights=None, limits=None):
+    # cost(metrics): a weighted sum of metrics, penalized where
+    # they exceed limits, for instance {'n_cells': 200000};
+    # weights default to angle_deviation only
+    if weights is None:
+        weights = {'angle_deviation': 1}
+
+    if limits is None:
+        limits = {}
+
+    def cost(metrics):
+        if not metrics.get('valid'):
+            return invalid_cost
+
+        value = sum(weight*metrics[key] for key, weight in weights.items())
+
+        for key, limit in limits.items():
+            if metrics[key] > limit:
+                value += limit_penalty*(metrics[key]/limit - 1)
+
+        return float(value)
+
+    return cost
+
+class Optimizer:
+    def __init__(self, module_name, bounds, cost=None, n_processes=1, checkpoint=None, decimals=9):
+        # bounds: {parameter name: (low, high)}
+        self.module_name = module_name
+        self.names = list(bounds.keys())
+        self.low = np.array([bounds[n][0] for n in self.names], dtype=float)
+        self.high = np.array([bounds[n][1] for n in self.names], dtype=float)
+
+        self.cost = weighted_cost() if cost is None else cost
+        self.n_processes = n_processes
+        self.checkpoint = checkpoint
+        self.decimals = decimals
+
+        # {rounded scaled parameters: metrics}
+        self.cache = {}
+
+        self.simplex = None # scaled parameters, (n + 1, n)
+        self.costs = None
+        self.n_steps = 0
+
+        self.pool = None
+
+    def values(self, x):
+        # scaled (0...1) > parameter values
+        return self.low + np.clip(x, 0, 1)*(self.high - self.low)
+
+    def key(self, x):
+        return tuple(np.round(np.clip(x, 0, 1), self.decimals).tolist())
+
+    def evaluate(self, points):
+        # costs of scaled points; new ones are evaluated concurrently
+        keys = [self.key(x) for x in points]
+        new = list(dict.fromkeys(k for k in keys if k not in self.cache))
+
+        if new:
+            arguments = [(self.module_name, self.names, self.values(np.array(k)).tolist()) for k in new]
+
+            if self.pool is None:
+                results = [evaluate(a) for a in arguments]
+            else:
+                results = self.pool.map(evaluate, arguments)
+
+            self.cache.update(zip(new, results))
+
+        return np.array([self.cost(self.cache[k]) for k in keys], dtype=float)
+
+    def save(self):
+        if self.checkpoint is None:
+            return
+
+        state = {
+            'module': self.module_name,
+            'names': self.names,
+            'simplex': self.simplex.tolist(),
+            'n_steps': self.n_steps,
+            'cache': [[list(k), m] for k, m in self.cache.items()],
+        }
+
+        # write a new file and replace the old one so that an interrupted
+        # save never leaves a broken checkpoint
+        with open(self.checkpoint + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(self.checkpoint + '.tmp', self.checkpoint)
+
+    def load(self):
+        # returns True if state was loaded from checkpoint
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return False
+
+        with open(self.checkpoint, 'r') as f:
+            state = json.load(f)
+
+        if state['module'] != self.module_name or state['names'] != self.names:
+            raise ValueError(f"Checkpoint {self.checkpoint} belongs to a different optimization")
+
+        self.cache = {tuple(k): m for k, m in state['cache']}
+        self.simplex = np.array(state['simplex'])
+        self.costs = self.evaluate(self.simplex)
+        self.n_steps = state['n_steps']
+
+        return True
+
+    def step(self):
+        # one Nelder-Mead step with all candidates evaluated at once
+        order = np.argsort(self.costs)
+        self.simplex = self.simplex[order]
+        self.costs = self.costs[order]
+
+        centroid = np.mean(self.simplex[:-1], axis=0)
+        worst = self.simplex[-1]
+
+        reflected = centroid + (centroid - worst)
+        candidates = np.array([
+            reflected,
+            centroid + 2*(centroid - worst), # expanded
+            centroid + 0.5*(reflected - centroid), # outside contraction
+            centroid + 0.5*(worst - centroid), # inside contraction
+        ])
+        candidates = np.clip(candidates, 0, 1)
+        c_reflected, c_expanded, c_outside, c_inside = self.evaluate(candidates)
+
+        best, second_worst, worst_cost = self.costs[0], self.costs[-2], self.costs[-1]
+
+        if c_reflected < best:
+            if c_expanded < c_reflected:
+                self.simplex[-1], self.costs[-1] = candidates[1], c_expanded
+            else:
+                self.simplex[-1], self.costs[-1] = candidates[0], c_reflected
+        elif c_reflected < second_worst:
+            self.simplex[-1], self.costs[-1] = candidates[0], c_reflected
+        elif c_reflected < worst_cost and c_outside <= c_reflected:
+            self.simplex[-1], self.costs[-1] = candidates[2], c_outside
+        elif c_reflected >= worst_cost and c_inside < worst_cost:
+            self.simplex[-1], self.costs[-1] = candidates[3], c_inside
+        else:
+            # shrink towards the best point
+            self.simplex[1:] = self.simplex[0] + 0.5*(self.simplex[1:] - self.simplex[0])
+            self.costs[1:] = self.evaluate(self.simplex[1:])
+
+        self.n_steps += 1
+
+    def converged(self, tol):
+        size = np.max(np.abs(self.simplex[1:] - self.simplex[0]))
+        spread = np.max(self.costs) - np.min(self.costs)
+
+        return size < tol and spread < tol*max(abs(np.min(self.costs)), 1)
+
+    def run(self, start=None, step_size=0.1, max_evaluations=500, tol=1e-4, verbose=True):
+        # start: parameter values; defaults to the middle of bounds;
+        # returns (best parameters, their metrics)
+        if self.n_processes > 1:
+            self.pool = multiprocessing.Pool(self.n_processes)
+
+        try:
+            if not self.load():
+                x_0 = np.full(len(self.names), 0.5) if start is None else \
+                    (np.asarray(start, dtype=float) - self.low)/(self.high - self.low)
+
+                # initial simplex: steps along each parameter, away from the nearer bound
+                steps = np.where(x_0 + step_size <= 1, step_size, -step_size)
+                self.simplex = np.vstack((x_0, x_0 + np.diag(steps)))
+                self.costs = self.evaluate(self.simplex)
+                self.save()
+
+            while len(self.cache) < max_evaluations and not self.converged(tol):
+                self.step()
+                self.save()
+
+                if verbose:
+                    print(f"step {self.n_steps}, evaluations: {len(self.cache)}, best cost: {np.min(self.costs):.6g}, "
+                        f"{self.describe(self.simplex[np.argmin(self.costs)])}")
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+        best = self.simplex[np.argmin(self.costs)]
+
+        return dict(zip(self.names, self.values(best).tolist())), self.cache[self.key(best)]
+
+    def describe(self, x):
+        return ', '.join(f'{n}={v:.6g}' for n, v in zip(self.names, self.values(x)))
@@ -0,0 +1,121 @@
+import copy
+
+import numpy as np
+
+from examples.util.blocks import get_blocks, merge_points, tolerance
+from examples.util import transform as t
+
+# Circular and linear patterns: a template item (a shape, an operation or a list of those)
+# is copied n times; every copy is a deep copy of the template (blocks, edges,
+# chops and patches) but coordinates of all copies are calculated
+# with a single matrix multiplication and scattered into them.
+# Vertices on interfaces between neighbouring copies are found only once
+# on the template and then the same Vertex objects are used by both copies.
+
+def circular(item, n, axis, origin=None, angle=2*np.pi, merge=True):
+    # n instances, rotated around axis; the first is the template itself;
+    # when angle is a full circle, the last instance is connected to the first
+    closed = np.isclose(abs(angle), 2*np.pi)
+    if closed:
+        step = angle/n
+    else:
+        step = angle/(n - 1)
+
+    matrices = [t.rotation(axis, i*step, origin) for i in range(n)]
+
+    return copies(item, matrices, merge=merge, closed=closed)
+
+def linear(item, n, displacement, merge=True):
+    # n instances, each moved by displacement from the previous one
+    displacement = np.asarray(displacement, dtype=float)
+    matrices = [t.translation(i*displacement) for i in range(n)]
+
+    return copies(item, matrices, merge=merge)
+
+def periodic(item, n, displacement, first_patches=None, last_patches=None, merge=True):
+    # a periodic array of an operation (Wedge, Extrude, Revolve) or a shape:
+    # linear() copies with patches, given as {side: name}, set only on the first
+    # and the last instance (inlet, outlet); edge points of all instances
+    # are views into a single array
+    instances = linear(item, n, displacement, merge=merge)
+
+    for instance, patches in ((instances[0], first_patches), (instances[-1], last_patches)):
+        for side, name in (patches or {}).items():
+            setter = getattr(instance, f'set_{side}_patch', None)
+
+            if setter is None:
+                instance.set_patch(side, name)
+            else:
+                setter(name)
+
+    return instances
+
+def interface_map(points_1, points_2, tol=tolerance):
+    # for every point in points_2, index of the coincident point in points_1
+    # or -1 where there's none
+    n = len(points_1)
+    unique, inverse = merge_points(np.concatenate((points_1, points_2)), tol)
+
+    # first occurrence of each unique point within points_1
+    lookup = np.full(len(unique), -1)
+    lookup[inverse[:n][::-1]] = np.arange(n)[::-1]
+
+    return lookup[inverse[n:]]
+
+def copies(item, matrices, merge=True, closed=False):
+    # instances of item, transformed by given matrices;
+    # the first matrix must be identity since the template itself is reused;
+    # matrices must be uniformly spaced (a step between instances is always the same)
+    # for interface vertices to be merged
+    matrices = np.asarray(matrices, dtype=float)
+    n = len(matrices)
+
+    vertices, edges = t.collect(get_blocks(item))
+    points, slices = t.gather(vertices, edges)
+    n_vertices = len(vertices)
+
+    # coordinates of all copies at once: (n, n_points, 3)
+    all_points = np.einsum('kij,pj->kpi', matrices[:, :3, :3], points) + matrices[:, None, :3, 3]
+
+    instances = [item]
+    instance_vertices = [vertices]
+
+    for k in range(1, n):
+        instance = copy.deepcopy(item)
+        i_blocks = get_blocks(instance)
+        i_vertices, i_edges = t.collect(i_blocks)
+        t.scatter(all_points[k], i_vertices, i_edges, slices)
+
+        if np.linalg.det(matrices[k, :3, :3]) < 0:
+            for block in i_blocks:
+                t.flip(block)
+
+        instances.append(instance)
+        instance_vertices.append(i_vertices)
+
+    if not merge or n < 2:
+        return instances
+
+    # the same for all pairs of neighbours: vertex j of instance k+1
+    # is vertex vertex_map[j] of instance k
+    vertex_map = interface_map(all_points[0, :n_vertices], all_points[1, :n_vertices])
+
+    pairs = [(k, k + 1) for k in range(n - 1)]
+    if closed:
+        pairs.append((n - 1, 0))
+
+    for k_1, k_2 in pairs:
+        previous = instance_vertices[k_1]
+        current = instance_vertices[k_2]
+
+        replace = {}
+        for j in np.nonzero(vertex_map >= 0)[0]:
+            # snap exactly to the same point and reuse the object
+            replace[id(current[j])] = previous[vertex_map[j]]
+
+        for block in get_blocks(instances[k_2]):
+            block.vertices = [replace.get(id(v), v) for v in block.vertices]
+
+        instance_vertices[k_2] = [replace.get(id(v), v) for v in current]
+
+    return instances
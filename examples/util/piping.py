@@ -0,0 +1,233 @@
+import numpy as np
+
+from classy_blocks.classes.shapes import Cylinder, Frustum, Elbow
+
+from examples.util import functions as f
+from examples.util import sweep
+
+# A pipe along a polyline centreline: straight segments become Cylinders
+# (or Frustums where radius changes) and corners become Elbows.
+# Geometry of the whole route (tangent points, arc centers, rotation axes
+# and sketch frames at every shape's end) is calculated at once with array operations
+# and cached in Route.frames so that nothing has to be read back from
+# shapes' sketches while they are being chained.
+# Spline centrelines can be used by passing a densely sampled list of points
+# and bend_radius=None; each corner then gets the largest radius that fits.
+# With n_edge_points, elbows' edges are splines, sampled from sweep frames (see sweep.py).
+
+# straight segments shorter than this (relative to pipe radius) are omitted
+length_tolerance = 1e-6
+
+class Route:
+    def __init__(self, points, radius, bend_radius=None, max_angle=np.pi/4, radius_point=None, n_edge_points=None):
+        # points: centreline points
+        # radius: pipe radius, a single value or one for each point
+        # bend_radius: radius of elbows' centreline, a single value or one for each corner;
+        #     None: the biggest that fits between neighbouring corners
+        # max_angle: bends with bigger angles are split into more elbows
+        # radius_point: defines orientation of the first sketch
+        # n_edge_points: number of spline points on elbows' edges; None: arcs as created by Elbow
+        self.points = np.asarray(points, dtype=float)
+        self.n_points = len(self.points)
+
+        self.radii = np.broadcast_to(np.asarray(radius, dtype=float), (self.n_points,)).copy()
+        self.bend_radius = bend_radius
+        self.max_angle = max_angle
+        self.radius_point = radius_point
+        self.n_edge_points = n_edge_points
+
+        # calculated geometry
+        self.directions = None # unit vectors of straight segments
+        self.lengths = None # lengths of straight segments between tangent points
+        self.angles = None # bend angles at corners
+        self.axes = None # rotation axes at corners
+        self.centers = None # elbows' arc centers
+        self.n_divisions = None # number of elbows in each corner
+
+        # a (center point, normal, radius vector, radius) at each shape's end
+        self.frames = []
+
+        self.shapes = []
+
+        self.calculate()
+
+    def calculate(self):
+        segments = np.diff(self.points, axis=0)
+        lengths = np.linalg.norm(segments, axis=1)
+        directions = segments/lengths[:, None]
+
+        # corners: every point but the first and the last
+        t_in = directions[:-1]
+        t_out = directions[1:]
+
+        cos_angles = np.clip(np.sum(t_in*t_out, axis=1), -1, 1)
+        angles = np.arccos(cos_angles)
+
+        if np.any(np.isclose(angles, np.pi)):
+            raise ValueError("Route can't turn back on itself")
+
+        axes = np.cross(t_in, t_out)
+        axes_norm = np.linalg.norm(axes, axis=1)
+        straight = np.isclose(angles, 0)
+        # collinear segments don't need an elbow but a valid axis
+        # keeps the calculation below free of special cases
+        axes[straight] = [0, 0, 1]
+        axes_norm[straight] = 1
+        axes = axes/axes_norm[:, None]
+
+        half_tan = np.tan(angles/2)
+        if self.bend_radius is None:
+            # the biggest radius that still leaves straight segments
+            # a non-negative length
+            available = np.minimum(lengths[:-1], lengths[1:])/2
+            bend_radius = np.where(straight, 0, available/np.where(straight, 1, half_tan))
+        else:
+            bend_radius = np.broadcast_to(np.asarray(self.bend_radius, dtype=float), angles.shape)
+
+        trims = bend_radius*half_tan
+
+        # straight lengths between tangent points
+        straight_lengths = lengths.copy()
+        straight_lengths[:-1] -= trims
+        straight_lengths[1:] -= trims
+
+        if np.any(straight_lengths < -1e-9*lengths):
+            raise ValueError("Bend radius is too big for given points")
+
+        # towards the center of the bend, perpendicular to incoming direction
+        inward = np.cross(axes, t_in)
+        tangent_points = self.points[1:-1] - t_in*trims[:, None]
+        centers = tangent_points + inward*bend_radius[:, None]
+
+        n_divisions = np.maximum(1, np.ceil(angles/self.max_angle)).astype(int)
+
+        self.directions = directions
+        # round-off leaves tiny segments between adjacent elbows;
+        # anything much shorter than the pipe radius is no segment at all
+        segment_radii = np.maximum(self.radii[:-1], self.radii[1:])
+        self.lengths = np.where(straight_lengths > length_tolerance*segment_radii, straight_lengths, 0)
+        self.angles = np.where(straight, 0, angles)
+        self.axes = axes
+        self.centers = centers
+        self.n_divisions = n_divisions
+
+        self.calculate_frames(tangent_points)
+
+    def calculate_frames(self, tangent_points):
+        # radius vector of the first sketch
+        if self.radius_point is None:
+            # any vector, perpendicular to the first segment
+            normal = self.directions[0]
+            helper = np.eye(3)[np.argmin(np.abs(normal))]
+            radius_vector = np.cross(normal, helper)
+        else:
+            radius_vector = np.asarray(self.radius_point, dtype=float) - self.points[0]
+            radius_vector -= np.dot(radius_vector, self.directions[0])*self.directions[0]
+
+        radius_vector = radius_vector/np.linalg.norm(radius_vector)
+
+        # all rotations of all sub-divided elbows at once
+        steps = np.repeat(self.angles/self.n_divisions, self.n_divisions)
+        step_axes = np.repeat(self.axes, self.n_divisions, axis=0)
+        rotations = f.rotation_matrices(step_axes, steps)
+
+        self.frames = []
+        self.frames.append((self.points[0], self.directions[0], radius_vector, self.radii[0]))
+
+        i_rotation = 0
+        for i_corner in range(len(self.angles)):
+            # end of straight segment
+            self.frames.append((
+                tangent_points[i_corner], self.directions[i_corner],
+                radius_vector, self.radii[i_corner + 1]))
+
+            if self.angles[i_corner] == 0:
+                continue
+
+            # end of every elbow
+            center = self.centers[i_corner]
+            arm = tangent_points[i_corner] - center
+            normal = self.directions[i_corner]
+
+            for _ in range(self.n_divisions[i_corner]):
+                r = rotations[i_rotation]
+                arm = np.dot(r, arm)
+                normal = np.dot(r, normal)
+                radius_vector = np.dot(r, radius_vector)
+                self.frames.append((center + arm, normal, radius_vector, self.radii[i_corner + 1]))
+
+                i_rotation += 1
+
+        # the end of the last straight segment
+        self.frames.append((self.points[-1], self.directions[-1], radius_vector, self.radii[-1]))
+
+    def straight(self, source, start_frame, end_frame):
+        # a Cylinder or a Frustum between two frames
+        length = np.linalg.norm(end_frame[0] - start_frame[0])
+        r_1 = start_frame[3]
+        r_2 = end_frame[3]
+
+        if source is None:
+            radius_point = start_frame[0] + start_frame[2]*r_1
+
+            if np.isclose(r_1, r_2):
+                return Cylinder(start_frame[0], end_frame[0], radius_point)
+
+            return Frustum(start_frame[0], end_frame[0], radius_point, r_2)
+
+        if np.isclose(r_1, r_2):
+            return Cylinder.chain(source, length)
+
+        return Frustum.chain(source, length, r_2)
+
+    def elbow(self, source, start_frame, angle, center, axis, radius):
+        if source is None:
+            # the route starts with a bend
+            radius_point = start_frame[0] + start_frame[2]*start_frame[3]
+            elbow = Elbow(start_frame[0], radius_point, start_frame[1], angle, center, axis, radius)
+        else:
+            elbow = Elbow.chain(source, angle, center, axis, radius)
+
+        if self.n_edge_points is not None:
+            sweep.refine(elbow, angle, center, axis, self.n_edge_points)
+
+        return elbow
+
+    def build(self):
+        # creates shapes from calculated frames
+        self.shapes = []
+        source = None
+
+        i_frame = 0
+        for i_segment in range(len(self.lengths)):
+            start_frame = self.frames[i_frame]
+            end_frame = self.frames[i_frame + 1]
+            i_frame += 1
+
+            if self.lengths[i_segment] > 0:
+                source = self.straight(source, start_frame, end_frame)
+                self.shapes.append(source)
+
+            if i_segment == len(self.angles):
+                # the last segment
+                break
+
+            angle = self.angles[i_segment]
+            if angle == 0:
+                continue
+
+            n = self.n_divisions[i_segment]
+            for _ in range(n):
+                source = self.elbow(
+                    source, self.frames[i_frame], angle/n,
+                    self.centers[i_segment], self.axes[i_segment],
+                    self.frames[i_frame + 1][3])
+                self.shapes.append(source)
+
+                i_frame += 1
+
+        return self.shapes
+
+def route(points, radius, bend_radius=None, max_angle=np.pi/4, radius_point=None, n_edge_points=None):
+    # a shortcut: calculate and return a list of shapes
+    return Route(points, radius, bend_radius, max_angle, radius_point, n_edge_points).build()
@@ -0,0 +1,121 @@
+import os
+import heapq
+
+import numpy as np
+
+# Large point sources (scanned profiles, point clouds along curves) for spline edges.
+# Binary files are memory-mapped so that only the parts that are actually used
+# are read from disk; slices of loaded points are views, not copies.
+# Points must be ordered along the curve they describe; decimate() then
+# picks a small subset that describes the curve within given tolerance.
+
+text_extensions = ('.dat', '.txt', '.csv', '.xyz')
+
+def load(path, columns=3, dtype=np.float64, offset=0, skip_rows=0):
+    # .npy files and raw binary files (any other extension) are memory-mapped;
+    # raw files are read as rows of 'columns' numbers of 'dtype', starting at 'offset' bytes;
+    # text files are read into memory (see to_npy()), skipping 'skip_rows' lines
+    # at the start; empty lines are ignored
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.npy':
+        return np.load(path, mmap_mode='r')
+
+    if extension in text_extensions:
+        return np.loadtxt(path, delimiter=',' if extension == '.csv' else None, ndmin=2, skiprows=skip_rows)
+
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset).reshape(-1, columns)
+
+def to_npy(path, npy_path=None, skip_rows=0):
+    # converts a text file to .npy once so that it can be memory-mapped later;
+    # returns path to the new file
+    if npy_path is None:
+        npy_path = os.path.splitext(path)[0] + '.npy'
+
+    np.save(npy_path, load(path, skip_rows=skip_rows))
+
+    return npy_path
+
+def with_z(points, z=0):
+    # 3D points from 2D points (a float copy)
+    points = np.array(points, dtype=float)
+    if points.shape[1] == 3:
+        return points
+
+    return np.column_stack((points, np.full(len(points), z, dtype=float)))
+
+def split_index(points, x, axis=0):
+    # index of the first point with coordinate along axis bigger than x;
+    # coordinates must increase along the curve
+    return int(np.searchsorted(points[:, axis], x, side='right'))
+
+def segment_distances(points, start, end):
+    # distances of points from a line segment start-end
+    direction = end - start
+    length_2 = np.dot(direction, direction)
+
+    if length_2 == 0:
+        return np.linalg.norm(points - start, axis=1)
+
+    t = np.clip(np.dot(points - start, direction)/length_2, 0, 1)
+
+    return np.linalg.norm(points - (start + t[:, None]*direction), axis=1)
+
+def decimate(points, tolerance, max_points=None):
+    # indexes of points that describe the curve within tolerance (Douglas-Peucker);
+    # segments with the biggest deviation are split first so that
+    # max_points, if given, are spent where they matter most
+    points = np.asarray(points)
+    n_points = len(points)
+
+    if n_points < 3:
+        return np.arange(n_points)
+
+    def split(start, end):
+        # (-max. distance, start, end, index of the farthest point)
+        if end - start < 2:
+            return None
+
+        distances = segment_distances(points[start + 1:end], points[start], points[end])
+        i = int(np.argmax(distances))
+
+        return (-distances[i], start, end, start + 1 + i)
+
+    kept = [0, n_points - 1]
+    queue = [split(0, n_points - 1)]
+
+    while queue:
+        distance, start, end, index = heapq.heappop(queue)
+
+        if -distance <= tolerance:
+            break
+
+        if max_points is not None and len(kept) >= max_points:
+            break
+
+        kept.append(index)
+
+        for segment in (split(start, index), split(index, end)):
+            if segment is not None:
+                heapq.heappush(queue, segment)
+
+    return np.sort(kept)
+
+def max_deviation(points, indexes):
+    # the biggest distance of points from a polyline through points[indexes]
+    points = np.asarray(points)
+    deviation = 0
+
+    for start, end in zip(indexes[:-1], indexes[1:]):
+        if end - start > 1:
+            distances = segment_distances(points[start + 1:end], points[start], points[end])
+            deviation = max(deviation, np.max(distances))
+
+    return deviation
+
+def edge_points(points, tolerance, max_points=None):
+    # spline edge points from a part of a curve; the first and the last point
+    # are block vertices so they are not included
+    indexes = decimate(points, tolerance, max_points)
+
+    return np.asarray(points[indexes[1:-1]], dtype=float)
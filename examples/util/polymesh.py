@@ -0,0 +1,332 @@
+import os
+
+import numpy as np
+
+from examples.util import tfi
+from examples.util.zones import zone_cells
+from examples.util.blocks import get_blocks, merge_points, prepare, block_counts
+
+# A pure-python stand-in for blockMesh: block points are calculated by
+# transfinite interpolation (see tfi.py) and written directly to polyMesh.
+# Projections and merged patches are not supported.
+# Note: points were not compared with blockMesh output in this repository;
+# run.py --compare does that on a machine with OpenFOAM.
+
+# faces of OpenFOAM's hex cell model, pointing outwards;
+# cell points are numbered the same way as block vertices
+hex_faces = np.array([
+    [0, 4, 7, 3], # i = 0
+    [1, 2, 6, 5], # i = max
+    [0, 1, 5, 4], # j = 0
+    [3, 7, 6, 2], # j = max
+    [0, 3, 2, 1], # k = 0
+    [4, 5, 6, 7], # k = max
+])
+
+# block side > (axis, at the end, hex face index)
+block_sides = {
+    'left': (0, False, 0),
+    'right': (0, True, 1),
+    'front': (1, False, 2),
+    'back': (1, True, 3),
+    'bottom': (2, False, 4),
+    'top': (2, True, 5),
+}
+
+header = """/*--------------------------------*- C++ -*----------------------------------*\\
+| Written by classy_examples                                                  |
+\\*---------------------------------------------------------------------------*/
+FoamFile
+{{
+    version     2.0;
+    format      ascii;
+    class       {cls};
+    location    "constant/polyMesh";
+    object      {name};{note}
+}}
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+
+"""
+
+def grid_cells(shape):
+    # point indexes of hexahedral cells of a (n_0, n_1, n_2) point grid;
+    # cells are ordered with i running fastest, the same as in blockMesh
+    n_0, n_1, n_2 = shape
+    grid = np.arange(n_0*n_1*n_2).reshape(n_0, n_1, n_2)
+
+    corners = [
+        grid[:-1, :-1, :-1], grid[1:, :-1, :-1], grid[1:, 1:, :-1], grid[:-1, 1:, :-1],
+        grid[:-1, :-1, 1:], grid[1:, :-1, 1:], grid[1:, 1:, 1:], grid[:-1, 1:, 1:],
+    ]
+
+    # (i, j, k, 8) > (k, j, i, 8)
+    return np.stack(corners, axis=-1).transpose(2, 1, 0, 3).reshape(-1, 8)
+
+def side_cells(shape, side):
+    # local indexes of cells on a given block side
+    n_0, n_1, n_2 = shape[0] - 1, shape[1] - 1, shape[2] - 1
+    axis, end, _ = block_sides[side]
+
+    index = np.arange(n_0*n_1*n_2).reshape(n_2, n_1, n_0)
+    index = np.moveaxis(index, 2 - axis, 0)
+
+    return index[-1 if end else 0].flatten()
+
+def default_patch(mesh):
+    patch = getattr(mesh, 'default_patch', None)
+
+    if isinstance(patch, dict):
+        return patch['name'], patch['type']
+
+    if patch:
+        return tuple(patch)
+
+    return 'defaultFaces', 'empty'
+
+def face_string(face):
+    # a face without repeated points (triangles of collapsed cells)
+    points = [p for i, p in enumerate(face) if p != face[i - 1]]
+
+    return f'{len(points)}({" ".join(str(p) for p in points)})'
+
+class PolyMesh:
+    def __init__(self, mesh, tol=None):
+        self.mesh = mesh
+        self.blocks = get_blocks(mesh)
+
+        self.points = None
+        self.cells = None # point indexes of each cell
+        self.block_offsets = None # index of the first cell of each block
+
+        self.faces = None
+        self.owner = None
+        self.neighbour = None
+        self.patches = [] # (name, type, n_faces, start_face)
+        self.cell_zones = {} # {name: cell indexes}
+
+        self.build(tol)
+
+    def build(self, tol):
+        prepare(self.mesh)
+        grids = tfi.mesh_points(self.blocks)
+
+        # merge points of all blocks
+        block_points = np.concatenate([g.reshape(-1, 3) for g in grids])
+
+        if tol is None:
+            # a fraction of the smallest cell edge in the mesh; collapsed edges
+            # (wedges on axis) and round-off are ignored
+            scale = np.linalg.norm(np.ptp(block_points, axis=0))
+            lengths = np.concatenate([np.linalg.norm(np.diff(g, axis=a), axis=-1).reshape(-1) for g in grids for a in range(3)])
+            tol = 1e-3*np.min(lengths[lengths > 1e-9*scale])
+
+        self.points, point_map = merge_points(block_points, tol)
+
+        cells = []
+        point_offset = 0
+        for g in grids:
+            cells.append(point_map[grid_cells(g.shape[:3]) + point_offset])
+            point_offset += g.shape[0]*g.shape[1]*g.shape[2]
+
+        self.block_offsets = np.concatenate(([0], np.cumsum([len(c) for c in cells])))
+        self.cells = np.concatenate(cells)
+        self.cell_zones = zone_cells(self.blocks, self.block_offsets)
+
+        self.build_faces(grids)
+
+    def build_faces(self, grids):
+        n_cells = len(self.cells)
+
+        # all faces of all cells: (n_cells*6, 4)
+        all_faces = self.cells[:, hex_faces].reshape(-1, 4)
+        all_owners = np.repeat(np.arange(n_cells), 6)
+
+        # cells with collapsed edges (wedges): faces with 3 different points
+        # are triangles, those with fewer have no area and are dropped as in blockMesh
+        sorted_faces = np.sort(all_faces, axis=1)
+        n_face_points = 1 + np.sum(np.diff(sorted_faces, axis=1) != 0, axis=1)
+        kept = np.flatnonzero(n_face_points >= 3)
+
+        _, inverse, counts = np.unique(sorted_faces[kept], axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+
+        if np.any(counts > 2):
+            raise ValueError("Invalid mesh: a face is shared by more than 2 cells")
+
+        # occurrences of the same face are next to each other,
+        # the one from a lower cell index first
+        order = np.argsort(inverse, kind='stable')
+        occurrence_counts = counts[inverse[order]]
+        order = kept[order]
+
+        internal = order[occurrence_counts == 2].reshape(-1, 2)
+        owners = all_owners[internal[:, 0]]
+        neighbours = all_owners[internal[:, 1]]
+
+        internal_order = np.lexsort((neighbours, owners))
+        internal_faces = all_faces[internal[internal_order, 0]]
+        owners = owners[internal_order]
+        neighbours = neighbours[internal_order]
+
+        # boundary faces: assign patches from blocks' sides
+        boundary = order[occurrence_counts == 1]
+        patch_of_face = np.full(len(all_faces), -1)
+        patch_names = []
+
+        for i_block, block in enumerate(self.blocks):
+            shape = grids[i_block].shape[:3]
+
+            for name, sides in block.patches.items():
+                if name not in patch_names:
+                    patch_names.append(name)
+
+                for side in sides:
+                    cells = side_cells(shape, side) + self.block_offsets[i_block]
+                    patch_of_face[cells*6 + block_sides[side][2]] = patch_names.index(name)
+
+        default_name, default_type = default_patch(self.mesh)
+        boundary_patches = patch_of_face[boundary]
+        boundary_patches[boundary_patches == -1] = len(patch_names)
+        patch_names.append(default_name)
+
+        boundary_order = np.argsort(boundary_patches, kind='stable')
+        boundary = boundary[boundary_order]
+        boundary_patches = boundary_patches[boundary_order]
+
+        self.faces = np.concatenate((internal_faces, all_faces[boundary]))
+        self.owner = np.concatenate((owners, all_owners[boundary]))
+        self.neighbour = neighbours
+
+        self.patches = []
+        start = len(internal_faces)
+        for i_patch, name in enumerate(patch_names):
+            n_faces = int(np.sum(boundary_patches == i_patch))
+            if n_faces == 0:
+                continue
+
+            patch_type = default_type if i_patch == len(patch_names) - 1 else 'patch'
+            self.patches.append((name, patch_type, n_faces, start))
+            start += n_faces
+
+    def write_file(self, directory, name, cls, lines, count, note=''):
+        if note:
+            note = f'\n    note        "{note}";'
+
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(header.format(cls=cls, name=name, note=note))
+            f.write(f'{count}\n(\n')
+            f.write('\n'.join(lines))
+            f.write('\n)\n')
+
+    def write(self, case_path):
+        directory = os.path.join(case_path, 'constant', 'polyMesh')
+        os.makedirs(directory, exist_ok=True)
+
+        note = f'nPoints:{len(self.points)} nCells:{len(self.cells)} ' \
+            f'nFaces:{len(self.faces)} nInternalFaces:{len(self.neighbour)}'
+
+        self.write_file(directory, 'points', 'vectorField',
+            (f'({p[0]:.12g} {p[1]:.12g} {p[2]:.12g})' for p in self.points), len(self.points))
+        self.write_file(directory, 'faces', 'faceList',
+            (face_string(f) for f in self.faces), len(self.faces))
+        self.write_file(directory, 'owner', 'labelList',
+            (str(o) for o in self.owner), len(self.owner), note)
+        self.write_file(directory, 'neighbour', 'labelList',
+            (str(n) for n in self.neighbour), len(self.neighbour), note)
+
+        with open(os.path.join(directory, 'boundary'), 'w') as f:
+            f.write(header.format(cls='polyBoundaryMesh', name='boundary', note=''))
+            f.write(f'{len(self.patches)}\n(\n')
+
+            for name, patch_type, n_faces, start in self.patches:
+                f.write(f'    {name}\n    {{\n')
+                f.write(f'        type            {patch_type};\n')
+                if patch_type == 'wall':
+                    f.write('        inGroups        List<word> 1(wall);\n')
+                f.write(f'        nFaces          {n_faces};\n')
+                f.write(f'        startFace       {start};\n')
+                f.write('    }\n')
+
+            f.write(')\n')
+
+        if self.cell_zones:
+            write_cell_zones(directory, self.cell_zones)
+
+def write_cell_zones(directory, cell_zones):
+    # constant/polyMesh/cellZones; there's no need for setsToZones afterwards
+    with open(os.path.join(directory, 'cellZones'), 'w') as f:
+        f.write(header.format(cls='regIOobject', name='cellZones', note=''))
+        f.write(f'{len(cell_zones)}\n(\n')
+
+        for name, cells in cell_zones.items():
+            f.write(f'{name}\n{{\n    type cellZone;\n')
+            f.write(f'cellLabels      List<label> {len(cells)}\n(\n')
+            f.write('\n'.join(str(c) for c in cells))
+            f.write('\n)\n;\n}\n')
+
+        f.write(')\n')
+
+def read_n_cells(directory):
+    # number of cells from the note in owner's header
+    with open(os.path.join(directory, 'owner'), 'r') as f:
+        for line in f:
+            if 'nCells:' in line:
+                return int(line.split('nCells:')[1].split()[0])
+
+            if line.startswith('//'):
+                break
+
+    return None
+
+def write_zones(mesh, case_path):
+    # cellZones for a mesh, written by blockMesh, from cell zones of its blocks;
+    # blockMesh numbers cells block by block so each block is a range of cells.
+    # blocks must be prepared (mesh.write() does that)
+    directory = os.path.join(case_path, 'constant', 'polyMesh')
+    blocks = get_blocks(mesh)
+
+    n_cells = [np.prod(block_counts(block)) for block in blocks]
+    block_offsets = np.concatenate(([0], np.cumsum(n_cells)))
+
+    n_mesh_cells = read_n_cells(directory)
+    if n_mesh_cells is not None and n_mesh_cells != block_offsets[-1]:
+        raise ValueError(f"Cell count mismatch: {block_offsets[-1]} in blocks, {n_mesh_cells} in polyMesh")
+
+    cell_zones = zone_cells(blocks, block_offsets)
+    if cell_zones:
+        write_cell_zones(directory, cell_zones)
+
+    return cell_zones
+
+def read_points(path):
+    # points from an ascii OpenFOAM points file
+    with open(path, 'r') as f:
+        text = f.read()
+
+    # skip the header
+    text = text[text.index('}') + 1:]
+    text = text[text.index('(') + 1:text.rindex(')')]
+
+    return np.array(text.replace('(', ' ').replace(')', ' ').split(), dtype=float).reshape(-1, 3)
+
+def compare(points, reference_path):
+    # the biggest distance between points and points in a
+    # reference points file (written by blockMesh); point order doesn't matter
+    reference = read_points(reference_path)
+
+    if len(reference) != len(points):
+        raise ValueError(f"Point count mismatch: {len(points)}, reference: {len(reference)}")
+
+    def sort(p):
+        # round to ignore tiny differences in sorting
+        scale = np.max(np.abs(p))
+        keys = np.round(p/scale, 6)
+        return p[np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))]
+
+    return np.max(np.linalg.norm(sort(points) - sort(reference), axis=1))
+
+def write_mesh(mesh, case_path):
+    polymesh = PolyMesh(mesh)
+    polymesh.write(case_path)
+
+    return polymesh
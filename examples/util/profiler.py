@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import threading
+import contextlib
+import collections
+
+from examples.util import modules
+
+# A sampling profiler: a background thread looks at the profiled thread's
+# stack every few milliseconds and counts how many times each stack was seen.
+# Unlike cProfile, nothing is done on function calls so overhead is low
+# and doesn't depend on how many small functions are called.
+# Samples are grouped by stage ('get_mesh', 'write', ...) and aggregated
+# over everything profiled with the same Profiler (many examples, sweep variants);
+# results are a hotspot table and collapsed stacks for flamegraph tools
+# (flamegraph.pl, speedscope, inferno).
+
+class Profiler:
+    def __init__(self, interval=0.002, thread_id=None):
+        self.interval = interval # [s] between samples
+        self.thread_id = thread_id or threading.main_thread().ident
+
+        # {(stage, frame key, frame key, ...): number of samples}
+        self.samples = collections.Counter()
+        # {stage: wall time}
+        self.times = collections.defaultdict(float)
+
+        self.current_stage = None
+        self.thread = None
+        self.running = False
+
+        self.labels = {} # frame key > function label
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.running = False
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running:
+            stage = self.current_stage
+            frame = sys._current_frames().get(self.thread_id)
+
+            if stage is not None and frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+
+                stack.append(stage)
+                self.samples[tuple(reversed(stack))] += 1
+
+            time.sleep(self.interval)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        # profiles the code in with block as stage 'name'
+        self.start()
+
+        previous = self.current_stage
+        self.current_stage = name
+        t_start = time.perf_counter()
+
+        try:
+            yield self
+        finally:
+            self.times[name] += time.perf_counter() - t_start
+            self.current_stage = previous
+
+    def label(self, key):
+        if key not in self.labels:
+            file_name, line, function = key
+            path = os.path.relpath(file_name) if file_name.startswith(os.getcwd()) else \
+                os.path.join(*file_name.split(os.sep)[-2:])
+
+            self.labels[key] = f'{function} ({path}:{line})'
+
+        return self.labels[key]
+
+    def hotspots(self, stage=None):
+        # [(function label, self samples, total samples), ...], sorted by self samples;
+        # 'total' counts samples where the function was anywhere on the stack
+        own = collections.Counter()
+        total = collections.Counter()
+
+        for stack, count in self.samples.items():
+            if stage is not None and stack[0] != stage:
+                continue
+
+            own[stack[-1]] += count
+            for key in set(stack[1:]):
+                total[key] += count
+
+        rows = [(self.label(key), own[key], count) for key, count in total.items()]
+
+        return sorted(rows, key=lambda r: (-r[1], -r[2]))
+
+    def print_hotspots(self, n_rows=25):
+        for stage, wall_time in self.times.items():
+            n_samples = sum(c for s, c in self.samples.items() if s[0] == stage)
+            print(f"{stage}: {wall_time:.3f} s, {n_samples} samples")
+
+            if n_samples == 0:
+                continue
+
+            print(f"{'self %':>8s} {'total %':>8s}  function")
+            for label, own, total in self.hotspots(stage)[:n_rows]:
+                print(f"{100*own/n_samples:8.1f} {100*total/n_samples:8.1f}  {label}")
+
+            print()
+
+    def write_collapsed(self, path):
+        # one line per stack: 'stage;outer function;...;inner function count'
+        with open(path, 'w') as f:
+            for stack, count in self.samples.items():
+                labels = [stack[0]] + [self.label(key) for key in stack[1:]]
+                f.write(';'.join(labels) + f' {count}\n')
+
+def profile_examples(example_modules, output_path, n_rows=25):
+    # profiles get_mesh() and mesh.write() of given example modules;
+    # prints hotspots and writes collapsed stacks to output_path
+    profiler = Profiler()
+    blockmesh_dict = os.path.join(os.path.dirname(output_path), 'system', 'blockMeshDict')
+
+    for module in example_modules:
+        with profiler.stage('get_mesh'):
+            mesh = module.get_mesh()
+
+        with profiler.stage('write'):
+            mesh.write(output_path=blockmesh_dict, geometry=modules.geometry(module), debug=False)
+
+    profiler.stop()
+
+    profiler.print_hotspots(n_rows)
+    profiler.write_collapsed(output_path)
+
+    return profiler
@@ -0,0 +1,88 @@
+import numpy as np
+
+from examples.util.blocks import get_blocks, block_points, merge_points, tolerance
+
+# Projections onto analytic surfaces (spheres, cylinders, planes; see geometry.py),
+# resolved in python before writing: vertices of projected faces and edges
+# are moved onto their surfaces and projected edges are replaced with
+# arcs or splines. blockMesh then doesn't have to snap points to surfaces.
+# Projections onto other surfaces (STL) are left for blockMesh.
+# Neighbouring blocks can have their own Vertex objects at the same position
+# (they are only merged when the mesh is written) so every vertex
+# at the position of a projected one is moved, in all blocks.
+# Note: interior points of resolved faces are interpolated from their edges
+# by blockMesh; they are not exactly on the surface as they would be with
+# projection but get closer with more blocks.
+
+# number of points for splines where an arc can't be used
+n_spline_points = 10
+
+def face_pairs(block, side):
+    indexes = block.face_map[side]
+
+    return [(indexes[i], indexes[(i + 1) % 4]) for i in range(4)]
+
+def resolve(item, surfaces, n_points=n_spline_points, tol=tolerance):
+    # item: a Mesh or anything else with blocks; surfaces: a list of geometry.Surfaces;
+    # returns the number of replaced edges for each surface
+    surfaces = {s.name: s for s in surfaces if s.analytic}
+    blocks = get_blocks(item)
+
+    # all block vertices by position
+    unique, point_map = merge_points(block_points(blocks), tol)
+    point_map = point_map.reshape(-1, 8)
+
+    # positions to project: {surface name: set of unique point indexes}
+    positions = {name: set() for name in surfaces}
+    # edges to replace: {surface name: [(block index, index_1, index_2), ...]}
+    edges = {name: [] for name in surfaces}
+
+    for i_block, block in enumerate(blocks):
+        remaining = []
+
+        for side, name in block.faces:
+            if name in surfaces:
+                positions[name].update(point_map[i_block, list(block.face_map[side])].tolist())
+            else:
+                remaining.append([side, name])
+
+        block.faces = remaining
+
+        kept = []
+
+        for edge in block.edges:
+            if edge.type == 'project' and edge.points in surfaces:
+                pair = (edge.block_index_1, edge.block_index_2)
+                edges[edge.points].append((i_block, *pair))
+                positions[edge.points].update(point_map[i_block, list(pair)].tolist())
+            else:
+                kept.append(edge)
+
+        block.edges = kept
+
+    for name, surface in surfaces.items():
+        # all positions at once
+        if positions[name]:
+            indexes = sorted(positions[name])
+            unique[indexes] = surface.closest(unique[indexes])
+
+        # then all edges at once
+        if not edges[name]:
+            continue
+
+        indexes = np.array(edges[name])
+        points_1 = unique[point_map[indexes[:, 0], indexes[:, 1]]]
+        points_2 = unique[point_map[indexes[:, 0], indexes[:, 2]]]
+
+        for (i_block, i_1, i_2), points in zip(edges[name], surface.edge_points(points_1, points_2, n_points)):
+            if points is not None:
+                blocks[i_block].add_edge(i_1, i_2, points)
+
+    # every vertex gets the (new) position of its point
+    moved = set().union(*positions.values())
+    for i_block, block in enumerate(blocks):
+        for i, vertex in enumerate(block.vertices):
+            if point_map[i_block, i] in moved:
+                vertex.point = unique[point_map[i_block, i]].copy()
+
+    return {name: len(e) for name, e in edges.items()}
@@ -0,0 +1,126 @@
+import re
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+from examples.util import vtk, modules
+from examples.util.template import Template, render_mesh
+
+# Building meshes in worker processes without sending Mesh objects back:
+# a worker renders blockMeshDict, separates it into structure and geometric numbers
+# (see template.py) and puts both into a shared memory block: all geometric numbers
+# (vertices, edge points, gradings) as a single float64 array, followed by
+# the structure as text.
+# Only a small Handle is pickled back to the parent that can then
+# write blockMeshDicts or previews directly from shared memory.
+
+hex_pattern = re.compile(r'hex\s*\(([\d\s]+)\)')
+
+class Handle:
+    def __init__(self, name, n_values, n_structure, sections, key):
+        self.name = name # shared memory block
+        self.n_values = n_values # number of float64 values at the start of the block
+        self.n_structure = n_structure # number of bytes of structure after them
+        self.sections = sections # [(section name, start, end), ...]
+        self.key = key # topology hash
+
+        self.shm = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['shm'] = None
+        return state
+
+    def attach(self):
+        if self.shm is None:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+
+        return self.shm
+
+    @property
+    def values(self):
+        # geometric numbers; a view into shared memory, not a copy
+        return np.ndarray((self.n_values,), dtype=np.float64, buffer=self.attach().buf)
+
+    def section(self, name):
+        for section, start, end in self.sections:
+            if section == name:
+                return self.values[start:end]
+
+        return self.values[:0]
+
+    @property
+    def vertices(self):
+        return self.section('vertices').reshape(-1, 3)
+
+    @property
+    def structure(self):
+        start = self.n_values*8
+        return bytes(self.attach().buf[start:start + self.n_structure]).decode()
+
+    @property
+    def template(self):
+        field_sections = []
+        for name, start, end in self.sections:
+            field_sections += [name]*(end - start)
+
+        return Template.from_parts(self.structure.split('\0'), self.values, field_sections)
+
+    def write_dict(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.template.render())
+
+    def write_preview(self, path):
+        # blocks only; for edges and patches, use vtk.write_mesh() on a Mesh
+        hexes = [np.array(h.split(), dtype=int) for h in hex_pattern.findall(self.structure)]
+        vtk.write(path, self.vertices, hexes, [vtk.VTK_HEXAHEDRON]*len(hexes))
+
+    def release(self):
+        # must be called by the parent when the data is no longer needed
+        shm = self.attach()
+        shm.close()
+        shm.unlink()
+        self.shm = None
+
+def section_runs(field_sections):
+    # [name, name, name, other, ...] > [(name, 0, 3), (other, 3, ...), ...]
+    runs = []
+    for i, name in enumerate(field_sections):
+        if runs and runs[-1][0] == name:
+            runs[-1][2] = i + 1
+        else:
+            runs.append([name, i, i + 1])
+
+    return [tuple(r) for r in runs]
+
+def build(module_name, parameters=None):
+    # runs in a worker: creates a mesh from a fresh instance of an example module
+    # (with optionally modified module-level parameters, see modules.py),
+    # stores it in shared memory and returns a Handle
+    module = modules.load(module_name, parameters)
+
+    mesh = module.get_mesh()
+    template = Template(render_mesh(mesh, modules.geometry(module)))
+
+    structure = '\0'.join(template.pieces).encode()
+    values_size = template.values.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(values_size + len(structure), 1))
+    np.ndarray(template.values.shape, dtype=np.float64, buffer=shm.buf)[:] = template.values
+    shm.buf[values_size:values_size + len(structure)] = structure
+
+    handle = Handle(shm.name, len(template.values), len(structure),
+        section_runs(template.field_sections), template.key)
+    shm.close()
+
+    return handle
+
+def build_all(jobs, processes=None):
+    # jobs: a list of (module name, parameters) tuples;
+    # workers must use the parent's resource tracker: blocks then live until
+    # the parent releases them (or exits) and not only as long as the worker
+    resource_tracker.ensure_running()
+
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(build, jobs)
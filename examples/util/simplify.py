@@ -0,0 +1,203 @@
+import numpy as np
+
+from examples.util import curves, points
+from examples.util.blocks import get_blocks
+
+# Spline edges with fewer points: each spline is sampled densely
+# (curves.spline() evaluates it the same way as blockMesh does),
+# its points are decimated (Douglas-Peucker, see points.py) and the new spline
+# is checked against samples of the original; if it deviates more than
+# tolerance, decimation is repeated with a smaller tolerance.
+# Splines that are within tolerance of a straight line are removed (blockMesh
+# uses a straight edge) and those within tolerance of a circular arc through
+# their end points and midpoint are replaced by arcs.
+# All new edges run through points of the original curve.
+
+# each curve is sampled with this many points or
+# 4 times the number of its spline points, whichever is bigger
+n_samples = 100
+
+# decimation is tightened this many times before the original edge is kept
+max_iterations = 8
+
+# curves are compared in chunks of edges with about this many sample-segment pairs
+chunk_elements = 10**7
+
+def polyline_distances(samples, polylines):
+    # the biggest distance of samples from polylines;
+    # (n, m, 3), (n, k, 3) > (n,)
+    start = polylines[:, :-1]
+    direction = polylines[:, 1:] - start
+    length_2 = np.maximum(np.sum(direction**2, axis=-1), 1e-300)
+
+    # (n, m, k - 1)
+    relative = samples[:, :, None] - start[:, None]
+    t = np.clip(np.sum(relative*direction[:, None], axis=-1)/length_2[:, None], 0, 1)
+    distances = np.linalg.norm(relative - t[..., None]*direction[:, None], axis=-1)
+
+    return np.max(np.min(distances, axis=2), axis=1)
+
+def curve_distance(samples_1, samples_2):
+    # the biggest distance between two curves, sampled in the same direction
+    # with points (roughly) evenly spaced along their length; each sample is
+    # only compared to the segments of the other curve around the same fraction
+    # of length, not all of them
+    def one_way(samples, polyline):
+        n_samples, n_segments = len(samples), len(polyline) - 1
+        window = 8 + n_segments//16
+
+        centers = np.round(np.linspace(0, n_segments - 1, n_samples)).astype(int)
+        segments = np.clip(centers[:, None] + np.arange(-window, window + 1), 0, n_segments - 1)
+
+        start = polyline[segments]
+        direction = polyline[segments + 1] - start
+        length_2 = np.maximum(np.sum(direction**2, axis=-1), 1e-300)
+
+        relative = samples[:, None] - start
+        t = np.clip(np.sum(relative*direction, axis=-1)/length_2, 0, 1)
+
+        return np.max(np.min(np.linalg.norm(relative - t[..., None]*direction, axis=-1), axis=1))
+
+    return max(one_way(samples_1, samples_2), one_way(samples_2, samples_1))
+
+def deviations(samples, candidates):
+    # as polyline_distances() but in chunks to limit memory
+    result = np.empty(len(samples))
+    chunk_size = max(1, chunk_elements//(samples.shape[1]*candidates.shape[1]))
+
+    for i in range(0, len(samples), chunk_size):
+        result[i:i + chunk_size] = polyline_distances(samples[i:i + chunk_size], candidates[i:i + chunk_size])
+
+    return result
+
+def spline_samples(curve, n):
+    # curve: points, including both vertices
+    return curves.spline(curve[0], curve[1:-1], curve[-1], np.linspace(0, 1, n))
+
+def resample(curve, tolerance, samples):
+    # the fewest points of curve that describe the same spline within tolerance;
+    # returns (indexes of kept points, deviation) or None
+    n = len(samples)
+    dp_tolerance = tolerance
+
+    for _ in range(max_iterations):
+        indexes = points.decimate(curve, dp_tolerance)
+        if len(indexes) == len(curve):
+            break
+
+        # both ways: the new spline must not wander away between original samples
+        deviation = curve_distance(samples, spline_samples(curve[indexes], n))
+
+        if deviation <= tolerance:
+            return indexes, deviation
+
+        dp_tolerance /= 2
+
+    return None
+
+class EdgeReport:
+    def __init__(self, block_index, vertex_indexes, n_before, n_after, edge_type, deviation):
+        self.block_index = block_index
+        self.vertex_indexes = vertex_indexes
+        self.n_before = n_before # spline points, without vertices
+        self.n_after = n_after
+        self.type = edge_type # of the new edge: 'spline', 'arc', 'line' or None if unchanged
+        self.deviation = deviation
+
+    def __str__(self):
+        change = 'kept' if self.type is None else f'{self.n_before} > {self.n_after} ({self.type})'
+        return f'block {self.block_index}, edge {self.vertex_indexes[0]}-{self.vertex_indexes[1]}: ' \
+            f'{change}, deviation {self.deviation:.3g}'
+
+def simplify(item, tolerance, arcs=True):
+    # replaces spline edges of item's blocks with arcs or shorter splines
+    # that deviate from the original less than tolerance;
+    # returns an EdgeReport for each spline edge
+    blocks = get_blocks(item)
+
+    # all spline edges: (block, edge, curve)
+    splines = []
+    for block in blocks:
+        for edge in block.edges:
+            if edge.type == 'spline':
+                curve = np.concatenate((
+                    [block.vertices[edge.block_index_1].point],
+                    np.asarray(edge.points, dtype=float).reshape(-1, 3),
+                    [block.vertices[edge.block_index_2].point]))
+
+                splines.append((block, edge, curve))
+
+    if not splines:
+        return []
+
+    sample_counts = np.array([max(n_samples, 4*len(curve)) for _, _, curve in splines])
+    samples = [spline_samples(curve, n) for (_, _, curve), n in zip(splines, sample_counts)]
+
+    line_deviations = np.empty(len(splines))
+    arc_deviations = np.full(len(splines), np.inf)
+
+    # all edges with the same number of samples at once
+    for n in np.unique(sample_counts):
+        group = np.flatnonzero(sample_counts == n)
+        group_samples = np.array([samples[i] for i in group])
+
+        # straight lines
+        line_deviations[group] = deviations(group_samples, group_samples[:, [0, -1]])
+
+        # and arcs through both vertices and the middle of the original
+        if arcs:
+            arc_points = curves.arc(group_samples[:, 0], group_samples[:, n//2], group_samples[:, -1], np.linspace(0, 1, n))
+            arc_deviations[group] = np.maximum(
+                deviations(group_samples, arc_points), deviations(arc_points, group_samples))
+
+    is_line = line_deviations <= tolerance
+    is_arc = (arc_deviations <= tolerance) & ~is_line
+
+    report = []
+    block_indexes = {id(block): i for i, block in enumerate(blocks)}
+
+    for i, (block, edge, curve) in enumerate(splines):
+        pair = (edge.block_index_1, edge.block_index_2)
+        n_before = len(curve) - 2
+
+        if is_line[i]:
+            new_points = None
+            result = (0, 'line', line_deviations[i])
+        elif is_arc[i]:
+            new_points = samples[i][sample_counts[i]//2]
+            result = (1, 'arc', arc_deviations[i])
+        else:
+            found = resample(curve, tolerance, samples[i])
+
+            if found is None:
+                result = None
+            else:
+                indexes, deviation = found
+                new_points = curve[indexes[1:-1]]
+                result = (len(new_points), 'spline', deviation)
+
+        if result is None:
+            report.append(EdgeReport(block_indexes[id(block)], pair, n_before, n_before, None, 0))
+            continue
+
+        block.edges = [e for e in block.edges if e is not edge]
+        if new_points is not None:
+            block.add_edge(*pair, new_points.tolist())
+
+        report.append(EdgeReport(block_indexes[id(block)], pair, n_before, result[0], result[1], float(result[2])))
+
+    return report
+
+def print_report(report, details=False):
+    if details:
+        for edge_report in report:
+            print(edge_report)
+
+    n_before = sum(r.n_before for r in report)
+    n_after = sum(r.n_after for r in report)
+    n_arcs = sum(1 for r in report if r.type == 'arc')
+    n_lines = sum(1 for r in report if r.type == 'line')
+    deviation = max((r.deviation for r in report), default=0)
+
+    print(f"Spline edges: {len(report)}, {n_arcs} replaced with arcs, {n_lines} with lines; "
+        f"points: {n_before} > {n_after}; max. deviation: {deviation:.3g}")
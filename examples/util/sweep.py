@@ -0,0 +1,115 @@
+import numpy as np
+
+from examples.util import functions as f
+from examples.util.blocks import get_blocks, block_points, axis_pairs
+
+# Exact edges for Elbows (and walls around them): blocks' edges along the sweep
+# are replaced with splines, sampled from sweep frames instead of arcs through
+# a single middle sketch.
+# An elbow's centreline is a circular arc so its rotation-minimizing frames
+# are simply rotations around the elbow's axis; rotation matrices for all samples
+# are calculated once per elbow and all edges are sampled at once.
+# Between frames, a point's offset (in the rotating frame) is interpolated
+# linearly from its position on the first sketch to its position on the second;
+# that is exact for elbows with constant radius and follows the same linear
+# change of radius as Elbow does for contracting/expanding ones
+# (where an arc through 3 points is only an approximation).
+# Note: interior points of outer faces are still interpolated from their edges
+# by blockMesh so the cross-section between sketches is not exactly circular;
+# the deviation grows with sweep angle and big elbows still have to be
+# split where that matters.
+
+# number of spline points on each edge
+n_edge_points = 10
+
+def frames(sweep_angle, rotation_axis, n_points):
+    # fractions of the sweep and (n_points, 3, 3) rotation matrices
+    # for samples between (and without) both sketches
+    t = np.linspace(0, 1, n_points + 2)[1:-1]
+    axes = np.tile(f.get_axis(rotation_axis), (n_points, 1))
+
+    return t, f.rotation_matrices(axes, sweep_angle*t)
+
+def sketch_planes(points, sweep_angle, arc_center, rotation_axis, tol=1e-6):
+    # (n, 3) > two boolean arrays: points on the first and on the second sketch's plane;
+    # all points of a swept block are on one of them; planes contain the rotation axis
+    axis = f.unit_vector(f.get_axis(rotation_axis))
+    relative = points - arc_center
+    radial = relative - np.outer(np.dot(relative, axis), axis)
+    distances = np.linalg.norm(radial, axis=1)
+    scale = np.max(np.linalg.norm(relative, axis=1))
+
+    # angles around the axis, measured from the first point
+    reference = radial[0]/distances[0]
+    angles = np.arctan2(np.dot(np.cross(reference, radial), axis), np.dot(radial, reference))
+
+    def near(angle):
+        difference = (angles - angle + np.pi) % (2*np.pi) - np.pi
+        return np.abs(difference)*distances < tol*scale
+
+    if np.any(near(sweep_angle)):
+        # the first point is on the first sketch
+        return near(0), near(sweep_angle)
+
+    return near(-sweep_angle), near(0)
+
+def sweep_edges(blocks, sweep_angle, arc_center, rotation_axis):
+    # [(block, start vertex index, end vertex index), ...] for all edges
+    # that go from the first sketch to the second
+    points = block_points(blocks)
+    on_1, on_2 = sketch_planes(points.reshape(-1, 3), sweep_angle, arc_center, rotation_axis)
+
+    on_1 = on_1.reshape(-1, 8)
+    on_2 = on_2.reshape(-1, 8)
+
+    pairs = np.array(axis_pairs)
+    edges = []
+
+    for i_block, block in enumerate(blocks):
+        found = False
+
+        for axis_pair in pairs:
+            forward = on_1[i_block, axis_pair[:, 0]] & on_2[i_block, axis_pair[:, 1]]
+            backward = on_2[i_block, axis_pair[:, 0]] & on_1[i_block, axis_pair[:, 1]]
+
+            if np.all(forward | backward):
+                for (i_1, i_2), fw in zip(axis_pair.tolist(), forward):
+                    edges.append((block, i_1, i_2) if fw else (block, i_2, i_1))
+                found = True
+                break
+
+        if not found:
+            raise ValueError(f"Block {i_block} doesn't span the sweep; check sweep angle, center and axis")
+
+    return edges
+
+def refine(item, sweep_angle, arc_center, rotation_axis, n_points=n_edge_points):
+    # replaces sweep edges of item's blocks (an Elbow, an ElbowWall or a list of them,
+    # all with the same sweep) with splines; returns the number of replaced edges
+    blocks = get_blocks(item)
+    arc_center = np.asarray(arc_center, dtype=float)
+
+    edges = sweep_edges(blocks, sweep_angle, arc_center, rotation_axis)
+    t, rotations = frames(sweep_angle, rotation_axis, n_points)
+
+    starts = np.array([block.vertices[i_1].point for block, i_1, _ in edges], dtype=float)
+    ends = np.array([block.vertices[i_2].point for block, _, i_2 in edges], dtype=float)
+
+    # offsets from arc center in the frame of the first sketch;
+    # v @ R rotates back: R^T = R^-1
+    offsets_1 = starts - arc_center
+    offsets_2 = np.dot(ends - arc_center, f.rotation_matrix(rotation_axis, sweep_angle))
+
+    # (n_edges, n_points, 3)
+    offsets = offsets_1[:, None]*(1 - t)[:, None] + offsets_2[:, None]*t[:, None]
+    samples = arc_center + np.einsum('nij,enj->eni', rotations, offsets)
+
+    for (block, i_1, i_2), edge_points in zip(edges, samples):
+        block.edges = [e for e in block.edges if {e.block_index_1, e.block_index_2} != {i_1, i_2}]
+
+        if i_1 < i_2:
+            block.add_edge(i_1, i_2, edge_points.tolist())
+        else:
+            block.add_edge(i_2, i_1, edge_points[::-1].tolist())
+
+    return len(edges)
@@ -0,0 +1,256 @@
+import os
+import re
+import hashlib
+import tempfile
+
+import numpy as np
+
+# blockMeshDict as a template: numbers that define geometry (vertex and edge
+# coordinates, gradings, geometry parameters) are separated from the structure
+# (block topology, cell counts, patches). When a new dictionary has the same
+# structure as the one already on disk, only changed numbers are
+# written to the file in place. Geometric numbers are always written
+# with fixed width so that their (byte) offsets never change.
+# The dictionary is parsed once; later variants are only split into
+# numbers and text between them and compared to the template.
+# Note: classy_blocks can only render a dictionary with Mesh.write()
+# so every variant is still rendered; what is saved is rewriting
+# (and re-reading) the whole file.
+
+token = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"[^"]*")
+    |(?P<number>(?<![\w.])[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))
+    |(?P<word>[A-Za-z_][\w.:<>]*)
+    |(?P<open>[({])
+    |(?P<close>[)}])
+""", re.VERBOSE | re.DOTALL)
+
+# any number, regardless of where it is
+number = re.compile(r'((?<![\w.])[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))')
+
+grading_keywords = ('simpleGrading', 'edgeGrading')
+
+def find_fields(text):
+    # returns (start, end, section) of every geometric number in text
+    fields = []
+
+    depth = 0
+    section = None
+    last_word = None
+
+    grading_pending = False
+    grading_depth = None
+
+    for match in token.finditer(text):
+        kind = match.lastgroup
+
+        if kind == 'word':
+            last_word = match.group()
+            if section == 'blocks' and last_word in grading_keywords:
+                grading_pending = True
+
+        elif kind == 'open':
+            if depth == 0:
+                section = last_word
+            if grading_pending:
+                grading_depth = depth
+                grading_pending = False
+
+            depth += 1
+
+        elif kind == 'close':
+            depth -= 1
+            if grading_depth is not None and depth == grading_depth:
+                grading_depth = None
+            if depth == 0:
+                section = None
+
+        elif kind == 'number':
+            if depth == 0:
+                # convertToMeters/scale
+                geometric = True
+            elif section == 'vertices' or section == 'geometry':
+                geometric = True
+            elif section == 'edges':
+                # vertex indexes are on the first level, points deeper
+                geometric = depth >= 2
+            elif section == 'blocks':
+                geometric = grading_depth is not None
+            else:
+                geometric = False
+
+            if geometric:
+                fields.append((match.start(), match.end(), section))
+
+    return fields
+
+class Template:
+    def __init__(self, text, precision=10):
+        fields = find_fields(text)
+
+        # structure: text between geometric fields
+        pieces = []
+        last = 0
+        for start, end, _ in fields:
+            pieces.append(text[last:start])
+            last = end
+        pieces.append(text[last:])
+
+        values = np.array([float(text[s:e]) for s, e, _ in fields])
+
+        self.set_parts(pieces, values, [f[2] for f in fields], precision)
+        self.set_mask(text, fields)
+
+    def set_mask(self, text, fields):
+        # which of all numbers in text are geometric; used by update()
+        starts = [m.start() for m in number.finditer(text)]
+        geometric = {start for start, _, _ in fields}
+
+        self.mask = np.array([s in geometric for s in starts], dtype=bool)
+        self.signature = None
+
+        if np.sum(self.mask) != len(fields):
+            # a geometric field that isn't a number on its own;
+            # can't happen with classy_blocks' output but update() wouldn't work
+            self.mask = None
+            return
+
+        self.signature = self.split(text)[0]
+
+    def split(self, text):
+        # (text without geometric numbers, geometric numbers)
+        parts = number.split(text)
+        numbers = parts[1::2]
+
+        if len(numbers) != len(self.mask):
+            return None, None
+
+        other = [n for n, m in zip(numbers, self.mask) if not m]
+        geometric = [n for n, m in zip(numbers, self.mask) if m]
+
+        return hashlib.sha1('\0'.join(parts[::2] + other).encode()).hexdigest(), geometric
+
+    def update(self, text):
+        # geometric values of text if it has the same structure, else None
+        if self.mask is None:
+            return None
+
+        signature, geometric = self.split(text)
+        if signature != self.signature:
+            return None
+
+        return np.array(geometric, dtype=float)
+
+    @classmethod
+    def from_parts(cls, pieces, values, field_sections, precision=10):
+        # a template from already separated structure and numbers
+        template = cls.__new__(cls)
+        template.set_parts(pieces, values, field_sections, precision)
+        template.mask = None
+
+        return template
+
+    def set_parts(self, pieces, values, field_sections, precision):
+        self.precision = precision
+        self.width = precision + 7 # sign, digit, dot, exponent
+
+        self.pieces = pieces
+        self.values = values
+        self.field_sections = field_sections
+
+        self.key = hashlib.sha1('\0'.join(self.pieces).encode()).hexdigest()
+
+        # byte offsets of fields in the rendered (fixed-width, utf-8) text
+        piece_lengths = np.array([len(p.encode()) for p in self.pieces[:-1]], dtype=np.int64)
+        self.offsets = np.cumsum(piece_lengths) + np.arange(len(piece_lengths))*self.width
+
+    def format(self, values):
+        # a space instead of '+': OpenFOAM reads a leading '+' as a separate token
+        return [f'{v: .{self.precision}e}' for v in values]
+
+    def render(self, values=None):
+        if values is None:
+            values = self.values
+
+        numbers = self.format(values)
+        parts = [None]*(2*len(self.pieces) - 1)
+        parts[::2] = self.pieces
+        parts[1::2] = numbers
+
+        return ''.join(parts)
+
+    def section(self, name):
+        # values of a given section (a view, not a copy)
+        indexes = [i for i, s in enumerate(self.field_sections) if s == name]
+        if not indexes:
+            return self.values[:0]
+
+        return self.values[indexes[0]:indexes[-1] + 1]
+
+def render_mesh(mesh, geometry=None):
+    # blockMeshDict, written by classy_blocks, as a string
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'blockMeshDict')
+        mesh.write(output_path=path, geometry=geometry, debug=False)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+class TemplateWriter:
+    def __init__(self, output_path, precision=10):
+        self.output_path = output_path
+        self.precision = precision
+
+        self.template = None
+        self.n_changed = 0 # number of numbers patched on last write
+
+    def write(self, mesh, geometry=None):
+        # writes blockMeshDict; returns True if topology has changed
+        # since last write (and the whole file had to be rewritten)
+        text = render_mesh(mesh, geometry)
+
+        if self.template is not None and os.path.exists(self.output_path):
+            values = self.template.update(text)
+
+            if values is not None and self.patch(values):
+                # only numbers were changed in place
+                return False
+
+        template = Template(text, self.precision)
+
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            f.write(template.render())
+
+        self.n_changed = len(template.values)
+
+        # a number that doesn't fit into fixed width would move
+        # all offsets after it; next write will have to start over
+        if any(len(n) != template.width for n in template.format(template.values)):
+            self.template = None
+        else:
+            self.template = template
+
+        return True
+
+    def patch(self, values):
+        # writes changed values into the file;
+        # returns False if file couldn't be patched in place
+        changed = np.nonzero(values != self.template.values)[0]
+
+        numbers = self.template.format(values[changed])
+        if any(len(n) != self.template.width for n in numbers):
+            # a huge exponent
+            return False
+
+        starts = self.template.offsets[changed]
+
+        with open(self.output_path, 'r+b') as f:
+            for start, n in zip(starts, numbers):
+                f.seek(start)
+                f.write(n.encode())
+
+        self.template.values = values
+        self.n_changed = len(changed)
+
+        return True
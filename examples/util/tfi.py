@@ -0,0 +1,161 @@
+import numpy as np
+
+from examples.util import curves
+from examples.util.blocks import axis_pairs
+
+# Transfinite interpolation of points inside a block from its 12 (curved) edges.
+
+def find_edge(block, index_1, index_2):
+    # returns block's edge between given vertices and
+    # whether it is defined in the opposite direction
+    for edge in block.edges:
+        if edge.block_index_1 == index_1 and edge.block_index_2 == index_2:
+            return edge, False
+
+        if edge.block_index_1 == index_2 and edge.block_index_2 == index_1:
+            return edge, True
+
+    return None, False
+
+def sample_edge(block, index_1, index_2, t):
+    # points on edge between block vertices index_1 and index_2; (len(t), 3)
+    point_1 = block.vertices[index_1].point
+    point_2 = block.vertices[index_2].point
+    edge, reverse = find_edge(block, index_1, index_2)
+
+    if edge is None or edge.type == 'project':
+        # projected edges are not known before blockMesh
+        return curves.line(point_1, point_2, t)[0]
+
+    if edge.type == 'arc':
+        return curves.arc(point_1, edge.points, point_2, t)[0]
+
+    points = np.asarray(edge.points, dtype=float)
+    if reverse:
+        points = points[::-1]
+
+    return curves.spline(point_1, points, point_2, t)
+
+def block_edges(block, params):
+    # points on all 12 edges;
+    # params: parameters along each axis, a list of 3 arrays;
+    # returns a list of 3 arrays of shape (4, len(params[axis]), 3)
+    return [
+        np.array([sample_edge(block, i_1, i_2, params[axis]) for i_1, i_2 in axis_pairs[axis]])
+        for axis in range(3)
+    ]
+
+def interpolate(edges, params):
+    # points inside a block from points on its edges (Gordon-Hall, edges only);
+    # edges: as returned by block_edges(), params: weights along each axis;
+    # returns an array of shape (n_0, n_1, n_2, 3)
+    u, v, w = [np.asarray(p, dtype=float) for p in params]
+    e_0, e_1, e_2 = edges
+
+    # block corners, see blocks.axis_pairs
+    corners = np.array([
+        e_0[0, 0], e_0[0, -1], e_0[1, -1], e_0[1, 0],
+        e_0[3, 0], e_0[3, -1], e_0[2, -1], e_0[2, 0]
+    ])
+
+    iu, iv, iw = 1 - u, 1 - v, 1 - w
+
+    # edges along axis 0: (v, w) = (0, 0), (1, 0), (1, 1), (0, 1)
+    result = \
+        np.einsum('j,k,id->ijkd', iv, iw, e_0[0]) + \
+        np.einsum('j,k,id->ijkd', v, iw, e_0[1]) + \
+        np.einsum('j,k,id->ijkd', v, w, e_0[2]) + \
+        np.einsum('j,k,id->ijkd', iv, w, e_0[3])
+
+    # edges along axis 1: (u, w) = (0, 0), (1, 0), (1, 1), (0, 1)
+    result += \
+        np.einsum('i,k,jd->ijkd', iu, iw, e_1[0]) + \
+        np.einsum('i,k,jd->ijkd', u, iw, e_1[1]) + \
+        np.einsum('i,k,jd->ijkd', u, w, e_1[2]) + \
+        np.einsum('i,k,jd->ijkd', iu, w, e_1[3])
+
+    # edges along axis 2: (u, v) = (0, 0), (1, 0), (1, 1), (0, 1)
+    result += \
+        np.einsum('i,j,kd->ijkd', iu, iv, e_2[0]) + \
+        np.einsum('i,j,kd->ijkd', u, iv, e_2[1]) + \
+        np.einsum('i,j,kd->ijkd', u, v, e_2[2]) + \
+        np.einsum('i,j,kd->ijkd', iu, v, e_2[3])
+
+    # each corner has been counted three times instead of once
+    weights = [
+        (iu, iv, iw), (u, iv, iw), (u, v, iw), (iu, v, iw),
+        (iu, iv, w), (u, iv, w), (u, v, w), (iu, v, w)
+    ]
+    for corner, (a, b, c) in zip(corners, weights):
+        result -= 2*np.einsum('i,j,k,d->ijkd', a, b, c, corner)
+
+    return result
+
+def block_grid(block, params):
+    # points of a block, sampled at given parameters along each axis
+    return interpolate(block_edges(block, params), params)
+
+def division_counts(divisions, count):
+    # normalized length ratios, cell counts and total expansions of divisions;
+    # divisions: [[length ratio, count ratio, total expansion], ...]
+    # (blockMesh multi-grading; ratios need not be normalized);
+    # counts are rounded as in blockMesh's lineDivide: each division gets
+    # its rounded share and the difference to count is added to (or taken from)
+    # the division with the largest count ratio (the first of equal ones)
+    divisions = np.asarray(divisions, dtype=float).reshape(-1, 3)
+    if len(divisions) == 0:
+        return np.ones(1), np.array([count]), np.ones(1)
+
+    lengths = divisions[:, 0]/np.sum(divisions[:, 0])
+    fractions = divisions[:, 1]/np.sum(divisions[:, 1])
+
+    counts = (fractions*count + 0.5).astype(int)
+    counts[np.argmax(fractions)] += count - np.sum(counts)
+
+    return lengths, counts, divisions[:, 2]
+
+def distribution(divisions, count):
+    # parameters (0...1) of count+1 points along an edge, calculated as in
+    # blockMesh's lineDivide; see division_counts() for divisions;
+    # with fewer cells than divisions, blockMesh ignores grading
+    if count < max(len(divisions), 1):
+        return np.linspace(0, 1, count + 1)
+
+    params = [np.zeros(1)]
+    start = 0
+
+    for length, n, expansion in zip(*division_counts(divisions, count)):
+        if n < 1:
+            # blockMesh skips the division and its length
+            continue
+
+        k = np.arange(1, n + 1)
+        if np.isclose(expansion, 1):
+            section = start + length*k/n
+        else:
+            g = expansion**(1/(n - 1)) if n > 1 else 0
+            section = start + length*(1 - g**k)/(1 - g**n)
+
+        params.append(section)
+        start = section[-1]
+
+    return np.concatenate(params)
+
+def block_params(block):
+    # parameters of points along each axis of a block;
+    # counts and gradings must be known (see blocks.prepare())
+    return [
+        distribution(block.grading[axis].divisions, int(block.grading[axis].count))
+        for axis in range(3)
+    ]
+
+def mesh_points(blocks):
+    # points of all blocks, a (n_0, n_1, n_2, 3) array for each block;
+    # projected faces and edges are not taken into account
+    grids = []
+
+    for block in blocks:
+        params = block_params(block)
+        grids.append(block_grid(block, params))
+
+    return grids
@@ -0,0 +1,166 @@
+import hashlib
+
+import numpy as np
+
+from examples.util.blocks import get_blocks, block_points, merge_points, axis_pairs, tolerance
+
+# Topology fingerprints: in a parametric sweep, all variants usually have the
+# same blocks, edges, patches and chops; only coordinates and grading numbers change.
+# A fingerprint is a hash of everything but numbers and structures that are
+# derived from topology are cached under it:
+# - a merged-vertex map (block vertex > unique point),
+# - axis groups: block axes that share edges and must have the same cell count,
+# - patch faces: [(block index, side), ...] for each patch.
+# A variant with a known fingerprint only gathers its coordinates;
+# the cached merge map is checked against them (points that were merged
+# must still coincide) and rebuilt if it doesn't fit.
+# Note: new coincident points in a variant (blocks that were apart
+# and now touch) are not detected without a full merge; use check=True.
+# Note: only the dry run (dryrun.py) and benchmark/topology.py use the cache;
+# Mesh.write() and parameter sweeps (shared.py, template.py, optimize.py)
+# still merge vertices and propagate counts in classy_blocks for every variant.
+
+# fingerprint > Topology
+cache = {}
+
+def block_structure(block):
+    edges = sorted((e.block_index_1, e.block_index_2, e.type) for e in block.edges)
+    patches = sorted((name, tuple(sorted(sides))) for name, sides in block.patches.items())
+    faces = sorted((side, str(name)) for side, name in getattr(block, 'faces', []))
+
+    # chop() keywords but not their values
+    chops = [[tuple(sorted(chop.keys())) for chop in axis_chops] for axis_chops in block.chops]
+
+    return (edges, patches, faces, chops, getattr(block, 'cell_zone', ''))
+
+def fingerprint(item):
+    blocks = get_blocks(item)
+    text = repr([block_structure(block) for block in blocks])
+
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def first_indexes(point_map, n_points):
+    # index of the first block vertex that maps to each unique point
+    first = np.empty(n_points, dtype=int)
+    first[point_map[::-1]] = np.arange(len(point_map))[::-1]
+
+    return first
+
+def axis_groups(point_map):
+    # point_map: (n_blocks, 8); returns (n_blocks, 3) group index of each block axis;
+    # axes are in the same group when they share an edge (union-find by
+    # label propagation with pointer jumping, vectorized)
+    n_blocks = len(point_map)
+
+    # (n_blocks, 3, 4, 2) point pairs of all edges
+    pairs = np.array(axis_pairs)
+    edges = np.sort(point_map[:, pairs], axis=-1).reshape(-1, 2)
+    _, edge_index = np.unique(edges, axis=0, return_inverse=True)
+    edge_index = edge_index.reshape(-1)
+
+    # node: block*3 + axis, one for each of its 4 edges
+    nodes = np.repeat(np.arange(n_blocks*3), 4)
+    labels = np.arange(n_blocks*3)
+
+    while True:
+        edge_labels = np.full(edge_index.max() + 1, len(labels))
+        np.minimum.at(edge_labels, edge_index, labels[nodes])
+
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, nodes, edge_labels[edge_index])
+
+        # labels are nodes of the same group; follow them to the root
+        while True:
+            jumped = new_labels[new_labels]
+            if np.array_equal(jumped, new_labels):
+                break
+            new_labels = jumped
+
+        if np.array_equal(new_labels, labels):
+            break
+
+        labels = new_labels
+
+    _, groups = np.unique(labels, return_inverse=True)
+
+    return groups.reshape(n_blocks, 3)
+
+class Topology:
+    def __init__(self, blocks, key=None, tol=tolerance):
+        self.key = key
+        self.n_blocks = len(blocks)
+
+        unique, point_map = merge_points(block_points(blocks), tol)
+        self.n_points = len(unique)
+        self.point_map = point_map.reshape(-1, 8)
+        self.first = first_indexes(point_map, self.n_points)
+
+        self.axis_groups = axis_groups(self.point_map)
+        self.n_groups = int(self.axis_groups.max()) + 1 if self.n_blocks else 0
+
+        self.patch_faces = {}
+        for i_block, block in enumerate(blocks):
+            for name, sides in block.patches.items():
+                self.patch_faces.setdefault(name, []).extend((i_block, side) for side in sides)
+
+    def points(self, blocks):
+        # unique points of a variant: only coordinates are gathered
+        return block_points(blocks).reshape(-1, 3)[self.first]
+
+    def fits(self, blocks, tol=tolerance):
+        # True if points, merged in the cached map, still coincide
+        points = block_points(blocks).reshape(-1, 3)
+        deviation = np.linalg.norm(points - points[self.first][self.point_map.reshape(-1)], axis=1)
+
+        return bool(np.all(deviation < tol))
+
+    def group_counts(self, counts):
+        # counts: (n_blocks, 3), -1 where not known (axis not chopped);
+        # returns (counts for all block axes, -1 where not known,
+        # groups where chopped axes don't agree)
+        counts = np.asarray(counts).reshape(-1)
+        groups = self.axis_groups.reshape(-1)
+        known = counts >= 0
+
+        group_counts = np.full(self.n_groups, -1)
+        group_counts[groups[known]] = counts[known]
+
+        conflicts = np.unique(groups[known][group_counts[groups[known]] != counts[known]])
+
+        return group_counts[self.axis_groups], conflicts
+
+    def propagate(self, counts):
+        # as group_counts() but all counts must be known and consistent
+        result, conflicts = self.group_counts(counts)
+
+        if len(conflicts) > 0:
+            raise ValueError("Inconsistent cell counts on blocks that share edges")
+
+        missing = np.argwhere(result < 0)
+        if len(missing) > 0:
+            i_block, axis = missing[0]
+            raise ValueError(f"Block {i_block} has no cell count on axis {axis} and no chopped neighbours")
+
+        return result
+
+def get(item, tol=tolerance, check=False):
+    # a Topology for item from cache or a new one;
+    # check: verify the cached map with a full merge
+    blocks = get_blocks(item)
+    key = fingerprint(blocks)
+
+    topology = cache.get(key)
+    if topology is not None and topology.fits(blocks, tol):
+        if not check:
+            return topology
+
+        # the same partition of block vertices, whatever the numbering
+        unique, point_map = merge_points(block_points(blocks), tol)
+        if len(unique) == topology.n_points and \
+                np.array_equal(point_map[topology.first][topology.point_map.reshape(-1)], point_map):
+            return topology
+
+    topology = Topology(blocks, key, tol)
+    cache[key] = topology
+
+    return topology
@@ -0,0 +1,151 @@
+import copy
+
+import numpy as np
+
+from examples.util.blocks import get_blocks
+from examples.util import functions as f
+
+# Affine transforms of shapes, operations, lists of those or whole meshes.
+# All block vertices and edge points (arc points, spline control points)
+# are collected into a single array and transformed with one matrix multiplication.
+# Only blocks are transformed; construction data like shapes' sketches and
+# operations' faces stays where it was so chain/expand/contract
+# must be done before transforming.
+
+# blocks' bottom and top faces are swapped when
+# a transform changes handedness (mirror)
+flip_map = (4, 5, 6, 7, 0, 1, 2, 3)
+flip_sides = {'bottom': 'top', 'top': 'bottom'}
+
+def translation(displacement):
+    matrix = np.eye(4)
+    matrix[:3, 3] = displacement
+
+    return matrix
+
+def rotation(axis, angle, origin=None):
+    # rotation around an arbitrary axis that goes through origin
+    return _around(f.rotation_matrix(axis, angle), origin)
+
+def scaling(ratio, origin=None):
+    return _around(np.eye(3)*ratio, origin)
+
+def mirror(normal, origin=None):
+    # reflection over a plane, given by normal and a point on it
+    normal = np.asarray(normal, dtype=float)
+    normal = normal/np.linalg.norm(normal)
+
+    return _around(np.eye(3) - 2*np.outer(normal, normal), origin)
+
+def combine(*matrices):
+    # a single matrix that applies given transforms in given order
+    matrix = np.eye(4)
+    for m in matrices:
+        matrix = np.dot(m, matrix)
+
+    return matrix
+
+def _around(r, origin):
+    # origin: None for the coordinate origin
+    origin = np.zeros(3) if origin is None else np.asarray(origin, dtype=float)
+
+    matrix = np.eye(4)
+    matrix[:3, :3] = r
+    matrix[:3, 3] = origin - np.dot(r, origin)
+
+    return matrix
+
+def collect(blocks):
+    # unique vertices and non-projected edges of given blocks;
+    # objects shared between blocks are only transformed once
+    vertices = {}
+    edges = {}
+
+    for block in blocks:
+        for vertex in block.vertices:
+            vertices[id(vertex)] = vertex
+
+        for edge in block.edges:
+            if edge.type != 'project':
+                edges[id(edge)] = edge
+
+    return list(vertices.values()), list(edges.values())
+
+def gather(vertices, edges):
+    # stacks all points into a (N, 3) array;
+    # returns the array and edge slices within it
+    edge_points = [np.asarray(e.points, dtype=float).reshape(-1, 3) for e in edges]
+
+    slices = []
+    start = len(vertices)
+    for p in edge_points:
+        slices.append(slice(start, start + len(p)))
+        start += len(p)
+
+    points = np.concatenate([
+        np.array([v.point for v in vertices], dtype=float).reshape(-1, 3)] + edge_points)
+
+    return points, slices
+
+def scatter(points, vertices, edges, slices):
+    # the inverse of gather(): assigns points back to vertices and edges
+    for i, vertex in enumerate(vertices):
+        vertex.point = points[i]
+
+    for edge, s in zip(edges, slices):
+        if edge.type == 'arc':
+            edge.points = points[s][0]
+        else:
+            edge.points = points[s]
+
+def apply(matrix, points):
+    return np.dot(points, matrix[:3, :3].T) + matrix[:3, 3]
+
+def flip(block):
+    # swap bottom and top faces of a block so that it stays right-handed
+    block.vertices = [block.vertices[i] for i in flip_map]
+
+    for edge in block.edges:
+        edge.block_index_1 = flip_map[edge.block_index_1]
+        edge.block_index_2 = flip_map[edge.block_index_2]
+
+    for name, sides in block.patches.items():
+        block.patches[name] = [flip_sides.get(side, side) for side in sides]
+
+    for face in block.faces:
+        face[0] = flip_sides.get(face[0], face[0])
+
+    # axis 2 now points the other way
+    for chop in block.chops[2]:
+        chop['invert'] = not chop.get('invert', False)
+
+def transform(item, matrix):
+    # transforms given item in place and returns it
+    blocks = get_blocks(item)
+    vertices, edges = collect(blocks)
+
+    points, slices = gather(vertices, edges)
+    scatter(apply(matrix, points), vertices, edges, slices)
+
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        for block in blocks:
+            flip(block)
+
+    return item
+
+def transformed(item, matrix):
+    # a transformed copy; the original item is left intact
+    return transform(copy.deepcopy(item), matrix)
+
+# shortcuts
+def translate(item, displacement):
+    return transform(item, translation(displacement))
+
+def rotate(item, axis, angle, origin=None):
+    return transform(item, rotation(axis, angle, origin))
+
+def scale(item, ratio, origin=None):
+    return transform(item, scaling(ratio, origin))
+
+def reflect(item, normal, origin=None):
+    return transform(item, mirror(normal, origin))
@@ -0,0 +1,156 @@
+import numpy as np
+
+from examples.util import curves, tfi
+from examples.util.blocks import get_blocks, block_points, merge_points
+
+# A quick preview of blocking without blockMesh:
+# blocks, curved edges and patches are written to a binary legacy VTK file
+# that can be opened with ParaView.
+
+# VTK cell types
+VTK_POLY_LINE = 4
+VTK_QUAD = 9
+VTK_HEXAHEDRON = 12
+
+# values of 'kind' cell data
+KIND_BLOCK = 0
+KIND_EDGE = 1
+KIND_PATCH = 2
+KIND_INTERIOR = 3
+
+def write(path, points, cells, cell_types, cell_data=None, title='classy_blocks preview'):
+    # points: (n, 3)
+    # cells: a list of point index lists
+    # cell_types: VTK type for each cell
+    # cell_data: {name: an integer for each cell} or None
+    points = np.asarray(points, dtype='>f4').reshape(-1, 3)
+    sizes = np.array([len(c) for c in cells], dtype=np.int64)
+    connectivity = np.empty(len(cells) + np.sum(sizes), dtype='>i4')
+
+    # each cell is written as [n_points, index_1, index_2, ...]
+    starts = np.concatenate(([0], np.cumsum(sizes + 1)[:-1]))
+    is_index = np.ones(len(connectivity), dtype=bool)
+    is_index[starts] = False
+
+    connectivity[starts] = sizes
+    connectivity[is_index] = np.concatenate(cells)
+
+    with open(path, 'wb') as f:
+        f.write(b'# vtk DataFile Version 3.0\n')
+        f.write(title[:255].encode('ascii', 'replace') + b'\n')
+        f.write(b'BINARY\nDATASET UNSTRUCTURED_GRID\n')
+
+        f.write(f'POINTS {len(points)} float\n'.encode())
+        f.write(points.tobytes() + b'\n')
+
+        f.write(f'CELLS {len(cells)} {len(connectivity)}\n'.encode())
+        f.write(connectivity.tobytes() + b'\n')
+
+        f.write(f'CELL_TYPES {len(cells)}\n'.encode())
+        f.write(np.asarray(cell_types, dtype='>i4').tobytes() + b'\n')
+
+        if cell_data:
+            f.write(f'CELL_DATA {len(cells)}\n'.encode())
+
+            for name, values in cell_data.items():
+                f.write(f'SCALARS {name} int 1\nLOOKUP_TABLE default\n'.encode())
+                f.write(np.asarray(values, dtype='>i4').tobytes() + b'\n')
+
+def write_mesh(path, item, n_samples=10, interior=0):
+    # item: a Mesh or anything else with blocks;
+    # n_samples: number of points on each curved edge;
+    # interior: if > 1, also add a coarse grid of interior x interior x interior
+    #   points in every block, interpolated from edges
+    blocks = get_blocks(item)
+    corners = block_points(blocks)
+    vertices, indexes = merge_points(corners)
+    indexes = indexes.reshape(-1, 8)
+
+    points = [vertices]
+    n_points = len(vertices)
+
+    cells = []
+    types = []
+    kind = []
+    block_index = []
+    patch_index = []
+
+    def add_cells(new_cells, cell_type, cell_kind, i_block, i_patch=-1):
+        cells.extend(new_cells)
+        n = len(new_cells)
+        types.extend([cell_type]*n)
+        kind.extend([cell_kind]*n)
+        block_index.extend(np.broadcast_to(i_block, (n,)))
+        patch_index.extend([i_patch]*n)
+
+    # blocks
+    add_cells(list(indexes), VTK_HEXAHEDRON, KIND_BLOCK, np.arange(len(blocks)))
+
+    # curved edges; arcs first, all at once
+    t = np.linspace(0, 1, n_samples)
+    arcs = []
+    splines = []
+    seen = set()
+
+    for i_block, block in enumerate(blocks):
+        for edge in block.edges:
+            if edge.type == 'project':
+                continue
+
+            key = tuple(sorted((indexes[i_block][edge.block_index_1], indexes[i_block][edge.block_index_2])))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            p_1 = block.vertices[edge.block_index_1].point
+            p_2 = block.vertices[edge.block_index_2].point
+
+            if edge.type == 'arc':
+                arcs.append((i_block, p_1, edge.points, p_2))
+            else:
+                splines.append((i_block, curves.spline(p_1, edge.points, p_2, t)))
+
+    if arcs:
+        arc_points = curves.arc(
+            [a[1] for a in arcs], [a[2] for a in arcs], [a[3] for a in arcs], t)
+        splines = [(a[0], p) for a, p in zip(arcs, arc_points)] + splines
+
+    for i_block, edge_points in splines:
+        points.append(edge_points)
+        add_cells([np.arange(n_points, n_points + len(edge_points))], VTK_POLY_LINE, KIND_EDGE, i_block)
+        n_points += len(edge_points)
+
+    # patches
+    patch_names = []
+    for i_block, block in enumerate(blocks):
+        for name, sides in block.patches.items():
+            if name not in patch_names:
+                patch_names.append(name)
+
+            faces = [indexes[i_block][list(block.face_map[side])] for side in sides]
+            add_cells(faces, VTK_QUAD, KIND_PATCH, i_block, patch_names.index(name))
+
+    # a coarse interior grid
+    if interior > 1:
+        params = [np.linspace(0, 1, interior)]*3
+        grid = np.arange(interior**3).reshape(interior, interior, interior)
+        # local hexahedra, the same for every block
+        hexes = np.stack([
+            grid[:-1, :-1, :-1], grid[1:, :-1, :-1], grid[1:, 1:, :-1], grid[:-1, 1:, :-1],
+            grid[:-1, :-1, 1:], grid[1:, :-1, 1:], grid[1:, 1:, 1:], grid[:-1, 1:, 1:],
+        ], axis=-1).reshape(-1, 8)
+
+        for i_block, block in enumerate(blocks):
+            points.append(tfi.block_grid(block, params).reshape(-1, 3))
+            add_cells(list(hexes + n_points), VTK_HEXAHEDRON, KIND_INTERIOR, i_block)
+            n_points += interior**3
+
+    title = 'classy_blocks preview; patches: ' + ' '.join(f'{i}={n}' for i, n in enumerate(patch_names))
+
+    write(path, np.concatenate(points), cells, types, {
+        'kind': kind,
+        'block': block_index,
+        'patch': patch_index,
+    }, title)
+
+    return patch_names
@@ -0,0 +1,65 @@
+import numpy as np
+
+from classy_blocks.classes.shapes import Cylinder, Frustum, Elbow, ExtrudedRing
+from classy_blocks.classes.walls import ElbowWall, FrustumWall
+
+# Wall layers around a whole chain of shapes: every shape is expanded
+# with a wall class that matches its own; layers are stacked one onto another.
+
+# a class of wall that can be expanded from a given shape class
+wall_classes = {
+    Cylinder: ExtrudedRing,
+    ExtrudedRing: ExtrudedRing,
+    Frustum: FrustumWall,
+    FrustumWall: FrustumWall,
+    Elbow: ElbowWall,
+    ElbowWall: ElbowWall,
+}
+
+def get_wall_class(shape):
+    # the most specific class wins (ElbowWall over Elbow)
+    for cls in type(shape).__mro__:
+        if cls in wall_classes:
+            return wall_classes[cls]
+
+    raise TypeError(f"Can't create a wall around {type(shape).__name__}")
+
+def add_walls(shapes, thicknesses, cell_zones=None, radial_chops=None):
+    # shapes: a chain of shapes, typically fluid
+    # thicknesses: a thickness of each layer, the innermost first
+    # cell_zones: a cell zone name for each layer (or None for no zone)
+    # radial_chops: chop_radial() keyword arguments for each layer (or None);
+    #   only the first shape in a layer is chopped and the count is then
+    #   propagated along the chain; axial and tangential counts are copied
+    #   from the shapes inside
+    # returns a list of layers, each a list of shapes
+    thicknesses = np.atleast_1d(thicknesses)
+    n_layers = len(thicknesses)
+
+    if cell_zones is None or isinstance(cell_zones, str):
+        cell_zones = [cell_zones]*n_layers
+
+    if radial_chops is None or isinstance(radial_chops, dict):
+        radial_chops = [radial_chops]*n_layers
+
+    if len(cell_zones) != n_layers or len(radial_chops) != n_layers:
+        raise ValueError(f"Expected {n_layers} cell zones and radial chops (one for each layer), "
+            f"got {len(cell_zones)} and {len(radial_chops)}")
+
+    layers = []
+    source = shapes
+
+    for thickness, zone, chop in zip(thicknesses, cell_zones, radial_chops):
+        layer = [get_wall_class(s).expand(s, thickness) for s in source]
+
+        if zone is not None:
+            for s in layer:
+                s.set_cell_zone(zone)
+
+        if chop is not None:
+            layer[0].chop_radial(**chop)
+
+        layers.append(layer)
+        source = layer
+
+    return layers
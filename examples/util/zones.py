@@ -0,0 +1,135 @@
+import numpy as np
+
+from examples.util.blocks import get_blocks, block_points, merge_points
+
+# Patches and cell zones as indexed tables: instead of dozens of
+# set_*_patch() and set_cell_zone() calls on separate shapes, block faces
+# and blocks are selected in bulk with predicates on their centers
+# ('all boundary faces with x > 0.1') and assigned with a single array write.
+# Each face belongs to one patch and each block to one zone so lookups are
+# plain indexing; apply() writes tables back to blocks for Mesh.write().
+# Block faces are numbered i_block*6 + i_side.
+
+sides = ('left', 'right', 'front', 'back', 'bottom', 'top')
+
+class Tables:
+    def __init__(self, item):
+        # item: a Mesh or anything else with blocks;
+        # patches and zones already set on blocks are taken over
+        self.blocks = get_blocks(item)
+        n_blocks = len(self.blocks)
+
+        points = block_points(self.blocks)
+        self.block_centers = np.mean(points, axis=1)
+
+        face_points = np.stack([points[:, list(self.blocks[0].face_map[side])] for side in sides], axis=1)
+        self.face_centers = np.mean(face_points, axis=2).reshape(-1, 3)
+
+        # normals from face diagonals, pointing away from the block
+        normals = np.cross(
+            face_points[:, :, 2] - face_points[:, :, 0],
+            face_points[:, :, 3] - face_points[:, :, 1]).reshape(-1, 3)
+        outward = self.face_centers - np.repeat(self.block_centers, 6, axis=0)
+        normals[np.sum(normals*outward, axis=1) < 0] *= -1
+        self.face_normals = normals/np.linalg.norm(normals, axis=1)[:, None]
+
+        # faces that are not shared with another block
+        _, face_map = merge_points(self.face_centers, 1e-6*np.max(np.ptp(points.reshape(-1, 3), axis=0)))
+        self.boundary = np.bincount(face_map)[face_map] == 1
+
+        # tables: names and an index into names for each face/block (-1 for none)
+        self.patch_names = []
+        self.face_patch = np.full(n_blocks*6, -1)
+
+        self.zone_names = []
+        self.block_zone = np.full(n_blocks, -1)
+
+        for i_block, block in enumerate(self.blocks):
+            for name, block_sides in block.patches.items():
+                for side in block_sides:
+                    self.face_patch[i_block*6 + sides.index(side)] = self.patch_index(name)
+
+            zone = getattr(block, 'cell_zone', '')
+            if zone:
+                self.block_zone[i_block] = self.zone_index(zone)
+
+    @staticmethod
+    def index(names, name):
+        if name not in names:
+            names.append(name)
+
+        return names.index(name)
+
+    def patch_index(self, name):
+        return self.index(self.patch_names, name)
+
+    def zone_index(self, name):
+        return self.index(self.zone_names, name)
+
+    def select_faces(self, predicate=None, boundary=True, blocks=None, block_sides=None):
+        # indexes of faces where predicate(centers, normals) is True;
+        # blocks: limit selection to these block indexes,
+        # block_sides: to these sides ('top', 'outer' is not a block side)
+        selected = self.boundary.copy() if boundary else np.ones(len(self.face_centers), dtype=bool)
+
+        if blocks is not None:
+            in_blocks = np.zeros(len(self.blocks), dtype=bool)
+            in_blocks[blocks] = True
+            selected &= np.repeat(in_blocks, 6)
+
+        if block_sides is not None:
+            selected &= np.tile(np.isin(sides, block_sides), len(self.blocks))
+
+        if predicate is not None:
+            selected &= np.asarray(predicate(self.face_centers, self.face_normals), dtype=bool)
+
+        return np.flatnonzero(selected)
+
+    def select_blocks(self, predicate):
+        # indexes of blocks where predicate(centers) is True
+        return np.flatnonzero(np.asarray(predicate(self.block_centers), dtype=bool))
+
+    def set_patch(self, name, faces):
+        # faces: indexes from select_faces(); faces are removed from their previous patch
+        self.face_patch[faces] = self.patch_index(name)
+
+    def set_cell_zone(self, name, blocks):
+        # blocks: indexes from select_blocks()
+        self.block_zone[blocks] = self.zone_index(name)
+
+    def patch_faces(self, name):
+        if name not in self.patch_names:
+            return np.array([], dtype=int)
+
+        return np.flatnonzero(self.face_patch == self.patch_names.index(name))
+
+    def zone_blocks(self, name):
+        if name not in self.zone_names:
+            return np.array([], dtype=int)
+
+        return np.flatnonzero(self.block_zone == self.zone_names.index(name))
+
+    def apply(self):
+        # writes tables to blocks
+        for i_block, block in enumerate(self.blocks):
+            block.patches = {}
+
+            for i_side in np.flatnonzero(self.face_patch[i_block*6:(i_block + 1)*6] >= 0):
+                name = self.patch_names[self.face_patch[i_block*6 + i_side]]
+                block.patches.setdefault(name, []).append(sides[i_side])
+
+            i_zone = self.block_zone[i_block]
+            block.cell_zone = self.zone_names[i_zone] if i_zone >= 0 else ''
+
+def zone_cells(blocks, block_offsets):
+    # {zone name: indexes of cells} from blocks' cell zones;
+    # block_offsets: index of each block's first cell and the total number of cells,
+    # cells of each block are numbered consecutively as with blockMesh
+    cells = {}
+
+    for i_block, block in enumerate(blocks):
+        zone = getattr(block, 'cell_zone', '')
+        if zone:
+            cells.setdefault(zone, []).append(np.arange(block_offsets[i_block], block_offsets[i_block + 1]))
+
+    return {name: np.concatenate(ranges) for name, ranges in cells.items()}
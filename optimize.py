@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# Tunes module-level parameters of an example for block quality within
+# a cell budget; see examples/util/optimize.py. For instance:
+#   python optimize.py examples.chaining.venturi_tube --parameter fillet_radius 0.05 0.3 \
+#       --limit n_cells 200000 --processes 4 --checkpoint case/optimize.json
+# An interrupted run continues from its checkpoint when started again.
+import argparse
+
+from examples.util.optimize import Optimizer, weighted_cost
+
+parser = argparse.ArgumentParser()
+parser.add_argument('example', help="module of an example, for instance examples.advanced.sphere")
+parser.add_argument('--parameter', nargs=3, action='append', required=True, metavar=('NAME', 'LOW', 'HIGH'),
+    help="a module-level parameter and its bounds; can be given many times")
+parser.add_argument('--weight', nargs=2, action='append', default=[], metavar=('METRIC', 'WEIGHT'),
+    help="metrics to minimize (angle_deviation, aspect_ratio, size_ratio, n_cells); "
+        "default: angle_deviation 1")
+parser.add_argument('--limit', nargs=2, action='append', default=[], metavar=('METRIC', 'LIMIT'),
+    help="upper limit of a metric, for instance n_cells 200000")
+parser.add_argument('--processes', type=int, default=1, help="evaluate candidates in this many processes")
+parser.add_argument('--evaluations', type=int, default=500, help="maximum number of evaluations")
+parser.add_argument('--checkpoint', default=None, help="save state to this file after every step")
+args = parser.parse_args()
+
+bounds = {name: (float(low), float(high)) for name, low, high in args.parameter}
+weights = {metric: float(weight) for metric, weight in args.weight} or {'angle_deviation': 1}
+limits = {metric: float(limit) for metric, limit in args.limit}
+
+optimizer = Optimizer(args.example, bounds, weighted_cost(weights, limits),
+    n_processes=args.processes, checkpoint=args.checkpoint)
+
+parameters, metrics = optimizer.run(max_evaluations=args.evaluations)
+
+print("Best parameters:")
+for name, value in parameters.items():
+    print(f"  {name} = {value:.6g}")
+
+print("Metrics:")
+for key, value in metrics.items():
+    print(f"  {key}: {value}")
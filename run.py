@@ -1,5 +1,11 @@
 #!/usr/bin/env python
 import os
+import sys
+import copy
+import argparse
+import importlib
+
+from examples.util import vtk, polymesh, profiler, axisymmetric, simplify, dryrun, modules
 
 # uncomment the example you wish to run
 
@@ -28,9 +34,11 @@ import os
 from examples.chaining import tank as example
 # from examples.chaining import test_tube as example
 # from examples.chaining import venturi_tube as example
+# from examples.chaining import venturi_wedge as example # axisymmetric
 # from examples.chaining import orifice_plate as example
 # from examples.chaining import flywheel as example
 # from examples.chaining import coriolis_flowmeter as example
+# from examples.chaining import piping as example
 
 # complex cases
 # from examples.complex import helmholtz_nozzle as example
@@ -40,16 +48,77 @@ from examples.chaining import tank as example
 # from examples.advanced import project as example # projection to STL surface
 # from examples.advanced import sphere as example # flow around sphere
 # from examples.advanced import merged as example
+# from examples.advanced import rotor as example # circular pattern of passages
 
 # objects
 #from examples.objects import t_pipe as example
 
-try:
-    geometry = example.geometry
-except:
-    geometry = None
+# synthetic stress cases; see benchmark/scaling.py
+# from examples.stress import lattice as example
+# from examples.stress import chain as example
+# from examples.stress import bundle as example
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--preview', action='store_true',
+    help="write blocking to case/preview.vtk instead of running blockMesh")
+parser.add_argument('--interior', type=int, default=0,
+    help="with --preview, also sample N x N x N points inside each block")
+parser.add_argument('--python', action='store_true',
+    help="write polyMesh with a python mesher instead of blockMesh (projections are ignored)")
+parser.add_argument('--compare', action='store_true',
+    help="run blockMesh and compare its points with the python mesher's")
+parser.add_argument('--profile', action='store_true',
+    help="profile get_mesh() and mesh.write() instead of running blockMesh; "
+        "prints hotspots and writes collapsed stacks to case/profile.collapsed")
+parser.add_argument('--examples', nargs='+', default=[],
+    help="with --profile, modules of examples to profile together, "
+        "for instance examples.chaining.tank examples.complex.karman")
+parser.add_argument('--wedge', action='store_true',
+    help="mesh an axisymmetric example (one with get_shapes()) with a single layer of wedges")
+parser.add_argument('--zones', action='store_true',
+    help="write cellZones from blocks after blockMesh instead of running setsToZones")
+parser.add_argument('--simplify', type=float, default=None, metavar='TOLERANCE',
+    help="replace spline edges with arcs, lines or splines with fewer points "
+        "that deviate from the original less than TOLERANCE")
+parser.add_argument('--dry-run', action='store_true',
+    help="only estimate cell count and check blocking; nothing is written")
+args = parser.parse_args()
+
+if args.profile:
+    profiled = [importlib.import_module(name) for name in args.examples] or [example]
+    profiler.profile_examples(profiled, os.path.join('case', 'profile.collapsed'))
+    sys.exit()
+
+geometry = modules.geometry(example)
 
 mesh = example.get_mesh()
 
-mesh.write(output_path=os.path.join('case', 'system', 'blockMeshDict'), geometry=geometry, debug=False)
-os.system("case/Allrun.mesh")
+if args.wedge:
+    mesh = axisymmetric.reduce(example.get_shapes(), polymesh.default_patch(mesh))
+
+if args.simplify is not None:
+    simplify.print_report(simplify.simplify(mesh, args.simplify))
+
+if args.dry_run:
+    dryrun.DryRun(mesh).report()
+    sys.exit()
+
+if args.preview:
+    vtk.write_mesh(os.path.join('case', 'preview.vtk'), mesh, interior=args.interior)
+elif args.python:
+    polymesh.write_mesh(mesh, 'case')
+else:
+    # the python mesher must work on its own copy
+    python_mesh = copy.deepcopy(mesh) if args.compare else None
+
+    mesh.write(output_path=os.path.join('case', 'system', 'blockMeshDict'), geometry=geometry, debug=False)
+    if args.zones:
+        os.system("case/Allrun.mesh -noSetsToZones")
+        polymesh.write_zones(mesh, 'case')
+    else:
+        os.system("case/Allrun.mesh")
+
+    if args.compare:
+        points = polymesh.PolyMesh(python_mesh).points
+        deviation = polymesh.compare(points, os.path.join('case', 'constant', 'polyMesh', 'points'))
+        print(f"Maximum deviation from blockMesh points: {deviation}")
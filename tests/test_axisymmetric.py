@@ -0,0 +1,73 @@
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util.axisymmetric import Section
+
+# a ring around the x axis, 0 < x < 3, in two radial layers
+# of 4 blocks: 1 < r < 1.5 and 1.5 < r < 2
+x = (0, 3)
+layers = (1, 1.5, 2)
+angles = np.linspace(0, 2*np.pi, 5)
+
+def grading(count, divisions=()):
+    # as left by prepare(mesh)
+    return types.SimpleNamespace(count=count, divisions=list(divisions))
+
+def sector_block(r, theta, radial_grading, inward):
+    # block axes: 0 along x, 1 radial (inwards if inward), 2 tangential
+    if inward:
+        r = r[::-1]
+
+    points = [
+        [x[i], r[j]*np.cos(t), r[j]*np.sin(t)]
+        for t in theta for i, j in ((0, 0), (1, 0), (1, 1), (0, 1))
+    ]
+
+    block = Block.create_from_points(points)
+    block.grading = [grading(6, [[1, 1, 2], [1, 1, 0.5]]), radial_grading, grading(5)]
+    block.set_patch('left', 'inlet')
+    block.set_patch('right', 'outlet')
+    # the first radial face is on the inside or outside of the ring
+    block.set_patch('front', 'outer' if inward else 'inner')
+
+    return block
+
+def make_ring():
+    blocks = []
+    for i in range(4):
+        theta = angles[i:i + 2]
+        blocks.append(sector_block(layers[:2], theta, grading(2), False))
+        # the outer layer's radial axis points inwards
+        blocks.append(sector_block(layers[1:], theta, grading(4, [[1, 1, 3]]), True))
+
+    return types.SimpleNamespace(blocks=blocks)
+
+def test_section():
+    section = Section(make_ring(), np.zeros(3), np.array([1., 0, 0]))
+
+    assert (section.start, section.end) == (0, 3)
+    np.testing.assert_allclose(section.inner, [1, 1])
+    np.testing.assert_allclose(section.outer, [2, 2])
+    assert section.mid is None
+
+    assert section.axial_divisions == [(0.5, 3, 2), (0.5, 3, 0.5)]
+    # inner layer, then outer, with grading turned outwards
+    assert section.radial_divisions == [(0.5, 2, 1), (0.5, 4, pytest.approx(1/3))]
+    assert section.n_cells == 6*6
+
+    assert section.patches == {'left': 'inlet', 'right': 'outlet', 'inner': 'inner', 'outer': 'outer'}
+
+def test_section_axis_direction():
+    # the same ring, seen along -x: start and end swap, axial grading reverses
+    section = Section(make_ring(), np.array([3., 0, 0]), np.array([-1., 0, 0]))
+
+    assert (section.start, section.end) == (0, 3)
+    assert section.axial_divisions == [(0.5, 3, 2), (0.5, 3, 0.5)]
+    assert section.patches['left'] == 'outlet'
+    assert section.patches['right'] == 'inlet'
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util.blocks import merge_points
+
+def test_merge_same_bucket():
+    points = [[0, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 0]]
+    unique, point_map = merge_points(points, 1e-3)
+
+    assert len(unique) == 2
+    assert point_map[0] == point_map[2]
+    assert point_map[1] == point_map[3]
+
+def test_merge_across_bucket_boundary():
+    # both points are a round-off away from a rounding boundary, on its opposite sides
+    tol = 1e-3
+    boundary = 0.5*tol
+    points = [[boundary - 1e-15, 0, 0], [boundary + 1e-15, 0, 0], [0, boundary + 1e-15, boundary - 1e-15]]
+    unique, point_map = merge_points(points, tol)
+
+    assert len(unique) == 1
+    assert np.all(point_map == 0)
+
+def test_keep_distant_points():
+    points = np.random.default_rng(0).random((1000, 3))
+    unique, point_map = merge_points(np.concatenate((points, points + 1e-12)), 1e-7)
+
+    assert len(unique) == 1000
+    np.testing.assert_allclose(unique[point_map], np.concatenate((points, points)), atol=1e-11)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util.dryrun import DryRun
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def check(points):
+    block = Block.create_from_points(points)
+    for axis in range(3):
+        block.chop(axis, count=2)
+
+    return DryRun(block).issues
+
+def test_box():
+    assert check(corners) == []
+
+def test_wedge():
+    # as made by axisymmetric.reduce(): edges on the axis (x) are collapsed
+    points = corners.copy()
+    points[[0, 1, 4, 5], 1:] = 0
+    points[[2, 3], 2] = -0.05
+    points[[6, 7], 2] = 0.05
+
+    assert check(points) == []
+
+def test_inverted():
+    points = corners.copy()
+    points[:, 2] *= -1
+
+    assert check(points) == ["Block 0 is inverted"]
+
+def test_flat():
+    points = corners.copy()
+    points[4:, 2] = 0
+
+    assert check(points) == ["Block 0 is degenerate"]
+
+def test_size_ratio_between_neighbours():
+    # two unit blocks next to each other along x, with 2 and 4 cells along x
+    blocks = [Block.create_from_points(corners + [i, 0, 0]) for i in range(2)]
+    for block, count in zip(blocks, (2, 4)):
+        block.chop(0, count=count)
+        block.chop(1, count=4)
+        block.chop(2, count=4)
+
+    metrics = DryRun(blocks).quality()
+
+    assert metrics['valid']
+    assert metrics['n_cells'] == 2*4*4 + 4*4*4
+    np.testing.assert_allclose(metrics['size_ratio'], 2)
+    np.testing.assert_allclose(metrics['aspect_ratio'], 2)
+    np.testing.assert_allclose(metrics['angle_deviation'], 0, atol=1e-9)
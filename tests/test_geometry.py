@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util import geometry
+
+def test_sphere_center():
+    sphere = geometry.Sphere('sphere', [1, 0, 0], 2)
+    points = sphere.closest([[1, 0, 0], [1, 0, 5]])
+
+    assert np.all(np.isfinite(points))
+    np.testing.assert_allclose(np.linalg.norm(points - [1, 0, 0], axis=1), 2)
+    np.testing.assert_allclose(points[1], [1, 0, 2])
+
+def test_cylinder_axis():
+    cylinder = geometry.Cylinder('cylinder', [0, 0, 0], [1, 1, 0], 0.5)
+    points = cylinder.closest([[2, 2, 0], [0.5, 0.5, 0], [1, 0, 3]])
+
+    assert np.all(np.isfinite(points))
+    # all on the cylinder, at the same axial position
+    axial = np.dot(points, cylinder.axis)
+    np.testing.assert_allclose(axial, [2*2**0.5, 2**0.5/2, 2**0.5/2])
+    radial = points - np.outer(axial, cylinder.axis)
+    np.testing.assert_allclose(np.linalg.norm(radial, axis=1), 0.5)
+
+def write_stl(path, triangles):
+    with open(path, 'w') as f:
+        f.write('solid test\n')
+        for triangle in triangles:
+            f.write('facet normal 0 0 1\nouter loop\n')
+            for point in triangle:
+                f.write(f'vertex {point[0]} {point[1]} {point[2]}\n')
+            f.write('endloop\nendfacet\n')
+        f.write('endsolid test\n')
+
+def test_trisurface(tmp_path, monkeypatch):
+    # a wavy surface of 2*8*8 triangles
+    x, y = np.meshgrid(np.linspace(0, 1, 9), np.linspace(0, 1, 9), indexing='ij')
+    grid = np.stack((x, y, 0.1*np.sin(4*x)*np.cos(3*y)), axis=-1)
+    quads = np.stack((grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]), axis=2).reshape(-1, 4, 3)
+    triangles = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+    write_stl(os.path.join(tmp_path, 'wave.stl'), triangles)
+
+    monkeypatch.setattr(geometry, 'cache_directory', os.path.join(tmp_path, 'cache'))
+    # a few points per chunk
+    monkeypatch.setattr(geometry, 'chunk_elements', 3*len(triangles))
+
+    surface = geometry.TriSurface('wave', 'wave.stl', directory=tmp_path)
+    # nothing is read before the first query
+    assert surface.hash is None
+    assert surface.n_facets == len(triangles)
+    assert os.listdir(os.path.join(tmp_path, 'cache'))
+
+    # points inside and outside the search grid
+    points = np.random.default_rng(0).uniform([-0.5, -0.5, -0.5], [1.5, 1.5, 0.5], (200, 3))
+    result = surface.closest(points)
+
+    # against all triangles at once
+    n = len(points)
+    candidates = geometry.closest_on_triangles(
+        np.repeat(points, len(triangles), axis=0),
+        *[np.tile(triangles[:, i], (n, 1)) for i in range(3)]).reshape(n, -1, 3)
+    distances = np.linalg.norm(candidates - points[:, None], axis=2)
+
+    np.testing.assert_allclose(np.linalg.norm(result - points, axis=1), np.min(distances, axis=1), atol=1e-12)
@@ -0,0 +1,85 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from examples.util import grading
+
+def cell_sizes(length, chops):
+    # sizes of all cells of boundary_layer() chops, from the start
+    sizes = []
+
+    for chop in chops:
+        part = length*chop.get('length_ratio', 1)
+        r = chop['c2c_expansion']
+        relative = r**np.arange(chop['count'])
+        sizes += list(part*relative/np.sum(relative))
+
+    return np.array(sizes)
+
+def test_solve_expansion_fills_length():
+    expansion = grading.solve_expansion(1, 0.01, 20)
+
+    np.testing.assert_allclose(grading.series_length(0.01, expansion, 20), 1)
+
+def test_solve_expansion_single_cell():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert grading.solve_expansion(0.001, 0.002, 1) == 1
+        np.testing.assert_array_equal(grading.solve_expansion([1, 2], [0.5, 0.1], [1, 1]), [1, 1])
+
+def test_boundary_layer_without_uniform_part():
+    chops = grading.boundary_layer(0.001, 0.002, 1.2)
+
+    assert chops == [{'count': 1, 'c2c_expansion': 1}]
+
+def test_boundary_layer_no_tiny_cells():
+    length, start_size, c2c_expansion, max_size = 0.005, 1e-4, 1.2, 1e-3
+    sizes = cell_sizes(length, grading.boundary_layer(length, start_size, c2c_expansion, max_size))
+
+    np.testing.assert_allclose(np.sum(sizes), length)
+    np.testing.assert_allclose(sizes[0], start_size)
+    # cells never shrink and never grow faster than c2c_expansion
+    ratios = sizes[1:]/sizes[:-1]
+    assert np.all(ratios > 1 - 1e-9)
+    assert np.all(ratios < c2c_expansion + 1e-9)
+
+def test_boundary_layer_uniform_part():
+    length, max_size = 0.05, 1e-3
+    chops = grading.boundary_layer(length, 1e-4, 1.2, max_size)
+    sizes = cell_sizes(length, chops)
+
+    assert len(chops) == 2
+    np.testing.assert_allclose(np.sum(sizes), length)
+    assert np.all(sizes[-chops[1]['count']:] <= max_size)
+
+def test_chop_count_uniform():
+    assert grading.chop_count(1, count=7.0) == 7
+    assert grading.chop_count(1, start_size=0.1) == 10
+    assert grading.chop_count(1, end_size=0.1, length_ratio=0.5) == 5
+    # rounded up: cells are not bigger than the given size
+    assert grading.chop_count(1, start_size=0.3) == 4
+
+def test_chop_count_graded():
+    n = grading.chop_count(1, start_size=0.01, c2c_expansion=1.2)
+
+    # the smallest count that fills the length
+    assert grading.series_length(0.01, 1.2, n) >= 1
+    assert grading.series_length(0.01, 1.2, n - 1) < 1
+
+    assert grading.chop_count(1, c2c_expansion=1.1, total_expansion=1.1**9) == 10
+
+def test_chop_count_start_and_end_size():
+    n = grading.chop_count(1, start_size=0.01, end_size=0.1)
+
+    # cells, growing from start_size to end_size, fill the length
+    expansion = 10**(1/(n - 1))
+    np.testing.assert_allclose(grading.series_length(0.01, expansion, n), 1, rtol=0.1)
+
+def test_chop_count_invalid():
+    with pytest.raises(ValueError):
+        grading.chop_count(1)
+
+    # shrinking cells can't fill the length
+    with pytest.raises(ValueError):
+        grading.chop_count(1, start_size=0.1, c2c_expansion=0.5)
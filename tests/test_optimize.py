@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util import optimize
+
+@pytest.fixture
+def calls(monkeypatch):
+    # evaluate() without a module: metrics are parameter values
+    # and their distance from (0.3, 0.7)
+    calls = []
+
+    def evaluate(arguments):
+        module_name, names, values = arguments
+        calls.append(values)
+        metrics = dict(zip(names, values))
+        metrics['valid'] = True
+        metrics['angle_deviation'] = (values[0] - 0.3)**2 + (values[-1] - 0.7)**2
+
+        return metrics
+
+    monkeypatch.setattr(optimize, 'evaluate', evaluate)
+
+    return calls
+
+def test_weighted_cost():
+    cost = optimize.weighted_cost({'a': 2}, {'n_cells': 100})
+
+    assert cost({'valid': True, 'a': 1, 'n_cells': 100}) == 2
+    assert cost({'valid': True, 'a': 1, 'n_cells': 150}) == 2 + 0.5*optimize.limit_penalty
+    assert cost({'valid': False}) == optimize.invalid_cost
+
+    # defaults are not shared between costs
+    assert optimize.weighted_cost()({'valid': True, 'angle_deviation': 3}) == 3
+
+# costs at positions of a 1D simplex (0.5, 0.6) and candidates:
+# reflected 0.4, expanded 0.3, outside contraction 0.45, inside contraction 0.55
+@pytest.mark.parametrize('costs,moved', [
+    ({0.5: 1, 0.6: 2, 0.4: 0.5, 0.3: 0.1, 0.45: 3, 0.55: 3}, 0.3), # expansion
+    ({0.5: 1, 0.6: 2, 0.4: 0.5, 0.3: 0.7, 0.45: 3, 0.55: 3}, 0.4), # reflection
+    ({0.5: 1, 0.6: 2, 0.4: 1.5, 0.3: 3, 0.45: 1.2, 0.55: 3}, 0.45), # outside contraction
+    ({0.5: 1, 0.6: 2, 0.4: 2.5, 0.3: 3, 0.45: 3, 0.55: 1.5}, 0.55), # inside contraction
+    ({0.5: 1, 0.6: 2, 0.4: 2.5, 0.3: 3, 0.45: 3, 0.55: 2.5}, 0.55), # shrink
+])
+def test_step(calls, costs, moved):
+    optimizer = optimize.Optimizer('case', {'x': (0, 1)}, cost=lambda m: costs[round(m['x'], 6)])
+    optimizer.simplex = np.array([[0.6], [0.5]])
+    optimizer.costs = optimizer.evaluate(optimizer.simplex)
+    optimizer.step()
+
+    np.testing.assert_allclose(optimizer.simplex[:, 0], [0.5, moved])
+    np.testing.assert_allclose(optimizer.costs, [1, costs[moved]])
+    assert optimizer.n_steps == 1
+
+def test_resume(tmp_path, calls):
+    bounds = {'x': (0, 1), 'y': (0, 2)}
+    checkpoint = os.path.join(tmp_path, 'state.json')
+
+    # interrupted after a few evaluations...
+    optimizer = optimize.Optimizer('case', bounds, checkpoint=checkpoint)
+    optimizer.run(max_evaluations=10, verbose=False)
+    n_steps = optimizer.n_steps
+
+    assert os.path.exists(checkpoint)
+    assert not os.path.exists(checkpoint + '.tmp')
+    assert len(calls) == len(optimizer.cache)
+
+    # ...and resumed: nothing is evaluated again
+    del calls[:]
+    resumed = optimize.Optimizer('case', bounds, checkpoint=checkpoint)
+    assert resumed.load()
+    assert calls == []
+    assert resumed.n_steps == n_steps
+    np.testing.assert_array_equal(resumed.simplex, optimizer.simplex)
+
+    parameters, metrics = resumed.run(verbose=False)
+
+    # the same as an uninterrupted run
+    single = optimize.Optimizer('case', bounds)
+    assert single.run(verbose=False) == (parameters, metrics)
+
+    assert parameters['x'] == pytest.approx(0.3, abs=1e-2)
+    assert parameters['y'] == pytest.approx(0.7, abs=1e-2)
+
+    with pytest.raises(ValueError):
+        optimize.Optimizer('case', {'x': (0, 1)}, checkpoint=checkpoint).load()
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import pattern
+
+# a box at 0 < x < 1 and a quarter of a ring between radii 1 and 2
+box = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+sector = np.array([
+    [1, 0, 0], [2, 0, 0], [0, 2, 0], [0, 1, 0],
+    [1, 0, 1], [2, 0, 1], [0, 2, 1], [0, 1, 1],
+], dtype=float)
+
+def unique_vertices(instances):
+    return {id(v): v for block in instances for v in block.vertices}.values()
+
+def test_interface_map():
+    points_1 = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0]])
+    points_2 = np.array([[1, 1, 0], [2, 0, 0], [0, 0, 1e-9]])
+
+    assert pattern.interface_map(points_1, points_2).tolist() == [2, -1, 0]
+
+def test_linear():
+    instances = pattern.linear(Block.create_from_points(box), 3, [1, 0, 0])
+
+    # right side of each copy is left side of the next one
+    for block_1, block_2 in zip(instances[:-1], instances[1:]):
+        for i_1, i_2 in ((1, 0), (2, 3), (5, 4), (6, 7)):
+            assert block_2.vertices[i_2] is block_1.vertices[i_1]
+
+    assert len(unique_vertices(instances)) == 8 + 2*4
+    np.testing.assert_allclose([v.point for v in instances[2].vertices], box + [2, 0, 0])
+
+def test_no_merge():
+    instances = pattern.linear(Block.create_from_points(box), 3, [1, 0, 0], merge=False)
+
+    assert len(unique_vertices(instances)) == 3*8
+
+@pytest.mark.parametrize('n,angle,closed,n_vertices', [
+    # a full ring: the last copy connects to the first
+    (4, 2*np.pi, True, 4*4),
+    (3, np.pi, False, 8 + 2*4),
+])
+def test_circular(n, angle, closed, n_vertices):
+    instances = pattern.circular(Block.create_from_points(sector), n, [0, 0, 1], angle=angle)
+    pairs = list(zip(instances[:-1], instances[1:]))
+    if closed:
+        pairs.append((instances[-1], instances[0]))
+
+    for block_1, block_2 in pairs:
+        for i_1, i_2 in ((3, 0), (2, 1), (7, 4), (6, 5)):
+            assert block_2.vertices[i_2] is block_1.vertices[i_1]
+
+    assert len(unique_vertices(instances)) == n_vertices
+
+    # all copies stay on the ring
+    for block in instances:
+        points = np.array([v.point for v in block.vertices])
+        np.testing.assert_allclose(np.linalg.norm(points[:, :2], axis=1), [1, 2, 2, 1]*2, atol=1e-12)
+
+def test_periodic():
+    instances = pattern.periodic(Block.create_from_points(box), 3, [1, 0, 0],
+        first_patches={'left': 'inlet'}, last_patches={'right': 'outlet'})
+
+    assert instances[0].patches == {'inlet': ['left']}
+    assert instances[1].patches == {}
+    assert instances[2].patches == {'outlet': ['right']}
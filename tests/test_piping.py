@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util.piping import Route
+
+# a non-planar route with 90-degree and oblique corners
+points = [[0, 0, 0], [4, 0, 0], [4, 4, 0], [4, 4, 4], [8, 6, 4]]
+
+def test_frames_orthonormal():
+    route = Route(points, 0.5, bend_radius=1, max_angle=np.pi/4)
+
+    # start, end of each straight segment before a corner,
+    # end of each sub-divided elbow and the end
+    assert route.n_divisions.tolist() == [2, 2, 2]
+    assert len(route.frames) == 1 + 3 + 6 + 1
+
+    for point, normal, radius_vector, radius in route.frames:
+        assert np.linalg.norm(normal) == pytest.approx(1)
+        assert np.linalg.norm(radius_vector) == pytest.approx(1)
+        assert np.dot(normal, radius_vector) == pytest.approx(0, abs=1e-12)
+        assert radius == 0.5
+
+    np.testing.assert_allclose(route.frames[0][1], [1, 0, 0])
+    np.testing.assert_allclose(route.frames[-1][1], route.directions[-1])
+    np.testing.assert_allclose(route.frames[-1][0], points[-1])
+
+    # elbows' ends are on their arcs and their normals along the arcs
+    for i_frame in (2, 3, 5, 6, 8, 9):
+        point, normal = route.frames[i_frame][:2]
+        distances = np.linalg.norm(route.centers - point, axis=1)
+        i_corner = np.argmin(distances)
+
+        assert distances[i_corner] == pytest.approx(1)
+        assert np.dot(normal, point - route.centers[i_corner]) == pytest.approx(0, abs=1e-12)
+        assert np.dot(normal, route.axes[i_corner]) == pytest.approx(0, abs=1e-12)
+
+def test_radius_point():
+    route = Route(points, 0.5, bend_radius=1, radius_point=[0, 0, 1])
+
+    np.testing.assert_allclose(route.frames[0][2], [0, 0, 1])
+
+def test_largest_bend_radius():
+    # without bend_radius, corners get the largest radius that fits
+    route = Route(points, 0.5)
+
+    assert np.all(route.lengths >= 0)
+    assert route.lengths[1] == 0
+
+@pytest.mark.parametrize('route_points,bend_radius', [
+    ([[0, 0, 0], [1, 0, 0], [0, 0, 0]], 0.1), # turns back
+    ([[0, 0, 0], [1, 0, 0], [1, 1, 0]], 2), # too big a bend
+])
+def test_invalid(route_points, bend_radius):
+    with pytest.raises(ValueError):
+        Route(route_points, 0.1, bend_radius=bend_radius)
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+from examples.util import points
+
+def curve(n=200):
+    # points along a half circle in the xy plane
+    angles = np.linspace(np.pi, 0, n)
+    return np.stack((np.cos(angles), np.sin(angles), np.zeros(n)), axis=1)
+
+def test_load_npy_is_memory_mapped(tmp_path):
+    path = os.path.join(tmp_path, 'curve.npy')
+    np.save(path, curve())
+
+    loaded = points.load(path)
+
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, curve())
+
+def test_load_raw_binary(tmp_path):
+    path = os.path.join(tmp_path, 'curve.bin')
+    with open(path, 'wb') as f:
+        f.write(b'header__')
+        curve().astype(np.float32).tofile(f)
+
+    loaded = points.load(path, dtype=np.float32, offset=8)
+
+    assert loaded.shape == (200, 3)
+    np.testing.assert_allclose(loaded, curve(), atol=1e-7)
+
+def test_text_to_npy(tmp_path):
+    path = os.path.join(tmp_path, 'profile.dat')
+    with open(path, 'w') as f:
+        f.write('a name\n\n 0.0 0.0\n 0.5 0.1\n\n 1.0 0.0\n')
+
+    np.testing.assert_array_equal(points.load(path, skip_rows=1), [[0, 0], [0.5, 0.1], [1, 0]])
+
+    npy_path = points.to_npy(path, skip_rows=1)
+    assert npy_path == os.path.join(tmp_path, 'profile.npy')
+    np.testing.assert_array_equal(points.load(npy_path), [[0, 0], [0.5, 0.1], [1, 0]])
+
+def test_with_z():
+    xy = np.array([[0, 0], [1, 2]])
+    result = points.with_z(xy, 0.5)
+
+    assert result.dtype == float
+    np.testing.assert_array_equal(result, [[0, 0, 0.5], [1, 2, 0.5]])
+
+    # 3D points are copied, not returned as they are
+    xyz = curve(3)
+    copied = points.with_z(xyz)
+    copied[0] = 1
+    assert not np.array_equal(copied, xyz)
+
+def test_split_index():
+    xy = curve(9)[:, :2]
+
+    assert points.split_index(xy, 0.1) == 5
+    assert points.split_index(xy, -2) == 0
+
+def test_decimate_within_tolerance():
+    original = curve()
+    tolerance = 1e-3
+
+    indexes = points.decimate(original, tolerance)
+
+    assert indexes[0] == 0 and indexes[-1] == len(original) - 1
+    assert len(indexes) < len(original)/2
+    assert points.max_deviation(original, indexes) <= tolerance
+
+    # without vertices
+    edge = points.edge_points(original, tolerance)
+    np.testing.assert_array_equal(edge, original[indexes[1:-1]])
+
+def test_decimate_max_points():
+    indexes = points.decimate(curve(), 0, max_points=5)
+
+    assert len(indexes) == 5
@@ -0,0 +1,117 @@
+import os
+import re
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import polymesh
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def prepared(blocks, counts):
+    # a mesh with blocks in the state Mesh.write() leaves them:
+    # uniform gradings with given counts
+    for block, block_counts in zip(blocks, counts):
+        block.grading = [types.SimpleNamespace(count=c, divisions=[]) for c in block_counts]
+
+    return types.SimpleNamespace(blocks=blocks, prepare_data=lambda: None, default_patch=('walls', 'wall'))
+
+def face_points(face):
+    # points of a face as written, without repeated labels
+    return [int(n) for n in polymesh.face_string(face).split('(')[1][:-1].split()]
+
+def area_vector(points, face):
+    p = points[face]
+    return 0.5*np.sum(np.cross(p - p[0], np.roll(p, -1, axis=0) - p[0]), axis=0)
+
+def check_closed(mesh):
+    # the sum of outward face area vectors of every cell is zero
+    sums = np.zeros((len(mesh.cells), 3))
+    for i_face, face in enumerate(mesh.faces):
+        area = area_vector(mesh.points, face_points(face))
+        sums[mesh.owner[i_face]] += area
+        if i_face < len(mesh.neighbour):
+            sums[mesh.neighbour[i_face]] -= area
+
+    np.testing.assert_allclose(sums, 0, atol=1e-12)
+
+def test_two_blocks():
+    blocks = [Block.create_from_points(corners + [i, 0, 0]) for i in range(2)]
+    mesh = polymesh.PolyMesh(prepared(blocks, [(2, 2, 1), (3, 2, 1)]))
+
+    assert len(mesh.cells) == 10
+    assert len(mesh.points) == 6*3*2
+    # 1 + 2 internal faces in x per row, 1 in y per column
+    assert len(mesh.neighbour) == 2*4 + 5
+    assert all(len(face_points(f)) == 4 for f in mesh.faces)
+    check_closed(mesh)
+
+def test_wedge_faces():
+    # edges 0-4 and 1-5 are collapsed on the x axis
+    points = corners.copy()
+    points[[0, 1, 4, 5], 1:] = 0
+    points[[2, 3], 2] = -0.05
+    points[[6, 7], 2] = 0.05
+    mesh = polymesh.PolyMesh(prepared([Block.create_from_points(points)], [(2, 2, 1)]))
+
+    face_sizes = [len(face_points(f)) for f in mesh.faces]
+
+    # faces on the axis have no area and are gone (2 of 20),
+    # prisms at the axis have triangles at their ends (one is shared)
+    assert len(mesh.faces) == 18
+    assert face_sizes.count(3) == 3
+    check_closed(mesh)
+
+def read_cell_zones(directory):
+    with open(os.path.join(directory, 'cellZones'), 'r') as f:
+        text = f.read()
+
+    zones = re.findall(r'(\w+)\n\{\n    type cellZone;\ncellLabels +List<label> (\d+)\n\((.*?)\)', text, re.DOTALL)
+    assert text[text.index('*/') + 2:].count('cellZone;') == len(zones)
+
+    for name, n, cells in zones:
+        assert len(cells.split()) == int(n)
+
+    return {name: [int(c) for c in cells.split()] for name, n, cells in zones}
+
+def test_cell_zones(tmp_path):
+    # blocks in a row with different counts; zones are not contiguous
+    blocks = [Block.create_from_points(corners + [i, 0, 0]) for i in range(3)]
+    for block, zone in zip(blocks, ('fluid', 'solid', 'fluid')):
+        block.cell_zone = zone
+    counts = [(2, 2, 1), (3, 2, 1), (1, 1, 2)]
+
+    mesh = polymesh.PolyMesh(prepared(blocks, counts))
+    mesh.write(str(tmp_path))
+    directory = os.path.join(tmp_path, 'constant', 'polyMesh')
+
+    # offsets match block cell counts
+    expected = {'fluid': [0, 1, 2, 3, 10, 11], 'solid': [4, 5, 6, 7, 8, 9]}
+    assert {name: cells.tolist() for name, cells in mesh.cell_zones.items()} == expected
+    assert read_cell_zones(directory) == expected
+
+    # ...and the cells are in their blocks
+    centers = np.mean(mesh.points[mesh.cells], axis=1)
+    for i_block in range(3):
+        cells = np.arange(mesh.block_offsets[i_block], mesh.block_offsets[i_block + 1])
+        assert np.all((centers[cells, 0] > i_block) & (centers[cells, 0] < i_block + 1))
+
+    # the same from blocks only, for a mesh written by blockMesh
+    os.remove(os.path.join(directory, 'cellZones'))
+    cell_zones = polymesh.write_zones(prepared(blocks, counts), str(tmp_path))
+
+    assert {name: cells.tolist() for name, cells in cell_zones.items()} == expected
+    assert read_cell_zones(directory) == expected
+
+    # blocks that don't match the mesh
+    with pytest.raises(ValueError):
+        polymesh.write_zones(prepared(blocks, [(2, 2, 1), (3, 2, 1), (1, 1, 1)]), str(tmp_path))
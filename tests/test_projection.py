@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import projection
+from examples.util.geometry import Sphere
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def test_neighbours_stay_connected():
+    # two blocks side by side, each with its own vertices
+    block_1 = Block.create_from_points(corners)
+    block_2 = Block.create_from_points(corners + [1, 0, 0])
+    sphere = Sphere('sphere', [0.5, 0.5, -1], 2.2)
+
+    # the top corners are not on the sphere
+    assert np.all(sphere.distance(corners[4:]) > 0.05)
+
+    block_1.project_face('top', 'sphere', edges=True)
+    result = projection.resolve([block_1, block_2], [sphere])
+
+    assert result == {'sphere': 4}
+    assert block_1.faces == []
+    assert [e.type for e in block_1.edges] == ['arc']*4
+
+    top = np.array([block_1.vertices[i].point for i in range(4, 8)])
+    np.testing.assert_allclose(sphere.distance(top), 0, atol=1e-12)
+
+    # the shared corners moved in both blocks, the rest of block_2 didn't
+    for i_1, i_2 in ((5, 4), (6, 7), (1, 0), (2, 3)):
+        np.testing.assert_allclose(block_1.vertices[i_1].point, block_2.vertices[i_2].point)
+
+    for i in (5, 6):
+        np.testing.assert_allclose(block_2.vertices[i].point, corners[i] + [1, 0, 0])
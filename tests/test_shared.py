@@ -0,0 +1,54 @@
+import os
+import re
+import textwrap
+
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util import shared, template, modules
+
+# an example module with a mesh that writes a small blockMeshDict
+case_source = '''
+x = 1
+
+class CaseMesh:
+    def __init__(self, x):
+        self.x = x
+
+    def write(self, output_path, geometry=None, debug=False):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(
+                "// non-ascii: \\u00fc\\n"
+                "convertToMeters 1;\\n"
+                f"vertices\\n(\\n    ({self.x} 0 0)\\n    (1 1 0)\\n);\\n"
+                "blocks\\n(\\n    hex (0 1 2 3 4 5 6 7) (10 10 1) simpleGrading (1 1 1)\\n);\\n")
+
+def get_mesh():
+    return CaseMesh(x)
+'''
+
+def test_write_dict(tmp_path, monkeypatch):
+    with open(os.path.join(tmp_path, 'shared_case.py'), 'w', encoding='utf-8') as f:
+        f.write(textwrap.dedent(case_source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    handle = shared.build('shared_case', {'x': 2.5})
+
+    try:
+        assert handle.vertices.tolist() == [[2.5, 0, 0], [1, 1, 0]]
+
+        path = os.path.join(tmp_path, 'blockMeshDict')
+        handle.write_dict(path)
+
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+        expected = template.Template(template.render_mesh(
+            modules.load('shared_case', {'x': 2.5}).get_mesh())).render()
+        assert text == expected
+        assert 'ü' in text
+        # OpenFOAM reads a '+' in front of a number as a separate token
+        assert re.search(r'(?<![eE])\+\d', text) is None
+    finally:
+        handle.release()
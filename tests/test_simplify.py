@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import curves
+from examples.util.simplify import simplify
+
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def block_with_spline(points):
+    # a unit block with a spline on its 0-1 edge
+    block = Block.create_from_points(corners)
+    block.add_edge(0, 1, np.asarray(points).tolist())
+
+    return block
+
+def test_straight_spline_becomes_line():
+    t = np.linspace(0, 1, 12)[1:-1]
+    block = block_with_spline(np.outer(t, [1, 0, 0]))
+
+    report = simplify(block, 1e-6)
+
+    assert [r.type for r in report] == ['line']
+    assert block.edges == []
+
+def test_circular_spline_becomes_arc():
+    # a half circle in the xz plane from vertex 0 to vertex 1
+    angles = np.linspace(np.pi, 0, 40)[1:-1]
+    points = np.stack((0.5 + 0.5*np.cos(angles), np.zeros_like(angles), 0.5*np.sin(angles)), axis=1)
+    block = block_with_spline(points)
+
+    report = simplify(block, 1e-3)
+
+    assert [r.type for r in report] == ['arc']
+    assert report[0].deviation <= 1e-3
+
+    arc_point = np.asarray(block.edges[0].points, dtype=float)
+    np.testing.assert_allclose(np.linalg.norm(arc_point - [0.5, 0, 0]), 0.5, atol=1e-3)
+
+def test_resampled_spline_within_tolerance():
+    # a wavy curve: neither a line nor an arc
+    t = np.linspace(0, 1, 60)[1:-1]
+    original = np.stack((t, np.zeros_like(t), 0.1*np.sin(3*np.pi*t)), axis=1)
+    block = block_with_spline(original)
+    tolerance = 1e-3
+
+    report = simplify(block, tolerance)
+
+    assert report[0].type == 'spline'
+    assert report[0].n_after < report[0].n_before
+    assert report[0].deviation <= tolerance
+
+    # new points are points of the original curve
+    new_points = np.asarray(block.edges[0].points, dtype=float)
+    distances = np.linalg.norm(new_points[:, None] - original[None], axis=2)
+    assert np.all(np.min(distances, axis=1) < 1e-12)
+
+    # and the new spline follows the original one
+    parameters = np.linspace(0, 1, 200)
+    curve_1 = curves.spline(corners[0], original, corners[1], parameters)
+    curve_2 = curves.spline(corners[0], new_points, corners[1], parameters)
+    assert np.max(np.linalg.norm(curve_1 - curve_2, axis=-1)) < 10*tolerance
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import sweep
+
+def swept_block(scale=1):
+    # a block from a square in the xz plane to the same square (scaled
+    # towards the rotation axis), rotated by 90 degrees around z
+    sketch_1 = np.array([[1, 0, 0], [2, 0, 0], [2, 0, 1], [1, 0, 1]], dtype=float)
+    sketch_2 = np.stack((-sketch_1[:, 1], sketch_1[:, 0], sketch_1[:, 2]), axis=1)
+    sketch_2[:, :2] *= scale
+
+    return Block.create_from_points(np.concatenate((sketch_1, sketch_2)))
+
+def edge_points(block):
+    return [np.asarray(edge.points, dtype=float) for edge in block.edges]
+
+def test_samples_on_arc():
+    block = swept_block()
+
+    assert sweep.refine(block, np.pi/2, [0, 0, 0], 'z', n_points=10) == 4
+    assert len(block.edges) == 4
+
+    for edge, points in zip(block.edges, edge_points(block)):
+        assert points.shape == (10, 3)
+
+        start = block.vertices[edge.block_index_1].point
+        radius = np.linalg.norm(start[:2])
+
+        # all samples on a circle around the axis, at the same height
+        np.testing.assert_allclose(np.linalg.norm(points[:, :2], axis=1), radius)
+        np.testing.assert_allclose(points[:, 2], start[2])
+
+        # evenly spaced along the arc, from the first sketch to the second
+        angles = np.arctan2(points[:, 1], points[:, 0])
+        np.testing.assert_allclose(angles, np.linspace(0, np.pi/2, 12)[1:-1])
+
+def test_changing_radius():
+    block = swept_block(scale=0.5)
+    sweep.refine(block, np.pi/2, [0, 0, 0], 'z', n_points=4)
+
+    for edge, points in zip(block.edges, edge_points(block)):
+        radius_1 = np.linalg.norm(block.vertices[edge.block_index_1].point[:2])
+        radius_2 = np.linalg.norm(block.vertices[edge.block_index_2].point[:2])
+
+        t = np.linspace(0, 1, 6)[1:-1]
+        np.testing.assert_allclose(np.linalg.norm(points[:, :2], axis=1), radius_1 + (radius_2 - radius_1)*t)
+
+def test_wrong_sweep():
+    with pytest.raises(ValueError):
+        sweep.refine(swept_block(), np.pi/3, [0, 0, 0], 'z')
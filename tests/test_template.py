@@ -0,0 +1,67 @@
+import os
+import re
+
+import numpy as np
+
+from examples.util import template
+
+class FakeMesh:
+    # writes a small blockMeshDict the same way as Mesh.write() does
+    def __init__(self, x, count=10):
+        self.x = x
+        self.count = count
+
+    def write(self, output_path, geometry=None, debug=False):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(
+                "// a comment with non-ascii characters: ü, ©\n"
+                "convertToMeters 1;\n"
+                f"vertices\n(\n    ({self.x} 0 0)\n    (1 1 0)\n);\n"
+                f"edges\n(\n    arc 0 1 ({self.x/2} 0.5 0)\n);\n"
+                f"blocks\n(\n    hex (0 1 2 3 4 5 6 7) ({self.count} 10 1) simpleGrading (1 {self.x} 1)\n);\n")
+
+def rendered(mesh):
+    return template.Template(template.render_mesh(mesh)).render()
+
+def test_fields():
+    t = template.Template(template.render_mesh(FakeMesh(2)))
+
+    # convertToMeters, 2 vertices, an arc point, 3 grading numbers
+    assert len(t.values) == 13
+    np.testing.assert_array_equal(t.section('vertices'), [2, 0, 0, 1, 1, 0])
+    np.testing.assert_array_equal(t.section('blocks'), [1, 2, 1])
+
+def test_patch_in_place(tmp_path):
+    path = os.path.join(tmp_path, 'blockMeshDict')
+    writer = template.TemplateWriter(path)
+
+    assert writer.write(FakeMesh(1))
+    assert not writer.write(FakeMesh(2.5))
+    assert writer.n_changed == 3
+
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == rendered(FakeMesh(2.5))
+
+def test_topology_change(tmp_path):
+    path = os.path.join(tmp_path, 'blockMeshDict')
+    writer = template.TemplateWriter(path)
+
+    writer.write(FakeMesh(1))
+    assert writer.write(FakeMesh(1, count=12))
+
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == rendered(FakeMesh(1, count=12))
+
+def test_no_leading_plus(tmp_path):
+    # OpenFOAM reads a '+' in front of a number as a separate token
+    path = os.path.join(tmp_path, 'blockMeshDict')
+    writer = template.TemplateWriter(path)
+
+    writer.write(FakeMesh(1))
+    writer.write(FakeMesh(2.5))
+
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+
+    assert '1.0000000000e+00' in text
+    assert re.search(r'(?<![eE])\+\d', text) is None
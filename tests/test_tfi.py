@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from examples.util import tfi
+from examples.util.blocks import axis_pairs
+
+def corner_edges(corners, params, shape=None):
+    # points on all 12 edges of a block, given by its 8 corners and
+    # a function that maps straight edges to curved ones
+    edges = []
+    for axis in range(3):
+        t = np.asarray(params[axis])[:, None]
+        points = np.array([corners[i_1]*(1 - t) + corners[i_2]*t for i_1, i_2 in axis_pairs[axis]])
+        edges.append(points if shape is None else shape(points))
+
+    return edges
+
+corners = np.array([
+    [0, 0, 0], [2, 0, 0], [2, 1, 0], [0, 1, 0],
+    [0, 0, 3], [2, 0, 3], [2, 1, 3], [0, 1, 3],
+], dtype=float)
+
+def test_straight_block_is_trilinear():
+    params = [np.linspace(0, 1, 5), np.linspace(0, 1, 4), np.linspace(0, 1, 3)]
+    grid = tfi.interpolate(corner_edges(corners, params), params)
+
+    u, v, w = np.meshgrid(*params, indexing='ij')
+    expected = np.stack((2*u, v, 3*w), axis=-1)
+
+    np.testing.assert_allclose(grid, expected, atol=1e-12)
+
+def test_curved_edges_are_reproduced():
+    # a block bent around the z axis: edges follow circles
+    def bend(points):
+        radius = 2 + points[..., 1]
+        angle = points[..., 0]/4
+        return np.stack((radius*np.cos(angle), radius*np.sin(angle), points[..., 2]), axis=-1)
+
+    params = [np.linspace(0, 1, 9)]*3
+    edges = corner_edges(corners, params, bend)
+    grid = tfi.interpolate(edges, params)
+
+    np.testing.assert_allclose(grid[:, 0, 0], edges[0][0], atol=1e-12)
+    np.testing.assert_allclose(grid[:, -1, -1], edges[0][2], atol=1e-12)
+    np.testing.assert_allclose(grid[0, :, 0], edges[1][0], atol=1e-12)
+    np.testing.assert_allclose(grid[-1, 0, :], edges[2][1], atol=1e-12)
+
+def test_division_counts_remainder_goes_to_largest():
+    # blockMesh's lineDivide: the difference goes to the division with the largest count ratio
+    _, counts, _ = tfi.division_counts([[1, 1, 1], [1, 1, 1], [1, 1, 1]], 10)
+    np.testing.assert_array_equal(counts, [4, 3, 3])
+
+    _, counts, _ = tfi.division_counts([[1, 0.2, 1], [1, 0.5, 1], [1, 0.3, 1]], 9)
+    np.testing.assert_array_equal(counts, [2, 4, 3])
+
+def test_distribution():
+    # uniform, then graded with total expansion 4
+    params = tfi.distribution([[1, 1, 1], [1, 1, 4]], 6)
+    sizes = np.diff(params)
+
+    assert len(params) == 7
+    np.testing.assert_allclose(params[[0, 3, -1]], [0, 0.5, 1])
+    np.testing.assert_allclose(sizes[:3], 1/6)
+    np.testing.assert_allclose(sizes[-1]/sizes[3], 4)
+
+def test_distribution_fewer_cells_than_divisions():
+    np.testing.assert_allclose(tfi.distribution([[1, 1, 2], [1, 1, 3], [1, 1, 4]], 2), [0, 0.5, 1])
+
+def test_distribution_nearly_uniform():
+    # an expansion a round-off away from 1 is uniform, not a division by ~0
+    np.testing.assert_allclose(tfi.distribution([[1, 1, 1 + 1e-15]], 4), np.linspace(0, 1, 5))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util.topology import axis_groups, Topology
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+])
+
+def lattice_map(n_x, n_y, n_z):
+    # point_map of a n_x*n_y*n_z lattice of blocks, points numbered on the grid
+    shape = (n_x + 1, n_y + 1, n_z + 1)
+    blocks = np.argwhere(np.ones((n_x, n_y, n_z), dtype=bool))
+
+    return np.ravel_multi_index((blocks[:, None] + corners[None]).transpose(2, 0, 1), shape)
+
+def test_lattice_groups():
+    n_x, n_y, n_z = 2, 3, 4
+    groups = axis_groups(lattice_map(n_x, n_y, n_z))
+
+    # all blocks in a layer normal to an axis share that axis' count
+    assert len(np.unique(groups)) == n_x + n_y + n_z
+
+    layers = np.argwhere(np.ones((n_x, n_y, n_z), dtype=bool))
+    for axis in range(3):
+        for i in range(layers[:, axis].max() + 1):
+            in_layer = layers[:, axis] == i
+            assert len(np.unique(groups[in_layer, axis])) == 1
+            assert not np.any(np.isin(groups[~in_layer, axis], groups[in_layer, axis]))
+
+def test_separate_blocks():
+    point_map = np.concatenate((np.arange(8), np.arange(8, 16))).reshape(2, 8)
+
+    assert len(np.unique(axis_groups(point_map))) == 6
+
+def test_propagate_from_one_row():
+    n_x, n_y, n_z = 3, 2, 2
+    layers = np.argwhere(np.ones((n_x, n_y, n_z), dtype=bool))
+    topology = Topology([Block.create_from_points(corners + offset) for offset in layers])
+
+    assert topology.n_points == (n_x + 1)*(n_y + 1)*(n_z + 1)
+    assert topology.n_groups == n_x + n_y + n_z
+
+    # as in stress/lattice.py: one row of blocks is chopped along each axis
+    counts = np.full((len(layers), 3), -1)
+    for axis in range(3):
+        row = np.all(np.delete(layers, axis, axis=1) == 0, axis=1)
+        counts[row, axis] = 5 + layers[row, axis]
+
+    np.testing.assert_array_equal(topology.propagate(counts), 5 + layers)
+
+    # a different count on a block in the same layer
+    counts[np.all(layers == [0, 1, 0], axis=1), 0] = 7
+    with pytest.raises(ValueError):
+        topology.propagate(counts)
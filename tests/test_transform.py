@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util import transform as t
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def points(block):
+    return np.array([v.point for v in block.vertices])
+
+def volume(block):
+    # positive for a right-handed block
+    p = points(block)
+    return np.dot(np.cross(p[1] - p[0], p[3] - p[0]), p[4] - p[0])
+
+def make_block():
+    block = Block.create_from_points(corners)
+    block.add_edge(0, 1, [0.5, -0.2, 0])
+    block.set_patch('bottom', 'inlet')
+    block.set_patch(['left', 'top'], 'walls')
+    for axis in range(3):
+        block.chop(axis, count=4)
+
+    return block
+
+def test_rotate_translate():
+    block = make_block()
+    matrix = t.combine(t.rotation([0, 0, 1], np.pi/2), t.translation([1, 2, 3]))
+    t.transform(block, matrix)
+
+    expected = np.column_stack((-corners[:, 1], corners[:, 0], corners[:, 2])) + [1, 2, 3]
+    np.testing.assert_allclose(points(block), expected, atol=1e-12)
+    np.testing.assert_allclose(block.edges[0].points, [1.2, 2.5, 3], atol=1e-12)
+    assert volume(block) > 0
+
+def test_transformed_copy():
+    block = make_block()
+    copy = t.transformed(block, t.scaling(2))
+
+    np.testing.assert_allclose(points(block), corners)
+    np.testing.assert_allclose(points(copy), 2*corners)
+
+def test_mirror_flips_orientation():
+    block = make_block()
+    t.reflect(block, [0, 0, 1], [0, 0, -1])
+
+    # the same points, mirrored, but bottom and top are swapped
+    # so that the block stays right-handed
+    mirrored = corners*[1, 1, -1] + [0, 0, -2]
+    np.testing.assert_allclose(points(block), mirrored[list(t.flip_map)])
+    assert volume(block) > 0
+
+    # edges, patches and chops follow the faces
+    edge = block.edges[0]
+    assert (edge.block_index_1, edge.block_index_2) == (4, 5)
+    np.testing.assert_allclose(edge.points, [0.5, -0.2, -2])
+    assert block.patches == {'inlet': ['top'], 'walls': ['left', 'bottom']}
+    assert block.chops[2][0]['invert']
+    assert not block.chops[0][0].get('invert', False)
+
+    # mirroring back restores the original block
+    t.reflect(block, [0, 0, 1], [0, 0, -1])
+    np.testing.assert_allclose(points(block), corners, atol=1e-12)
+    assert block.patches == {'inlet': ['bottom'], 'walls': ['left', 'top']}
+    assert not block.chops[2][0]['invert']
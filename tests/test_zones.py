@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('classy_blocks')
+
+from classy_blocks.classes.block import Block
+
+from examples.util.zones import Tables, zone_cells
+
+# block corners, in the same order as block vertices
+corners = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+def row(n):
+    # n unit blocks along x, each with its own vertices
+    return [Block.create_from_points(corners + [i, 0, 0]) for i in range(n)]
+
+def test_boundary_faces():
+    tables = Tables(row(3))
+
+    # 3*6 faces, 2 interfaces with 2 faces each
+    assert np.sum(tables.boundary) == 18 - 4
+    assert np.all(np.linalg.norm(tables.face_normals, axis=1) > 1 - 1e-12)
+
+    # normals point away from blocks
+    outward = tables.face_centers - np.repeat(tables.block_centers, 6, axis=0)
+    assert np.all(np.sum(outward*tables.face_normals, axis=1) > 0)
+
+def test_select_and_apply():
+    blocks = row(3)
+    blocks[1].set_patch('top', 'lid')
+    tables = Tables(blocks)
+
+    inlet = tables.select_faces(lambda c, n: c[:, 0] < 1e-6)
+    outlet = tables.select_faces(lambda c, n: n[:, 0] > 0.5)
+    tops = tables.select_faces(block_sides=['top'])
+
+    assert len(inlet) == 1 and len(outlet) == 1 and len(tops) == 3
+    # interfaces are not selected, with boundary=False they are
+    assert len(tables.select_faces(lambda c, n: n[:, 0] > 0.5, boundary=False)) == 3
+
+    tables.set_patch('inlet', inlet)
+    tables.set_patch('outlet', outlet)
+    # the lid is taken over and then moved to another patch
+    np.testing.assert_array_equal(tables.patch_faces('lid'), [1*6 + 5])
+    tables.set_patch('top', tops)
+    assert len(tables.patch_faces('lid')) == 0
+
+    tables.set_cell_zone('middle', tables.select_blocks(lambda c: np.abs(c[:, 0] - 1.5) < 0.1))
+    tables.apply()
+
+    assert blocks[0].patches == {'inlet': ['left'], 'top': ['top']}
+    assert blocks[1].patches == {'top': ['top']}
+    assert blocks[2].patches == {'outlet': ['right'], 'top': ['top']}
+    assert [b.cell_zone for b in blocks] == ['', 'middle', '']
+
+def test_zone_cells():
+    blocks = row(3)
+    blocks[0].cell_zone = 'a'
+    blocks[2].cell_zone = 'a'
+    blocks[1].cell_zone = 'b'
+
+    cells = zone_cells(blocks, [0, 4, 6, 10])
+
+    np.testing.assert_array_equal(cells['a'], [0, 1, 2, 3, 6, 7, 8, 9])
+    np.testing.assert_array_equal(cells['b'], [4, 5])